@@ -276,3 +276,28 @@ def datetime_format_check(app_configs, **kwargs):
                 )
 
     return errors
+
+
+@register("spreadsheet_export_storage")
+def spreadsheet_export_storage_check(app_configs, **kwargs):
+    from django.conf import settings
+
+    errors = []
+
+    if (
+        getattr(settings, "WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD", None)
+        is not None
+        and getattr(settings, "WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE", None) is None
+    ):
+        errors.append(
+            Error(
+                "The WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE setting is not defined",
+                hint="Spreadsheets exported in the background may contain personal data, "
+                "so they must be saved to a storage whose files aren't publicly served. "
+                "Set this to the alias of such a storage in the STORAGES setting.",
+                obj="WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD",
+                id="wagtailadmin.E004",
+            )
+        )
+
+    return errors
@@ -0,0 +1,47 @@
+import datetime
+import posixpath
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from wagtail.admin.views.mixins import (
+    SPREADSHEET_EXPORT_DIRECTORY,
+    SPREADSHEET_EXPORT_MAX_AGE,
+    get_spreadsheet_export_storage,
+)
+
+
+class Command(BaseCommand):
+    help = "Deletes spreadsheet exports prepared in the background whose download links have expired"
+
+    def handle(self, *args, **options):
+        storage = get_spreadsheet_export_storage()
+        expired_before = timezone.now() - datetime.timedelta(
+            seconds=SPREADSHEET_EXPORT_MAX_AGE
+        )
+
+        try:
+            export_directories, _ = storage.listdir(SPREADSHEET_EXPORT_DIRECTORY)
+        except FileNotFoundError:
+            export_directories = []
+
+        deleted_exports_count = 0
+        for export_directory in export_directories:
+            export_directory = posixpath.join(
+                SPREADSHEET_EXPORT_DIRECTORY, export_directory
+            )
+            _, filenames = storage.listdir(export_directory)
+            paths = [posixpath.join(export_directory, name) for name in filenames]
+
+            if any(storage.get_modified_time(path) > expired_before for path in paths):
+                continue
+
+            for path in paths:
+                storage.delete(path)
+            # Remove the directory itself, for storages that have directories
+            storage.delete(export_directory)
+            deleted_exports_count += 1
+
+        self.stdout.write(
+            f"Successfully deleted {deleted_exports_count} spreadsheet exports"
+        )
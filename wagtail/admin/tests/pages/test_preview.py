@@ -1,6 +1,8 @@
 import datetime
 from functools import wraps
+from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase, override_settings
 from django.urls import reverse
 from django.utils import timezone
@@ -391,6 +393,89 @@ class TestPreview(WagtailTestUtils, TestCase):
             html=True,
         )
 
+    @override_settings(
+        WAGTAIL_PREVIEW_CACHE=True,
+        CACHES={
+            "default": {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            }
+        },
+    )
+    def test_preview_on_edit_with_cache(self):
+        cache.clear()
+        preview_url = reverse(
+            "wagtailadmin_pages:preview_on_edit", args=(self.event_page.id,)
+        )
+        response = self.client.post(preview_url, self.post_data)
+        self.assertJSONEqual(
+            response.content.decode(),
+            {"is_valid": True, "is_available": True},
+        )
+
+        # The data should be stored in the cache rather than the session
+        preview_session_key = f"wagtail-preview-{self.event_page.id}"
+        self.assertNotIn(preview_session_key, self.client.session)
+        self.assertIsNotNone(cache.get(f"{preview_session_key}-{self.user.pk}"))
+
+        # Rebuild the preview from the cached data
+        with mock.patch("wagtail.admin.views.generic.preview._validated_objects", {}):
+            response = self.client.get(preview_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, "tests/event_page.html")
+        self.assertContains(response, "Beach party")
+
+        response = self.client.delete(preview_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIsNone(cache.get(f"{preview_session_key}-{self.user.pk}"))
+
+        response = self.client.get(preview_url)
+        self.assertTemplateUsed(response, "wagtailadmin/generic/preview_error.html")
+        cache.clear()
+
+    def test_preview_on_edit_reuses_validated_object(self):
+        preview_url = reverse(
+            "wagtailadmin_pages:preview_on_edit", args=(self.event_page.id,)
+        )
+
+        with mock.patch.object(
+            PreviewOnEdit, "get_form", autospec=True, side_effect=PreviewOnEdit.get_form
+        ) as get_form:
+            self.client.post(preview_url, self.post_data)
+            self.assertEqual(get_form.call_count, 1)
+
+            # The page validated by the update is rendered without validating
+            # the data again
+            response = self.client.get(preview_url)
+            self.assertEqual(get_form.call_count, 1)
+            self.assertContains(response, "Beach party")
+            self.assertContains(response, "<li>Parties</li>")
+
+            # Later requests rebuild the page from the stored data
+            response = self.client.get(preview_url)
+            self.assertEqual(get_form.call_count, 2)
+            self.assertContains(response, "Beach party")
+
+    def test_preview_on_edit_debounces_identical_updates(self):
+        preview_url = reverse(
+            "wagtailadmin_pages:preview_on_edit", args=(self.event_page.id,)
+        )
+
+        with mock.patch.object(
+            PreviewOnEdit, "get_form", autospec=True, side_effect=PreviewOnEdit.get_form
+        ) as get_form:
+            self.client.post(preview_url, self.post_data)
+            response = self.client.post(preview_url, self.post_data)
+
+            self.assertEqual(get_form.call_count, 1)
+            self.assertJSONEqual(
+                response.content.decode(),
+                {"is_valid": True, "is_available": True},
+            )
+
+            # Changed data is validated
+            self.client.post(preview_url, {**self.post_data, "title": "Changed"})
+            self.assertEqual(get_form.call_count, 2)
+
     def test_preview_modes(self):
         preview_url = reverse(
             "wagtailadmin_pages:preview_on_add",
@@ -2,7 +2,10 @@ from django.core.checks import Error
 from django.test import TestCase, override_settings
 from django.utils.formats import reset_format_cache
 
-from wagtail.admin.checks import datetime_format_check
+from wagtail.admin.checks import (
+    datetime_format_check,
+    spreadsheet_export_storage_check,
+)
 from wagtail.test.utils import WagtailTestUtils
 
 
@@ -140,3 +143,21 @@ class TestDateTimeChecks(WagtailTestUtils, TestCase):
             ),
         ]
         self.assertEqual(errors, expected_errors)
+
+
+class TestSpreadsheetExportStorageCheck(TestCase):
+    @override_settings(WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1000)
+    def test_storage_required_for_background_export(self):
+        errors = spreadsheet_export_storage_check(None)
+
+        self.assertEqual([error.id for error in errors], ["wagtailadmin.E004"])
+
+    @override_settings(
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1000,
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+    )
+    def test_storage_set(self):
+        self.assertEqual(spreadsheet_export_storage_check(None), [])
+
+    def test_background_export_disabled(self):
+        self.assertEqual(spreadsheet_export_storage_check(None), [])
@@ -17,7 +17,14 @@ from wagtail.admin.urls import pages as wagtailadmin_pages_urls
 from wagtail.admin.urls import password_reset as wagtailadmin_password_reset_urls
 from wagtail.admin.urls import reports as wagtailadmin_reports_urls
 from wagtail.admin.urls import workflows as wagtailadmin_workflows_urls
-from wagtail.admin.views import account, chooser, dismissibles, home, tags
+from wagtail.admin.views import (
+    account,
+    chooser,
+    dismissibles,
+    home,
+    spreadsheet_export,
+    tags,
+)
 from wagtail.admin.views.bulk_action import index as bulk_actions
 from wagtail.admin.views.pages import listing
 from wagtail.utils.urlpatterns import decorate_urlpatterns
@@ -106,6 +113,11 @@ urlpatterns = [
     ),
     path("account/", account.AccountView.as_view(), name="wagtailadmin_account"),
     path("logout/", account.LogoutView.as_view(), name="wagtailadmin_logout"),
+    path(
+        "exports/<str:token>/",
+        spreadsheet_export.download,
+        name="wagtailadmin_spreadsheet_export",
+    ),
     path(
         "dismissibles/",
         dismissibles.DismissiblesView.as_view(),
@@ -1,6 +1,8 @@
 from time import time
 
+from django.conf import settings
 from django.contrib.admin.utils import unquote
+from django.core.cache import cache
 from django.core.exceptions import PermissionDenied
 from django.http import Http404, JsonResponse
 from django.http.request import QueryDict
@@ -10,15 +12,25 @@ from django.utils.decorators import method_decorator
 from django.views.generic import View
 
 from wagtail.admin.panels import get_edit_handler
+from wagtail.coreutils import safe_md5
 from wagtail.models import PreviewableMixin, RevisionMixin
 from wagtail.utils.decorators import xframe_options_sameorigin_override
 
+# Objects built from preview data validated by PreviewOnEdit.post() in this
+# process, keyed by preview store key, as (token, expiry time, object) tuples,
+# so that the following request to render the preview can skip validating the
+# same data again
+_validated_objects = {}
+
 
 class PreviewOnEdit(View):
     model = None
     form_class = None
     http_method_names = ("post", "get", "delete")
     preview_expiration_timeout = 60 * 60 * 24  # seconds
+    # How long an object validated by a preview update is kept in memory for
+    # rendering, and how long identical updates are accepted without validation
+    debounce_timeout = 10  # seconds
     session_key_prefix = "wagtail-preview-"
 
     def setup(self, request, *args, **kwargs):
@@ -30,7 +42,15 @@ class PreviewOnEdit(View):
             raise Http404
         return super().dispatch(request, *args, **kwargs)
 
+    @property
+    def use_cache(self):
+        return getattr(settings, "WAGTAIL_PREVIEW_CACHE", False)
+
     def remove_old_preview_data(self):
+        if self.use_cache:
+            # Expired data is removed by the cache
+            return
+
         expiration = time() - self.preview_expiration_timeout
         expired_keys = [
             k
@@ -48,6 +68,44 @@ class PreviewOnEdit(View):
         unique_key = f"{app_label}-{model_name}-{self.object.pk}"
         return f"{self.session_key_prefix}{unique_key}"
 
+    @property
+    def cache_key(self):
+        # Unlike the session, the cache is shared between users
+        return f"{self.session_key}-{self.request.user.pk}"
+
+    def get_preview_data(self):
+        """
+        Return the stored urlencoded preview data and the time it was stored,
+        or ``(None, None)`` if there is none.
+        """
+        if self.use_cache:
+            data = cache.get(self.cache_key)
+        else:
+            data = self.request.session.get(self.session_key)
+
+        try:
+            post_data, timestamp = data
+        except (TypeError, ValueError):
+            return None, None
+        if not isinstance(post_data, str):
+            return None, None
+        return post_data, timestamp
+
+    def set_preview_data(self, post_data):
+        if self.use_cache:
+            cache.set(
+                self.cache_key, (post_data, time()), self.preview_expiration_timeout
+            )
+        else:
+            self.request.session[self.session_key] = post_data, time()
+
+    def delete_preview_data(self):
+        if self.use_cache:
+            cache.delete(self.cache_key)
+        else:
+            self.request.session.pop(self.session_key, None)
+        _validated_objects.pop(self.cache_key, None)
+
     def get_object(self):
         obj = get_object_or_404(self.model, pk=unquote(str(self.kwargs["pk"])))
         if isinstance(obj, RevisionMixin):
@@ -68,25 +126,52 @@ class PreviewOnEdit(View):
 
         return form_class(query_dict, instance=self.object, for_user=self.request.user)
 
-    def _get_data_from_session(self):
-        post_data, _ = self.request.session.get(self.session_key, (None, None))
-        if not isinstance(post_data, str):
-            post_data = ""
-        return QueryDict(post_data)
+    def get_token(self, post_data):
+        return safe_md5(post_data.encode(), usedforsecurity=False).hexdigest()
+
+    def remember_validated_object(self, post_data, obj):
+        now = time()
+        for key, (_, expires_at, _) in list(_validated_objects.items()):
+            if expires_at < now:
+                _validated_objects.pop(key, None)
+
+        _validated_objects[self.cache_key] = (
+            self.get_token(post_data),
+            now + self.debounce_timeout,
+            obj,
+        )
+
+    def pop_validated_object(self, post_data):
+        """
+        Return the object built from ``post_data`` by a recent preview update
+        in this process, if there is one. Each object is only returned once, as
+        rendering the preview may modify it.
+        """
+        token, expires_at, obj = _validated_objects.pop(self.cache_key, (None, 0, None))
+        if token != self.get_token(post_data) or expires_at < time():
+            return None
+        return obj
 
     def post(self, request, *args, **kwargs):
         self.remove_old_preview_data()
+        post_data = request.POST.urlencode()
+        stored_data, stored_at = self.get_preview_data()
+
+        if post_data == stored_data and stored_at > time() - self.debounce_timeout:
+            # The same data was validated moments ago
+            return JsonResponse({"is_valid": True, "is_available": True})
+
         form = self.get_form(request.POST)
         is_valid = form.is_valid()
 
         if is_valid:
             # TODO: Handle request.FILES.
-            request.session[self.session_key] = request.POST.urlencode(), time()
+            self.set_preview_data(post_data)
+            self.remember_validated_object(post_data, form.save(commit=False))
             is_available = True
         else:
-            # Check previous data in session to determine preview availability
-            form = self.get_form(self._get_data_from_session())
-            is_available = form.is_valid()
+            # Only valid data is stored, so the previous data can be previewed
+            is_available = bool(stored_data)
 
         return JsonResponse({"is_valid": is_valid, "is_available": is_available})
 
@@ -99,12 +184,18 @@ class PreviewOnEdit(View):
 
     @method_decorator(xframe_options_sameorigin_override)
     def get(self, request, *args, **kwargs):
-        form = self.get_form(self._get_data_from_session())
+        post_data, _ = self.get_preview_data()
+        obj = self.pop_validated_object(post_data or "")
+
+        if obj is not None:
+            self.object = obj
+        else:
+            form = self.get_form(QueryDict(post_data or ""))
 
-        if not form.is_valid():
-            return self.error_response()
+            if not form.is_valid():
+                return self.error_response()
 
-        form.save(commit=False)
+            form.save(commit=False)
 
         try:
             preview_mode = request.GET.get("mode", self.object.default_preview_mode)
@@ -119,7 +210,7 @@ class PreviewOnEdit(View):
         return self.object.make_preview_request(request, preview_mode, extra_attrs)
 
     def delete(self, request, *args, **kwargs):
-        request.session.pop(self.session_key, None)
+        self.delete_preview_data()
         return JsonResponse({"success": True})
 
 
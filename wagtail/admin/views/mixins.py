@@ -1,13 +1,27 @@
 import csv
 import datetime
+import logging
+import posixpath
+import tempfile
+import threading
+import time
+import uuid
 from collections import OrderedDict
 from functools import partial
-from io import BytesIO
 
+from django.conf import settings
 from django.contrib.admin.utils import label_for_field
-from django.core.exceptions import FieldDoesNotExist
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import storages
+from django.db import connections
+from django.db.models import QuerySet
 from django.http import FileResponse, StreamingHttpResponse
-from django.utils import timezone
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone, translation
 from django.utils.dateformat import Formatter
 from django.utils.encoding import force_str
 from django.utils.formats import get_format
@@ -17,9 +31,52 @@ from django.utils.translation import gettext as _
 from openpyxl import Workbook
 from openpyxl.cell import WriteOnlyCell
 
+from wagtail.admin import messages
+from wagtail.admin.mail import send_mail
 from wagtail.admin.widgets.button import Button
 from wagtail.coreutils import multigetattr
 
+logger = logging.getLogger("wagtail.admin")
+
+SPREADSHEET_EXPORT_SALT = "wagtail.admin.spreadsheet_export"
+
+# The number of seconds that links to exports prepared in the background are valid for
+SPREADSHEET_EXPORT_MAX_AGE = 60 * 60 * 24
+
+# The number of seconds after which an export that is still being prepared is
+# treated as failed, such as when the process preparing it was stopped
+SPREADSHEET_EXPORT_TIMEOUT = 60 * 60
+
+# The directory of the export storage that exports are saved to
+SPREADSHEET_EXPORT_DIRECTORY = "wagtail_exports"
+
+SPREADSHEET_EXPORT_COMPLETE = "complete"
+SPREADSHEET_EXPORT_FAILED = "failed"
+
+
+def get_spreadsheet_export_storage():
+    """
+    Returns the storage that exports prepared in the background are saved to.
+    There is no default, as the default storage is usually served publicly.
+    """
+    alias = getattr(settings, "WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE", None)
+    if alias is None:
+        raise ImproperlyConfigured(
+            "The WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE setting must be set to "
+            "a storage whose files aren't publicly served, to export "
+            "spreadsheets in the background"
+        )
+    return storages[alias]
+
+
+def get_spreadsheet_export_status_path(path):
+    """
+    Returns the path of the file recording whether the export saved at ``path``
+    is complete or has failed. Exports are saved in their own directory, along
+    with this file.
+    """
+    return posixpath.join(posixpath.dirname(path), "status")
+
 
 class Echo:
     """An object that implements just the write method of the file-like interface."""
@@ -162,6 +219,14 @@ class SpreadsheetExportMixin:
 
     export_filename = "spreadsheet-export"
 
+    # The number of items fetched from the database at a time while exporting
+    export_chunk_size = 2000
+
+    # Exports with more items than this are prepared in the background, rather
+    # than returned in the response. Defaults to the
+    # WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD setting
+    export_background_threshold = None
+
     def setup(self, request, *args, **kwargs):
         super().setup(request, *args, **kwargs)
         self.is_export = request.GET.get("export") in self.FORMATS
@@ -234,6 +299,15 @@ class SpreadsheetExportMixin:
         except (AttributeError, FieldDoesNotExist):
             return force_str(field)
 
+    def iter_export_items(self, queryset):
+        """
+        Iterate over the items to export, fetching querysets from the database
+        in chunks rather than loading them all into memory at once
+        """
+        if isinstance(queryset, QuerySet) and queryset._result_cache is None:
+            return queryset.iterator(chunk_size=self.export_chunk_size)
+        return iter(queryset)
+
     def stream_csv(self, queryset):
         """Generate a csv file line by line from queryset, to be used in a StreamingHTTPResponse"""
         writer = csv.DictWriter(Echo(), fieldnames=self.list_export)
@@ -241,11 +315,13 @@ class SpreadsheetExportMixin:
             {field: self.get_heading(queryset, field) for field in self.list_export}
         )
 
-        for item in queryset:
+        for item in self.iter_export_items(queryset):
             yield self.write_csv_row(writer, self.to_row_dict(item))
 
     def write_xlsx(self, queryset, output):
         """Write an xlsx workbook from a queryset"""
+        # In write-only mode, rows are written to a temporary file as they are
+        # appended, so memory use doesn't grow with the number of rows
         workbook = Workbook(write_only=True, iso_dates=True)
 
         worksheet = workbook.create_sheet(title="Sheet1")
@@ -254,7 +330,7 @@ class SpreadsheetExportMixin:
         )
 
         date_format = ExcelDateFormatter().get()
-        for item in queryset:
+        for item in self.iter_export_items(queryset):
             worksheet.append(
                 self.generate_xlsx_row(
                     worksheet, self.to_row_dict(item), date_format=date_format
@@ -265,7 +341,9 @@ class SpreadsheetExportMixin:
 
     def write_xlsx_response(self, queryset):
         """Write an xlsx file from a queryset and return a FileResponse"""
-        output = BytesIO()
+        # The workbook is written to a temporary file rather than memory, and
+        # streamed from there. The file is deleted when the response is closed
+        output = tempfile.TemporaryFile()
         self.write_xlsx(queryset, output)
         output.seek(0)
 
@@ -276,6 +354,124 @@ class SpreadsheetExportMixin:
             filename=f"{self.get_filename()}.xlsx",
         )
 
+    def write_spreadsheet(self, queryset, spreadsheet_format, output):
+        """Write a spreadsheet in the given format from a queryset to a binary file"""
+        if spreadsheet_format == self.FORMAT_CSV:
+            for line in self.stream_csv(queryset):
+                output.write(line)
+        elif spreadsheet_format == self.FORMAT_XLSX:
+            self.write_xlsx(queryset, output)
+
+    def get_export_background_threshold(self):
+        if self.export_background_threshold is not None:
+            return self.export_background_threshold
+        return getattr(
+            settings, "WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD", None
+        )
+
+    def should_export_in_background(self, queryset):
+        threshold = self.get_export_background_threshold()
+        if threshold is None:
+            return False
+        # Fail before counting the items if there is no storage to export to
+        get_spreadsheet_export_storage()
+        if isinstance(queryset, QuerySet):
+            return queryset.count() > threshold
+        return len(queryset) > threshold
+
+    def run_in_background(self, func):
+        """
+        Run the given function in a background thread. The thread runs in the
+        web server process, so the export is lost if the process is stopped
+        before it finishes.
+        """
+
+        def run():
+            try:
+                func()
+            finally:
+                connections.close_all()
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def save_spreadsheet(self, queryset, spreadsheet_format, path):
+        """
+        Save a spreadsheet to the export storage at the given path, followed by
+        a status file that records whether it was saved successfully. Returns
+        whether the spreadsheet was saved.
+        """
+        storage = get_spreadsheet_export_storage()
+        status_path = get_spreadsheet_export_status_path(path)
+
+        try:
+            with tempfile.TemporaryFile() as output:
+                self.write_spreadsheet(queryset, spreadsheet_format, output)
+                output.seek(0)
+                storage.save(path, File(output))
+        except Exception:
+            logger.exception("Spreadsheet export failed")
+            storage.save(status_path, ContentFile(SPREADSHEET_EXPORT_FAILED.encode()))
+            return False
+
+        # Some storages create the file before writing its contents, so the
+        # export is only available to download once the status is saved
+        storage.save(status_path, ContentFile(SPREADSHEET_EXPORT_COMPLETE.encode()))
+        return True
+
+    def notify_export_ready(self, email, download_url):
+        """Email the user that requested an export prepared in the background"""
+        if not email:
+            return
+        send_mail(
+            _("Your export is ready"),
+            _("Your export is ready to download from %(url)s") % {"url": download_url},
+            [email],
+        )
+
+    def export_in_background(self, queryset, spreadsheet_format):
+        """
+        Start preparing the spreadsheet in the background, and redirect back to
+        the listing with a link to download it once it's ready
+        """
+        path = "{}/{}/{}.{}".format(
+            SPREADSHEET_EXPORT_DIRECTORY,
+            uuid.uuid4().hex,
+            self.get_filename(),
+            spreadsheet_format,
+        )
+        token = signing.dumps(
+            {"user": self.request.user.pk, "path": path, "created": int(time.time())},
+            salt=SPREADSHEET_EXPORT_SALT,
+        )
+        download_url = reverse("wagtailadmin_spreadsheet_export", args=(token,))
+
+        # Only pass plain values from the request to the background thread
+        language = translation.get_language()
+        email = self.request.user.email
+        absolute_download_url = self.request.build_absolute_uri(download_url)
+        queryset = queryset.all() if isinstance(queryset, QuerySet) else queryset
+
+        def save():
+            with translation.override(language):
+                if self.save_spreadsheet(queryset, spreadsheet_format, path):
+                    self.notify_export_ready(email, absolute_download_url)
+
+        self.run_in_background(save)
+
+        messages.success(
+            self.request,
+            _(
+                "Your export is being prepared. It can be downloaded from the link below once it's ready."
+            ),
+            buttons=[messages.button(download_url, _("Download"))],
+        )
+
+        params = self.request.GET.copy()
+        params.pop("export", None)
+        if params:
+            return redirect(self.request.path + "?" + params.urlencode())
+        return redirect(self.request.path)
+
     def write_csv_response(self, queryset):
         stream = self.stream_csv(queryset)
 
@@ -287,6 +483,10 @@ class SpreadsheetExportMixin:
 
     def as_spreadsheet(self, queryset, spreadsheet_format):
         """Return a response with a spreadsheet representing the exported data from queryset, in the format specified"""
+        if spreadsheet_format in self.FORMATS and self.should_export_in_background(
+            queryset
+        ):
+            return self.export_in_background(queryset, spreadsheet_format)
         if spreadsheet_format == self.FORMAT_CSV:
             return self.write_csv_response(queryset)
         elif spreadsheet_format == self.FORMAT_XLSX:
@@ -0,0 +1,70 @@
+import os
+import time
+
+from django.core import signing
+from django.core.exceptions import PermissionDenied
+from django.http import FileResponse, Http404
+from django.template.response import TemplateResponse
+from django.utils.translation import gettext as _
+
+from wagtail.admin.views.mixins import (
+    SPREADSHEET_EXPORT_COMPLETE,
+    SPREADSHEET_EXPORT_FAILED,
+    SPREADSHEET_EXPORT_MAX_AGE,
+    SPREADSHEET_EXPORT_SALT,
+    SPREADSHEET_EXPORT_TIMEOUT,
+    get_spreadsheet_export_status_path,
+    get_spreadsheet_export_storage,
+)
+
+
+def get_export_status(storage, path):
+    status_path = get_spreadsheet_export_status_path(path)
+    if not storage.exists(status_path):
+        return None
+    with storage.open(status_path, "rb") as status_file:
+        return status_file.read().decode()
+
+
+def download(request, token):
+    """
+    Download a spreadsheet export that was prepared in the background, or show
+    that it is still being prepared or has failed
+    """
+    try:
+        export = signing.loads(
+            token, salt=SPREADSHEET_EXPORT_SALT, max_age=SPREADSHEET_EXPORT_MAX_AGE
+        )
+    except signing.BadSignature:
+        raise Http404
+
+    # Exports are only available to the user that requested them
+    if export["user"] != request.user.pk:
+        raise PermissionDenied
+
+    storage = get_spreadsheet_export_storage()
+    path = export["path"]
+    status = get_export_status(storage, path)
+
+    if status == SPREADSHEET_EXPORT_COMPLETE:
+        return FileResponse(
+            storage.open(path, "rb"),
+            as_attachment=True,
+            filename=os.path.basename(path),
+        )
+
+    created = export.get("created")
+    if status == SPREADSHEET_EXPORT_FAILED or (
+        created is not None and time.time() - created > SPREADSHEET_EXPORT_TIMEOUT
+    ):
+        return TemplateResponse(
+            request,
+            "wagtailadmin/shared/spreadsheet_export_failed.html",
+            {"page_title": _("Export failed"), "header_icon": "warning"},
+        )
+
+    return TemplateResponse(
+        request,
+        "wagtailadmin/shared/spreadsheet_export_pending.html",
+        {"page_title": _("Preparing export"), "header_icon": "download"},
+    )
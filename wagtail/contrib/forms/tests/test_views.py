@@ -1,17 +1,30 @@
 import datetime
-from io import BytesIO
+import time
+from io import BytesIO, StringIO
+from unittest import mock
 
+from bs4 import BeautifulSoup
 from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.contrib.contenttypes.models import ContentType
+from django.core import mail, management, signing
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.base import ContentFile
 from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from django.utils.html import escape
 from django.utils.http import urlencode
 from openpyxl import load_workbook
 
 from wagtail.admin.forms import WagtailAdminPageForm
 from wagtail.admin.panels import get_form_for_model
+from wagtail.admin.views.mixins import (
+    SPREADSHEET_EXPORT_MAX_AGE,
+    SPREADSHEET_EXPORT_SALT,
+    SPREADSHEET_EXPORT_TIMEOUT,
+    get_spreadsheet_export_storage,
+)
 from wagtail.contrib.forms.models import FormSubmission
 from wagtail.contrib.forms.panels import FormSubmissionsPanel
 from wagtail.contrib.forms.tests.utils import (
@@ -19,6 +32,7 @@ from wagtail.contrib.forms.tests.utils import (
     make_form_page_with_custom_submission,
 )
 from wagtail.contrib.forms.utils import get_form_types
+from wagtail.contrib.forms.views import SubmissionsListView
 from wagtail.models import Locale, Page
 from wagtail.test.demosite.models import FormPage as FormPageDemo
 from wagtail.test.testapp.models import (
@@ -748,6 +762,166 @@ class TestFormsSubmissionsExport(WagtailTestUtils, TestCase):
         )
         self.assertEqual(len(cell_array), 3)
 
+    def start_background_export(self):
+        """
+        Request an export that is prepared in the background, and return the
+        URL to download it and the background task, which is not run
+        """
+        index_url = reverse("wagtailforms:list_submissions", args=(self.form_page.id,))
+        background_tasks = []
+        with mock.patch.object(
+            SubmissionsListView,
+            "run_in_background",
+            side_effect=background_tasks.append,
+        ):
+            response = self.client.get(index_url, {"export": "xlsx"})
+
+        self.assertRedirects(response, index_url)
+        [message] = response.wsgi_request._messages
+        self.assertIn("Your export is being prepared", message.message)
+        download_url = BeautifulSoup(message.message, "html.parser").select_one("a")[
+            "href"
+        ]
+        [task] = background_tasks
+        return download_url, task
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        },
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1,
+    )
+    def test_list_submissions_xlsx_export_in_background(self):
+        download_url, task = self.start_background_export()
+
+        # The export isn't ready until the background task has run
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Your export is still being prepared")
+
+        task()
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertIn(download_url, mail.outbox[0].body)
+
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(f"{self.form_page.slug}-export-", response["Content-Disposition"])
+        worksheet = load_workbook(filename=BytesIO(response.getvalue()))["Sheet1"]
+        self.assertEqual(len(list(worksheet.rows)), 3)
+
+        # The export is only available to the user who requested it
+        other_user = self.create_superuser("other", password="password")
+        self.login(user=other_user)
+        response = self.client.get(download_url)
+        self.assertRedirects(response, reverse("wagtailadmin_home"))
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        },
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1,
+    )
+    def test_export_in_background_not_available_until_complete(self):
+        download_url, _ = self.start_background_export()
+
+        # Some storages create the file before its contents have been written
+        token = download_url.rstrip("/").rsplit("/", 1)[-1]
+        path = signing.loads(token, salt=SPREADSHEET_EXPORT_SALT)["path"]
+        get_spreadsheet_export_storage().save(path, ContentFile(b""))
+
+        response = self.client.get(download_url)
+        self.assertContains(response, "Your export is still being prepared")
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        },
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1,
+    )
+    def test_failed_export_in_background(self):
+        download_url, task = self.start_background_export()
+
+        with mock.patch.object(
+            SubmissionsListView, "write_spreadsheet", side_effect=ValueError
+        ), self.assertLogs("wagtail.admin", level="ERROR"):
+            task()
+
+        self.assertEqual(len(mail.outbox), 0)
+        response = self.client.get(download_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Your export could not be prepared")
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        },
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1,
+    )
+    def test_interrupted_export_in_background(self):
+        download_url, _ = self.start_background_export()
+
+        # The task never runs, as if the process running it was stopped
+        with mock.patch(
+            "wagtail.admin.views.spreadsheet_export.time.time",
+            return_value=time.time() + SPREADSHEET_EXPORT_TIMEOUT + 1,
+        ):
+            response = self.client.get(download_url)
+
+        self.assertContains(response, "Your export could not be prepared")
+
+    @override_settings(
+        STORAGES={
+            **settings.STORAGES,
+            "exports": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+        },
+        WAGTAILADMIN_SPREADSHEET_EXPORT_STORAGE="exports",
+        WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1,
+    )
+    def test_purge_spreadsheet_exports(self):
+        _, task = self.start_background_export()
+        task()
+        storage = get_spreadsheet_export_storage()
+
+        # Exports whose links are still valid are kept
+        management.call_command("purge_spreadsheet_exports", stdout=StringIO())
+        self.assertEqual(len(storage.listdir("wagtail_exports")[0]), 1)
+
+        with mock.patch(
+            "django.utils.timezone.now",
+            return_value=timezone.now()
+            + datetime.timedelta(seconds=SPREADSHEET_EXPORT_MAX_AGE + 1),
+        ):
+            stdout = StringIO()
+            management.call_command("purge_spreadsheet_exports", stdout=stdout)
+
+        self.assertIn("Successfully deleted 1 spreadsheet exports", stdout.getvalue())
+        self.assertEqual(storage.listdir("wagtail_exports")[0], [])
+
+    @override_settings(WAGTAILADMIN_SPREADSHEET_EXPORT_BACKGROUND_THRESHOLD=1)
+    def test_export_in_background_requires_storage(self):
+        # Exports are never saved to the default storage, which may be public
+        index_url = reverse("wagtailforms:list_submissions", args=(self.form_page.id,))
+        with mock.patch.object(
+            SubmissionsListView, "run_in_background"
+        ) as run_in_background, self.assertRaises(ImproperlyConfigured):
+            self.client.get(index_url, {"export": "xlsx"})
+
+        run_in_background.assert_not_called()
+
+    def test_download_export_with_invalid_token(self):
+        response = self.client.get(
+            reverse("wagtailadmin_spreadsheet_export", args=("invalid",))
+        )
+        self.assertEqual(response.status_code, 404)
+
     def test_list_submissions_csv_large_export(self):
         for i in range(100):
             new_form_submission = FormSubmission.objects.create(
@@ -1,4 +1,5 @@
 import logging
+import time
 
 from django.http.request import validate_host
 
@@ -9,10 +10,20 @@ __all__ = ["BaseBackend"]
 
 
 class BaseBackend:
+    # The maximum number of URLs sent in each purge_batch() call when purging
+    # queued URLs, if the provider limits the size of purge requests
+    batch_size = None
+
     def __init__(self, params):
         # If unspecified, invalidate all hosts
         self.hostnames = params.get("HOSTNAMES", ["*"])
 
+        # Limits applied when purging URLs queued by the "queue" purge mode. The
+        # rate limit is the maximum number of purge_batch() calls per second.
+        self.batch_size = params.get("BATCH_SIZE", self.batch_size)
+        self.rate_limit = params.get("RATE_LIMIT", None)
+        self._last_batch_time = None
+
     def purge(self, url) -> None:
         raise NotImplementedError
 
@@ -21,6 +32,23 @@ class BaseBackend:
         for url in urls:
             self.purge(url)
 
+    def purge_batch_with_limits(self, urls) -> None:
+        """
+        Purge ``urls`` in batches of at most ``batch_size`` URLs, waiting between
+        batches so that no more than ``rate_limit`` batches are sent per second.
+        """
+        urls = list(urls)
+        batch_size = self.batch_size or len(urls)
+
+        for i in range(0, len(urls), batch_size):
+            if self.rate_limit and self._last_batch_time is not None:
+                wait = self._last_batch_time + 1 / self.rate_limit - time.monotonic()
+                if wait > 0:
+                    time.sleep(wait)
+
+            self._last_batch_time = time.monotonic()
+            self.purge_batch(urls[i : i + batch_size])
+
     def invalidates_hostname(self, hostname) -> bool:
         """
         Can `hostname` be invalidated by this backend?
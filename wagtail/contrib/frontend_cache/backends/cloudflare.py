@@ -13,6 +13,7 @@ __all__ = ["CloudflareBackend"]
 
 class CloudflareBackend(BaseBackend):
     CHUNK_SIZE = 30
+    batch_size = CHUNK_SIZE
 
     def __init__(self, params):
         super().__init__(params)
@@ -17,6 +17,9 @@ __all__ = ["CloudfrontBackend"]
 
 
 class CloudfrontBackend(BaseBackend):
+    # CloudFront allows up to 3000 paths to be invalidated at a time
+    batch_size = 3000
+
     def __init__(self, params):
         import boto3
 
@@ -0,0 +1,43 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.frontend_cache.utils import purge_queued_urls
+
+
+class Command(BaseCommand):
+    """Command to purge URLs that have been queued by the "queue" purge mode."""
+
+    help = "Purge the URLs that have been queued for purging from the frontend cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of queued URLs to fetch at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and poll for new URLs, instead of exiting once the queue is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Number of seconds to wait between polls when using --watch (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        purged = 0
+
+        while True:
+            count = purge_queued_urls(chunk_size=options["chunk_size"])
+            purged += count
+            if not options["watch"]:
+                break
+            if not count:
+                time.sleep(options["interval"])
+
+        self.stdout.write(self.style.SUCCESS(f"Successfully purged {purged} URL(s)"))
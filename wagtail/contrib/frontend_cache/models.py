@@ -0,0 +1,26 @@
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class PendingPurge(models.Model):
+    """
+    A URL that needs to be purged from the frontend cache, when
+    ``WAGTAILFRONTENDCACHE_PURGE_MODE`` is set to ``"queue"``. The queue is processed
+    by the ``wagtail_purge_frontend_cache`` management command, which purges each
+    distinct URL once, however many times it has been queued.
+    """
+
+    url = models.TextField()
+    queued_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        verbose_name = _("pending frontend cache purge")
+        verbose_name_plural = _("pending frontend cache purges")
+
+    @classmethod
+    def enqueue(cls, urls, using=None):
+        """
+        Add the given URLs to the queue.
+        """
+        cls.objects.using(using).bulk_create([cls(url=url) for url in set(urls)])
@@ -1,14 +1,26 @@
 from django.apps import apps
 
-from wagtail.contrib.frontend_cache.utils import purge_page_from_cache
+from wagtail.contrib.frontend_cache.utils import (
+    defer_purge_page,
+    get_purge_mode,
+    purge_page_from_cache,
+)
 from wagtail.signals import page_published, page_unpublished
 
 
 def page_published_signal_handler(instance, **kwargs):
+    if get_purge_mode() != "immediate":
+        defer_purge_page(instance)
+        return
+
     purge_page_from_cache(instance)
 
 
 def page_unpublished_signal_handler(instance, **kwargs):
+    if get_purge_mode() != "immediate":
+        defer_purge_page(instance)
+        return
+
     purge_page_from_cache(instance)
 
 
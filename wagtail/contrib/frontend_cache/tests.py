@@ -1,9 +1,11 @@
+from io import StringIO
 from unittest import mock
 from urllib.error import HTTPError, URLError
 
 import requests
 from azure.mgmt.cdn import CdnManagementClient
 from azure.mgmt.frontdoor import FrontDoorManagementClient
+from django.core import management
 from django.core.exceptions import ImproperlyConfigured
 from django.test import SimpleTestCase, TestCase
 from django.test.utils import override_settings
@@ -16,13 +18,15 @@ from wagtail.contrib.frontend_cache.backends import (
     CloudfrontBackend,
     HTTPBackend,
 )
-from wagtail.contrib.frontend_cache.utils import get_backends
+from wagtail.contrib.frontend_cache.models import PendingPurge
+from wagtail.contrib.frontend_cache.utils import get_backends, purge_queued_urls
 from wagtail.models import Page
 from wagtail.test.testapp.models import EventIndex
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
 
 from .utils import (
     PurgeBatch,
+    _deferred_purges,
     purge_page_from_cache,
     purge_pages_from_cache,
     purge_url_from_cache,
@@ -619,6 +623,139 @@ class TestCachePurgingSignals(TestCase):
         )
 
 
+PURGED_BATCHES = []
+
+
+class MockBatchBackend(BaseBackend):
+    def purge_batch(self, urls):
+        PURGED_BATCHES.append(sorted(urls))
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+        },
+    },
+    WAGTAILFRONTENDCACHE_PURGE_MODE="deferred",
+)
+class TestDeferredCachePurging(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_BATCHES.clear()
+
+    def test_purge_on_commit(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            page.save_revision().publish()
+            page.save_revision().publish()
+            page.get_children().first().specific.save_revision().publish()
+
+            # Nothing is purged until the transaction is committed
+            self.assertEqual(PURGED_BATCHES, [])
+
+        # A single callback is registered for the transaction
+        self.assertEqual(
+            len(
+                [
+                    callback
+                    for callback in callbacks
+                    if getattr(callback, "func", None) == _deferred_purges.flush
+                ]
+            ),
+            1,
+        )
+
+        # All the URLs are purged in a single batch
+        self.assertEqual(
+            PURGED_BATCHES,
+            [
+                [
+                    "http://localhost/events/",
+                    "http://localhost/events/christmas/",
+                    "http://localhost/events/past/",
+                ]
+            ],
+        )
+
+    def test_rolled_back(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            page.unpublish()
+
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(PURGED_BATCHES, [])
+
+
+@override_settings(
+    WAGTAILFRONTENDCACHE={
+        "varnish": {
+            "BACKEND": "wagtail.contrib.frontend_cache.tests.MockBatchBackend",
+            "BATCH_SIZE": 2,
+            "RATE_LIMIT": 10,
+        },
+    },
+    WAGTAILFRONTENDCACHE_PURGE_MODE="queue",
+)
+class TestQueuedCachePurging(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        PURGED_BATCHES.clear()
+
+    def test_queue(self):
+        page = EventIndex.objects.get(url_path="/home/events/")
+        page.save_revision().publish()
+        page.save_revision().publish()
+
+        self.assertEqual(PURGED_BATCHES, [])
+        self.assertEqual(PendingPurge.objects.count(), 4)
+
+        with mock.patch(
+            "wagtail.contrib.frontend_cache.backends.base.time.sleep"
+        ) as sleep:
+            management.call_command("wagtail_purge_frontend_cache", stdout=StringIO())
+
+        # Each URL is purged once, in batches of BATCH_SIZE URLs
+        self.assertEqual(
+            PURGED_BATCHES,
+            [["http://localhost/events/", "http://localhost/events/past/"]],
+        )
+        sleep.assert_not_called()
+        self.assertFalse(PendingPurge.objects.exists())
+
+    def test_batch_size_and_rate_limit(self):
+        PendingPurge.enqueue([f"http://localhost/foo{i}" for i in range(5)])
+
+        with mock.patch(
+            "wagtail.contrib.frontend_cache.backends.base.time.sleep"
+        ) as sleep:
+            self.assertEqual(purge_queued_urls(chunk_size=10), 5)
+
+        self.assertEqual([len(batch) for batch in PURGED_BATCHES], [2, 2, 1])
+        self.assertEqual(sleep.call_count, 2)
+        for call in sleep.call_args_list:
+            self.assertLessEqual(call.args[0], 0.1)
+
+    def test_entries_queued_during_purge_are_kept(self):
+        PendingPurge.enqueue(["http://localhost/foo"])
+
+        def purge_batch(urls):
+            PURGED_BATCHES.append(sorted(urls))
+            PendingPurge.enqueue(["http://localhost/foo", "http://localhost/bar"])
+
+        with mock.patch.object(
+            MockBatchBackend, "purge_batch", side_effect=purge_batch
+        ):
+            self.assertEqual(purge_queued_urls(), 1)
+
+        self.assertEqual(
+            sorted(PendingPurge.objects.values_list("url", flat=True)),
+            ["http://localhost/bar", "http://localhost/foo"],
+        )
+
+
 class TestPurgeBatchClass(TestCase):
     # Tests the .add_*() methods on PurgeBatch. The .purge() method is tested
     # by TestCachePurgingFunctions.test_purge_batch above
@@ -8,6 +8,7 @@ from django.core.exceptions import ImproperlyConfigured
 from django.utils.module_loading import import_string
 
 from wagtail.coreutils import get_content_languages
+from wagtail.utils.pending_updates import DeferredUpdates
 
 logger = logging.getLogger("wagtail.frontendcache")
 
@@ -73,6 +74,14 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
     if not backends:
         return
 
+    _purge_urls_with_backends(urls, backends)
+
+
+def _purge_urls_with_backends(urls, backends, apply_limits=False):
+    """
+    Purge ``urls`` from the given backend objects. If ``apply_limits`` is True,
+    the URLs are sent to each backend within its batch size and rate limit.
+    """
     # Convert each url to urls one for each managed language (WAGTAILFRONTENDCACHE_LANGUAGES setting).
     # The managed languages are common to all the defined backends.
     # This depends on settings.USE_I18N
@@ -129,7 +138,10 @@ def purge_urls_from_cache(urls, backend_settings=None, backends=None):
             for url in urls:
                 logger.info("[%s] Purging URL: %s", backend_name, url)
 
-            backend.purge_batch(urls)
+            if apply_limits:
+                backend.purge_batch_with_limits(urls)
+            else:
+                backend.purge_batch(urls)
 
 
 def _get_page_cached_urls(page):
@@ -153,6 +165,94 @@ def purge_pages_from_cache(pages, backend_settings=None, backends=None):
         purge_urls_from_cache(urls, backend_settings, backends)
 
 
+def get_purge_mode():
+    """
+    Returns how pages are purged from the frontend cache when they are published
+    or unpublished, as configured by the ``WAGTAILFRONTENDCACHE_PURGE_MODE`` setting:
+
+    - ``"immediate"`` - each page is purged as soon as it is published
+    - ``"deferred"`` - the URLs of all pages published in the current transaction
+      are collected and purged together once it is committed
+    - ``"queue"`` - the URLs are added to a queue in the database, to be purged by
+      the ``wagtail_purge_frontend_cache`` management command
+    """
+    return getattr(settings, "WAGTAILFRONTENDCACHE_PURGE_MODE", "immediate")
+
+
+def purge_deferred_urls(key, urls):
+    purge_urls_from_cache(sorted(urls))
+
+
+_deferred_purges = DeferredUpdates(purge_deferred_urls)
+
+
+def defer_purge_page(page, using=None):
+    """
+    Schedule the URLs of ``page`` to be purged according to the purge mode. URLs
+    purged more than once in the same transaction are only purged once.
+    """
+    urls = _get_page_cached_urls(page)
+    if not urls:
+        return
+
+    if get_purge_mode() == "queue":
+        from wagtail.contrib.frontend_cache.models import PendingPurge
+
+        PendingPurge.enqueue(urls, using=using)
+        return
+
+    # The URLs of all pages are purged together, so they share a single key
+    for url in urls:
+        _deferred_purges.add(None, url, using=using)
+
+
+def flush_deferred_purges(using=None):
+    """
+    Purge all the URLs whose purges have been deferred by ``defer_purge_page()``
+    for the given database connection.
+    """
+    _deferred_purges.flush(using)
+
+
+def purge_queued_urls(chunk_size=1000, backend_settings=None, backends=None):
+    """
+    Purge the URLs queued by the ``"queue"`` purge mode, removing them from the
+    queue once purged. Each backend is sent the URLs within its batch size and
+    rate limit. Returns the number of distinct URLs purged.
+    """
+    from wagtail.contrib.frontend_cache.models import PendingPurge
+
+    backends = get_backends(backend_settings, backends)
+    purged_count = 0
+
+    # URLs that are queued while purging are left for the next run
+    last_entry = PendingPurge.objects.order_by("pk").last()
+    if last_entry is None:
+        return 0
+    entries_queryset = PendingPurge.objects.filter(pk__lte=last_entry.pk)
+
+    while True:
+        urls = set(
+            entries_queryset.order_by("pk").values_list("url", flat=True)[:chunk_size]
+        )
+        if not urls:
+            break
+
+        # Fetch every entry for these URLs before purging, so that only entries that
+        # were queued before the purge are removed
+        entry_ids = list(
+            entries_queryset.filter(url__in=urls).values_list("pk", flat=True)
+        )
+
+        if backends:
+            _purge_urls_with_backends(urls, backends, apply_limits=True)
+
+        PendingPurge.objects.filter(pk__in=entry_ids).delete()
+        purged_count += len(urls)
+
+    return purged_count
+
+
 class PurgeBatch:
     """Represents a list of URLs to be purged in a single request"""
 
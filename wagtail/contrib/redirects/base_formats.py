@@ -46,6 +46,13 @@ class CSV:
         """
         return Dataset(csv.reader(StringIO(data), delimiter=delimiter))
 
+    def iter_rows(self, file, delimiter=","):
+        """
+        Iterate over the rows of csv data read from an open file, including the
+        header row, without reading the whole file into memory.
+        """
+        return csv.reader(file, delimiter=delimiter)
+
 
 class TSV(CSV):
     def create_dataset(self, data):
@@ -54,6 +61,12 @@ class TSV(CSV):
         """
         return super().create_dataset(data, delimiter="\t")
 
+    def iter_rows(self, file):
+        """
+        Iterate over the rows of tsv data read from an open file.
+        """
+        return super().iter_rows(file, delimiter="\t")
+
 
 class XLSX:
     def is_binary(self):
@@ -73,6 +86,19 @@ class XLSX:
         finally:
             workbook.close()
 
+    def iter_rows(self, file):
+        """
+        Iterate over the rows of the first sheet of a xlsx workbook read from an
+        open file, including the header row, without loading the whole sheet.
+        """
+        workbook = openpyxl.load_workbook(file, read_only=True, data_only=True)
+        sheet = workbook.worksheets[0]
+        try:
+            for row in sheet.iter_rows(values_only=True):
+                yield row
+        finally:
+            workbook.close()
+
 
 DEFAULT_FORMATS = [
     CSV,
@@ -0,0 +1,184 @@
+import time
+
+from django.core.exceptions import ValidationError
+from django.db import connections, router, transaction
+
+from wagtail.contrib.redirects.forms import RedirectForm
+from wagtail.contrib.redirects.lookup import clear_lookup_cache
+from wagtail.contrib.redirects.models import Redirect
+
+DEFAULT_BATCH_SIZE = 1000
+
+
+class BulkRedirectImporter:
+    """
+    Imports redirects from an iterable of rows in batches of ``batch_size``,
+    rather than saving each row through ``RedirectForm``.
+
+    Each batch is validated with the same fields as ``RedirectForm`` and then
+    saved with a single query, replacing any existing redirects from the same
+    paths for the site. Rows that fail validation are recorded in ``errors``
+    as ``(row number, from, to, error)`` tuples, and don't stop the import.
+    """
+
+    update_fields = [
+        "redirect_page",
+        "redirect_page_route_path",
+        "redirect_link",
+        "is_permanent",
+        "automatically_created",
+    ]
+
+    def __init__(
+        self,
+        from_index=0,
+        to_index=1,
+        site=None,
+        permanent=True,
+        batch_size=DEFAULT_BATCH_SIZE,
+        dry_run=False,
+    ):
+        self.from_index = from_index
+        self.to_index = to_index
+        self.site = site
+        self.permanent = permanent
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+
+        self.old_path_field = RedirectForm.base_fields["old_path"]
+        self.redirect_link_field = RedirectForm.base_fields["redirect_link"]
+
+        self.total = 0
+        self.successes = 0
+        self.errors = []
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def rows_per_second(self):
+        elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return self.total / elapsed if elapsed > 0 else 0
+
+    def get_cell(self, row, index):
+        try:
+            value = row[index]
+        except IndexError:
+            value = None
+        return "" if value is None else str(value)
+
+    def clean_row(self, from_link, to_link):
+        """
+        Return an unsaved ``Redirect`` for a row, or raise ``ValidationError``.
+        """
+        messages = []
+
+        try:
+            old_path = Redirect.normalise_path(self.old_path_field.clean(from_link))
+            self.old_path_field.clean(old_path)
+        except ValidationError as e:
+            messages.extend(e.messages)
+
+        try:
+            redirect_link = self.redirect_link_field.clean(to_link)
+        except ValidationError as e:
+            messages.extend(e.messages)
+
+        if messages:
+            raise ValidationError(messages)
+
+        return Redirect(
+            old_path=old_path,
+            site=self.site,
+            redirect_link=redirect_link,
+            redirect_page=None,
+            redirect_page_route_path="",
+            is_permanent=self.permanent,
+            automatically_created=False,
+        )
+
+    def import_rows(self, rows, start=1, progress=None):
+        """
+        Import redirects from ``rows``, which shouldn't include a header row.
+        Rows are numbered from ``start`` in the reported errors. If given,
+        ``progress`` is called with the importer after each batch.
+        """
+        self.started_at = time.monotonic()
+        self.finished_at = None
+
+        batch = {}
+        for row_number, row in enumerate(rows, start=start):
+            self.total += 1
+            from_link = self.get_cell(row, self.from_index)
+            to_link = self.get_cell(row, self.to_index)
+
+            try:
+                redirect = self.clean_row(from_link, to_link)
+            except ValidationError as e:
+                self.errors.append(
+                    (row_number, from_link, to_link, ", ".join(e.messages))
+                )
+                continue
+
+            # A later row for the same path replaces an earlier one, as it would
+            # if they were in separate batches
+            batch.pop(redirect.old_path, None)
+            batch[redirect.old_path] = redirect
+
+            if len(batch) >= self.batch_size:
+                self.save_batch(list(batch.values()))
+                batch = {}
+                if progress:
+                    progress(self)
+
+        if batch:
+            self.save_batch(list(batch.values()))
+            if progress:
+                progress(self)
+
+        self.finished_at = time.monotonic()
+
+    def save_batch(self, redirects):
+        if not self.dry_run:
+            with transaction.atomic():
+                self.upsert(redirects)
+
+            # Redirects saved in bulk don't send the signals that clear the
+            # lookup cache
+            clear_lookup_cache()
+
+        self.successes += len(redirects)
+
+    def upsert(self, redirects):
+        connection = connections[router.db_for_write(Redirect)]
+
+        if (
+            self.site is not None
+            and connection.features.supports_update_conflicts_with_target
+        ):
+            Redirect.objects.bulk_create(
+                redirects,
+                update_conflicts=True,
+                unique_fields=["old_path", "site"],
+                update_fields=self.update_fields,
+            )
+            return
+
+        # Redirects for all sites have a null site, so never conflict with
+        # each other in the database. Update the existing ones instead
+        existing_ids = dict(
+            Redirect.objects.filter(
+                site=self.site,
+                old_path__in=[redirect.old_path for redirect in redirects],
+            ).values_list("old_path", "pk")
+        )
+        new_redirects = []
+        existing_redirects = []
+        for redirect in redirects:
+            redirect.pk = existing_ids.get(redirect.old_path)
+            if redirect.pk is None:
+                new_redirects.append(redirect)
+            else:
+                existing_redirects.append(redirect)
+
+        Redirect.objects.bulk_create(new_redirects)
+        Redirect.objects.bulk_update(existing_redirects, self.update_fields)
@@ -0,0 +1,111 @@
+"""
+A filter of the paths that have redirects, used by ``RedirectMiddleware`` to
+avoid querying the database for 404 responses that can't have a redirect.
+
+When ``WAGTAILREDIRECTS_LOOKUP_CACHE`` is enabled, a Bloom filter of the
+``old_path`` values of the redirects that apply to each site is built once and
+stored in the Django cache. A generation key, cleared whenever redirects
+change, invalidates the filters of all sites.
+"""
+
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+LOOKUP_CACHE_KEY_PREFIX = "wagtailredirects_lookup"
+LOOKUP_CACHE_GENERATION_KEY = "wagtailredirects_lookup_generation"
+LOOKUP_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Filters already fetched by this process, keyed by site ID, with the generation
+# they were built for
+_local_filters = {}
+
+
+class PathFilter:
+    """
+    A Bloom filter of paths. Checking for a path that was added always returns
+    ``True``, and checking for other paths returns ``False`` in all but about 1%
+    of cases.
+    """
+
+    bits_per_path = 10
+    hash_count = 7
+
+    def __init__(self, paths):
+        paths = list(paths)
+        self.size = max(len(paths) * self.bits_per_path, 64)
+        bits = bytearray((self.size + 7) // 8)
+        for path in paths:
+            for position in self.get_positions(path):
+                bits[position >> 3] |= 1 << (position & 7)
+        self.bits = bytes(bits)
+
+    def get_positions(self, path):
+        # Paths are compared case-insensitively, as some databases do
+        digest = hashlib.blake2b(path.lower().encode(), digest_size=16).digest()
+        first_hash = int.from_bytes(digest[:8], "little")
+        second_hash = int.from_bytes(digest[8:], "little") | 1
+        return (
+            (first_hash + i * second_hash) % self.size for i in range(self.hash_count)
+        )
+
+    def __contains__(self, path):
+        return all(
+            self.bits[position >> 3] & (1 << (position & 7))
+            for position in self.get_positions(path)
+        )
+
+
+def is_enabled():
+    return getattr(settings, "WAGTAILREDIRECTS_LOOKUP_CACHE", False)
+
+
+def get_generation():
+    generation = cache.get(LOOKUP_CACHE_GENERATION_KEY)
+    if generation is None:
+        cache.add(LOOKUP_CACHE_GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(LOOKUP_CACHE_GENERATION_KEY)
+    return generation
+
+
+def build_path_filter(site):
+    from wagtail.contrib.redirects.models import Redirect
+
+    return PathFilter(
+        Redirect.get_for_site(site).values_list("old_path", flat=True).iterator()
+    )
+
+
+def get_path_filter(site):
+    """
+    Returns the ``PathFilter`` of the paths of the redirects that apply to
+    ``site``, from this process's memory or the Django cache if it's up to date,
+    or built from the database otherwise.
+    """
+    site_id = site.pk if site else None
+    generation = get_generation()
+
+    local_generation, path_filter = _local_filters.get(site_id, (None, None))
+    if local_generation == generation:
+        return path_filter
+
+    cache_key = f"{LOOKUP_CACHE_KEY_PREFIX}:{generation}:{site_id}"
+    path_filter = cache.get(cache_key)
+    if path_filter is None:
+        path_filter = build_path_filter(site)
+        cache.set(cache_key, path_filter, LOOKUP_CACHE_TIMEOUT)
+
+    _local_filters[site_id] = (generation, path_filter)
+    return path_filter
+
+
+def clear_lookup_cache():
+    """
+    Invalidate the path filters of all sites. This is called when a redirect
+    is saved or deleted, and should also be called after changing redirects
+    with bulk operations, such as ``QuerySet.update()`` or ``bulk_create()``.
+    """
+    cache.delete(LOOKUP_CACHE_GENERATION_KEY)
+    _local_filters.clear()
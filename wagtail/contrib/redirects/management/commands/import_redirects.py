@@ -1,9 +1,11 @@
+import itertools
 import os
 
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 
 from wagtail.contrib.redirects.base_formats import Dataset
 from wagtail.contrib.redirects.forms import RedirectForm
+from wagtail.contrib.redirects.importer import DEFAULT_BATCH_SIZE, BulkRedirectImporter
 from wagtail.contrib.redirects.utils import (
     get_format_cls_by_extension,
     get_supported_extensions,
@@ -71,6 +73,18 @@ class Command(BaseCommand):
         parser.add_argument(
             "--limit", help="Limit import to num items", type=int, default=None
         )
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Read the file as a stream and save redirects in batches, "
+            "replacing existing redirects from the same paths",
+        )
+        parser.add_argument(
+            "--batch-size",
+            help="The number of redirects to save at a time in bulk mode",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+        )
 
     def handle(self, *args, **options):
         src = options["src"]
@@ -111,6 +125,24 @@ class Command(BaseCommand):
             raise Exception(f"Invalid format '{extension}'")
         input_format = import_format_cls()
 
+        if options["bulk"]:
+            if ask:
+                raise CommandError("The --ask option can't be used with --bulk")
+            self.import_in_bulk(
+                src,
+                input_format,
+                from_index=from_index,
+                to_index=to_index,
+                site=site,
+                permanent=permanent,
+                dry_run=dry_run,
+                offset=offset,
+                limit=limit,
+                batch_size=options["batch_size"],
+                verbosity=options["verbosity"],
+            )
+            return
+
         if extension in ["xls", "xlsx"]:
             mode = "rb"
         else:
@@ -198,6 +230,61 @@ class Command(BaseCommand):
         self.stdout.write(f"Skipped : {skipped}")
         self.stdout.write(f"Errors: {len(errors)}")
 
+    def import_in_bulk(
+        self,
+        src,
+        input_format,
+        offset=None,
+        limit=None,
+        verbosity=1,
+        **importer_kwargs,
+    ):
+        importer = BulkRedirectImporter(**importer_kwargs)
+        offset = offset or 0
+
+        if input_format.is_binary():
+            fh = open(src, "rb")
+        else:
+            fh = open(src, newline="", encoding="utf-8")
+
+        with fh:
+            rows = iter(input_format.iter_rows(fh))
+            headers = next(rows, [])
+            rows = itertools.islice(rows, offset, offset + limit if limit else None)
+
+            sample_rows = list(itertools.islice(rows, 4))
+            self.stdout.write("Sample data:")
+            self.stdout.write(str(Dataset(sample_rows, headers)))
+            self.stdout.write("--------------")
+
+            if importer.site:
+                self.stdout.write(f"Using site: {importer.site.hostname}")
+
+            self.stdout.write("Importing redirects:")
+
+            def report_progress(importer):
+                self.stdout.write(
+                    "Imported %d of %d rows (%d rows per second)"
+                    % (importer.successes, importer.total, importer.rows_per_second)
+                )
+
+            importer.import_rows(
+                itertools.chain(sample_rows, rows),
+                start=offset + 1,
+                progress=report_progress if verbosity > 1 else None,
+            )
+
+        for row_number, from_link, to_link, error in importer.errors:
+            self.stdout.write(
+                f"{row_number}. Error: {from_link} -> {to_link} (Reason: {error})"
+            )
+
+        self.stdout.write("\n")
+        self.stdout.write(f"Found: {importer.total}")
+        self.stdout.write(f"Created: {importer.successes}")
+        self.stdout.write(f"Errors: {len(importer.errors)}")
+        self.stdout.write(f"Rows per second: {importer.rows_per_second:.0f}")
+
 
 def get_input(msg):  # pragma: no cover
     return input(msg)
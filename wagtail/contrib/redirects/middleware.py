@@ -4,7 +4,7 @@ from django import http
 from django.utils.deprecation import MiddlewareMixin
 from django.utils.encoding import uri_to_iri
 
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import lookup, models
 from wagtail.models import Site
 
 
@@ -15,6 +15,13 @@ def _get_redirect(request, path):
         return None
 
     site = Site.find_for_request(request)
+    if lookup.is_enabled():
+        if not hasattr(request, "_wagtail_redirect_path_filter"):
+            request._wagtail_redirect_path_filter = lookup.get_path_filter(site)
+        if path not in request._wagtail_redirect_path_filter:
+            # There are no redirects from this path
+            return None
+
     try:
         return models.Redirect.get_for_site(site).get(old_path=path)
     except models.Redirect.MultipleObjectsReturned:
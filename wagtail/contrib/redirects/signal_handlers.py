@@ -3,17 +3,25 @@ from collections.abc import Iterable
 
 from django.apps import apps
 from django.conf import settings
+from django.db import transaction
 from django.db.models import Q
 
 from wagtail.contrib.frontend_cache.utils import PurgeBatch
 from wagtail.coreutils import BatchCreator, get_dummy_request
 from wagtail.models import Page, Site
 
+from .lookup import clear_lookup_cache
 from .models import Redirect
 
 logger = logging.getLogger(__name__)
 
 
+def clear_redirect_lookup_cache(**kwargs):
+    # Clear the cache once the change is visible to other connections, so that
+    # they don't rebuild it from the old redirects
+    transaction.on_commit(clear_lookup_cache)
+
+
 class BatchRedirectCreator(BatchCreator):
     """
     A specialized ``BatchCreator`` class for saving ``Redirect`` objects.
@@ -30,6 +38,10 @@ class BatchRedirectCreator(BatchCreator):
         Redirect.objects.filter(automatically_created=True).filter(clashes_q).delete()
 
     def post_process(self):
+        # Redirects created with bulk_create() don't send the signals that
+        # clear the lookup cache
+        clear_redirect_lookup_cache()
+
         if not apps.is_installed("wagtail.contrib.frontend_cache"):
             return
 
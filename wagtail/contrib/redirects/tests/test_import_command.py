@@ -330,3 +330,144 @@ class TestImportCommand(TestCase):
         self.assertEqual(redirects[0].old_path, "/one")
         self.assertEqual(redirects[0].redirect_link, "http://one.test/")
         self.assertIs(redirects[0].is_permanent, True)
+
+
+class TestBulkImportCommand(TestCase):
+    def get_file(self, lines):
+        import_file = tempfile.NamedTemporaryFile(
+            mode="w+", encoding="utf-8", suffix=".csv"
+        )
+        import_file.write("\n".join(["from,to", *lines]))
+        import_file.seek(0)
+        return import_file
+
+    def call_command(self, import_file, **options):
+        out = StringIO()
+        call_command(
+            "import_redirects", src=import_file.name, bulk=True, stdout=out, **options
+        )
+        return out.getvalue()
+
+    def test_redirects_get_imported(self):
+        import_file = self.get_file(
+            [
+                "/one/,http://one.test/",
+                "/two,http://two.test/",
+                "/three,http://three.test/",
+            ]
+        )
+
+        output = self.call_command(import_file, batch_size=2)
+
+        self.assertEqual(
+            list(
+                Redirect.objects.order_by("old_path").values_list(
+                    "old_path", "redirect_link", "is_permanent", "site"
+                )
+            ),
+            [
+                ("/one", "http://one.test/", True, None),
+                ("/three", "http://three.test/", True, None),
+                ("/two", "http://two.test/", True, None),
+            ],
+        )
+        self.assertIn("Found: 3", output)
+        self.assertIn("Created: 3", output)
+        self.assertIn("Errors: 0", output)
+        self.assertIn("Rows per second:", output)
+
+    def test_xlsx(self):
+        self.call_command(open(f"{TEST_ROOT}/files/example.xlsx", "rb"), batch_size=2)
+        self.assertEqual(Redirect.objects.count(), 3)
+
+    def test_errors_reported_with_row_numbers(self):
+        import_file = self.get_file(
+            ["/one,http://one.test/", ",http://two.test/", "/three,not a link"]
+        )
+
+        output = self.call_command(import_file)
+
+        self.assertEqual(Redirect.objects.get().old_path, "/one")
+        self.assertIn("2. Error:  -> http://two.test/", output)
+        self.assertIn("3. Error: /three -> not a link", output)
+        self.assertIn("Created: 1", output)
+        self.assertIn("Errors: 2", output)
+
+    def test_row_numbers_include_offset(self):
+        import_file = self.get_file(
+            ["/one,http://one.test/", "/two,http://two.test/", ",http://three.test/"]
+        )
+
+        output = self.call_command(import_file, offset=1, limit=2)
+
+        self.assertEqual(Redirect.objects.get().old_path, "/two")
+        self.assertIn("3. Error:", output)
+
+    def test_existing_redirects_are_replaced(self):
+        Redirect.objects.create(old_path="/one", redirect_link="http://old.test/")
+        import_file = self.get_file(
+            ["/one,http://one.test/", "/two,http://old.test/", "/two,http://two.test/"]
+        )
+
+        self.call_command(import_file, permanent=False)
+
+        self.assertEqual(
+            list(
+                Redirect.objects.order_by("old_path").values_list(
+                    "old_path", "redirect_link", "is_permanent"
+                )
+            ),
+            [("/one", "http://one.test/", False), ("/two", "http://two.test/", False)],
+        )
+
+    def test_existing_redirects_for_site_are_replaced(self):
+        site = Site.objects.first()
+        Redirect.objects.create(
+            old_path="/one", redirect_link="http://old.test/", site=site
+        )
+        Redirect.objects.create(old_path="/one", redirect_link="http://all.test/")
+        import_file = self.get_file(["/one,http://one.test/", "/two,http://two.test/"])
+
+        self.call_command(import_file, site=site.pk)
+
+        self.assertEqual(
+            Redirect.objects.get(old_path="/one", site=site).redirect_link,
+            "http://one.test/",
+        )
+        self.assertEqual(
+            Redirect.objects.get(old_path="/one", site=None).redirect_link,
+            "http://all.test/",
+        )
+        self.assertTrue(Redirect.objects.filter(old_path="/two", site=site).exists())
+
+    def test_dry_run(self):
+        import_file = self.get_file(["/one,http://one.test/"])
+
+        output = self.call_command(import_file, dry_run=True)
+
+        self.assertEqual(Redirect.objects.count(), 0)
+        self.assertIn("Created: 1", output)
+
+    def test_progress(self):
+        import_file = self.get_file(["/one,http://one.test/", "/two,http://two.test/"])
+
+        output = self.call_command(import_file, batch_size=1, verbosity=2)
+
+        self.assertIn("Imported 1 of 1 rows", output)
+        self.assertIn("Imported 2 of 2 rows", output)
+
+    def test_clears_lookup_cache(self):
+        import_file = self.get_file(["/one,http://one.test/"])
+
+        with patch(
+            "wagtail.contrib.redirects.importer.clear_lookup_cache"
+        ) as clear_lookup_cache:
+            self.call_command(import_file)
+
+        clear_lookup_cache.assert_called_once()
+
+    def test_ask_not_supported(self):
+        import_file = self.get_file(["/one,http://one.test/"])
+
+        with self.assertRaises(CommandError):
+            self.call_command(import_file, ask=True)
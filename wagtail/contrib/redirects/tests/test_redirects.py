@@ -2,13 +2,15 @@ from io import BytesIO
 
 from django.conf import settings
 from django.contrib.auth.models import Permission
-from django.test import TestCase, override_settings
+from django.core.cache import cache
+from django.test import RequestFactory, TestCase, override_settings
 from django.urls import reverse
 from openpyxl.reader.excel import load_workbook
 
 from wagtail.admin.admin_url_finder import AdminURLFinder
 from wagtail.contrib.frontend_cache.tests import PURGED_URLS
-from wagtail.contrib.redirects import models
+from wagtail.contrib.redirects import lookup, models
+from wagtail.contrib.redirects.middleware import get_redirect
 from wagtail.log_actions import registry as log_registry
 from wagtail.models import Page, Site
 from wagtail.test.routablepage.models import RoutablePageTest
@@ -597,6 +599,109 @@ class TestRedirects(TestCase):
         self.assertIs(redirect.is_permanent, True)
 
 
+class TestPathFilter(TestCase):
+    def test_contains_added_paths(self):
+        paths = ["/path-%d" % i for i in range(1000)]
+        path_filter = lookup.PathFilter(paths)
+        for path in paths:
+            self.assertIn(path, path_filter)
+
+        # Paths are matched case-insensitively
+        self.assertIn("/PATH-1", path_filter)
+
+    def test_few_false_positives(self):
+        path_filter = lookup.PathFilter(["/path-%d" % i for i in range(1000)])
+        false_positives = [
+            i for i in range(1000) if "/other-path-%d" % i in path_filter
+        ]
+        self.assertLess(len(false_positives), 50)
+
+    def test_empty(self):
+        self.assertNotIn("/", lookup.PathFilter([]))
+
+
+@override_settings(
+    WAGTAILREDIRECTS_LOOKUP_CACHE=True,
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestRedirectLookupCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        cache.clear()
+        lookup.clear_lookup_cache()
+        self.redirect = models.Redirect.objects.create(
+            old_path="/redirectme", redirect_link="/redirectto"
+        )
+        self.site = Site.objects.get(is_default_site=True)
+
+    def tearDown(self):
+        cache.clear()
+        lookup.clear_lookup_cache()
+
+    def get_request(self):
+        request = RequestFactory().get("/")
+        Site.find_for_request(request)
+        return request
+
+    def test_redirect_found(self):
+        response = self.client.get("/redirectme/")
+        self.assertRedirects(
+            response, "/redirectto", status_code=301, fetch_redirect_response=False
+        )
+
+    def test_missing_redirect_skips_database(self):
+        self.assertEqual(get_redirect(self.get_request(), "/redirectme"), self.redirect)
+
+        request = self.get_request()
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_redirect(request, "/some/other/path"))
+
+    def test_filter_shared_through_cache(self):
+        get_redirect(self.get_request(), "/redirectme")
+
+        # Filters are rebuilt from the cache, rather than the database, when
+        # they aren't in this process's memory
+        lookup._local_filters.clear()
+        request = self.get_request()
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_redirect(request, "/some/other/path"))
+
+    def test_site_specific_redirects(self):
+        other_site = Site.objects.create(
+            hostname="other.example.com", root_page_id=self.site.root_page_id
+        )
+        models.Redirect.objects.create(
+            old_path="/other-site-only", redirect_link="/redirectto", site=other_site
+        )
+
+        self.assertIsNone(get_redirect(self.get_request(), "/other-site-only"))
+
+        request = RequestFactory().get("/", SERVER_NAME="other.example.com")
+        self.assertIsNotNone(get_redirect(request, "/other-site-only"))
+
+    def test_cache_cleared_when_redirect_added(self):
+        self.assertIsNone(get_redirect(self.get_request(), "/newpath"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            models.Redirect.objects.create(
+                old_path="/newpath", redirect_link="/redirectto"
+            )
+
+        self.assertIsNotNone(get_redirect(self.get_request(), "/newpath"))
+
+    def test_cache_cleared_when_redirect_deleted(self):
+        self.assertIsNotNone(get_redirect(self.get_request(), "/redirectme"))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.redirect.delete()
+
+        request = self.get_request()
+        self.assertIsNone(get_redirect(request, "/redirectme"))
+        # The new filter doesn't contain the deleted path
+        self.assertNotIn("/redirectme", request._wagtail_redirect_path_filter)
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
 )
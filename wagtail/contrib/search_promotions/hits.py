@@ -0,0 +1,249 @@
+"""
+Buffered recording of search query hits.
+
+By default, ``Query.add_hit()`` updates the ``QueryDailyHits`` table straight
+away. The ``WAGTAILSEARCH_HITS_MODE`` setting can instead accumulate hits in
+process memory or the Django cache, to be written to the database in batches.
+"""
+
+import atexit
+import datetime
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+logger = logging.getLogger("wagtail.search_promotions")
+
+CACHE_KEY_PREFIX = "wagtailsearch_hits"
+
+_buffer = Counter()
+_buffer_lock = threading.Lock()
+_last_flushed_at = time.monotonic()
+_flush_timer = None
+_flush_at_exit_registered = False
+
+
+def get_hits_mode():
+    """
+    Returns how search query hits are recorded, as configured by the
+    ``WAGTAILSEARCH_HITS_MODE`` setting:
+
+    - ``"immediate"`` - each hit is written to the database when it is added
+    - ``"memory"`` - hits are counted in process memory, and written to the
+      database in bulk every ``WAGTAILSEARCH_HITS_FLUSH_INTERVAL`` seconds and
+      when the process exits. Hits are lost if the process is killed
+    - ``"cache"`` - hits are counted in the Django cache, to be written to the
+      database by the ``searchpromotions_flush_hits`` management command
+    """
+    return getattr(settings, "WAGTAILSEARCH_HITS_MODE", "immediate")
+
+
+def get_flush_interval():
+    return getattr(settings, "WAGTAILSEARCH_HITS_FLUSH_INTERVAL", 60)
+
+
+def get_max_age():
+    return getattr(settings, "WAGTAILSEARCH_HITS_MAX_AGE", 7)
+
+
+def add_hits(hits):
+    """
+    Add hits to the ``QueryDailyHits`` table in bulk, where ``hits`` maps
+    ``(query ID, date)`` pairs to the number of hits to add. Hits for queries
+    that no longer exist are discarded.
+    """
+    from wagtail.contrib.search_promotions.models import Query, QueryDailyHits
+
+    query_ids = {query_id for (query_id, date), count in hits.items() if count}
+    if not query_ids:
+        return
+    query_ids = set(Query.objects.filter(pk__in=query_ids).values_list("pk", flat=True))
+    hits = {
+        (query_id, date): count
+        for (query_id, date), count in hits.items()
+        if count and query_id in query_ids
+    }
+
+    with transaction.atomic():
+        # Create any missing rows, then increment all of them
+        QueryDailyHits.objects.bulk_create(
+            [
+                QueryDailyHits(query_id=query_id, date=date, hits=0)
+                for query_id, date in hits
+            ],
+            ignore_conflicts=True,
+        )
+
+        daily_hits = []
+        for daily_hit in QueryDailyHits.objects.filter(
+            query_id__in=query_ids, date__in={date for query_id, date in hits}
+        ).only("pk", "query_id", "date"):
+            count = hits.get((daily_hit.query_id, daily_hit.date))
+            if count:
+                daily_hit.hits = F("hits") + count
+                daily_hits.append(daily_hit)
+        QueryDailyHits.objects.bulk_update(daily_hits, ["hits"], batch_size=500)
+
+
+def record_hit(query_id, date):
+    """
+    Record a hit for the given query ID and date, according to the hits mode.
+    """
+    if get_hits_mode() == "cache":
+        record_hit_in_cache(query_id, date)
+        return
+
+    global _last_flushed_at, _flush_timer, _flush_at_exit_registered
+    with _buffer_lock:
+        _buffer[query_id, date] += 1
+        flush_due = time.monotonic() - _last_flushed_at >= get_flush_interval()
+        if flush_due:
+            _last_flushed_at = time.monotonic()
+        elif _flush_timer is None:
+            # Make sure the hit is written even if no more hits are recorded
+            _flush_timer = threading.Timer(get_flush_interval(), flush_on_timer)
+            _flush_timer.daemon = True
+            _flush_timer.start()
+
+        if not _flush_at_exit_registered:
+            atexit.register(flush_at_exit)
+            _flush_at_exit_registered = True
+
+    if flush_due:
+        flush_buffered_hits()
+
+
+def flush_on_timer():
+    global _last_flushed_at, _flush_timer
+    with _buffer_lock:
+        _last_flushed_at = time.monotonic()
+        _flush_timer = None
+
+    try:
+        flush_buffered_hits()
+    except Exception:
+        logger.exception("Failed to write search query hits")
+    finally:
+        connections.close_all()
+
+
+def flush_at_exit():
+    try:
+        flush_buffered_hits()
+    except Exception:
+        logger.exception("Failed to write search query hits")
+
+
+def flush_buffered_hits():
+    """
+    Write the hits counted in this process's memory to the database.
+    """
+    with _buffer_lock:
+        hits = dict(_buffer)
+        _buffer.clear()
+
+    try:
+        add_hits(hits)
+    except Exception:
+        # Put the hits back, to be written by the next flush
+        with _buffer_lock:
+            _buffer.update(hits)
+        raise
+
+
+def get_cache_timeout():
+    # Counters don't need to be kept for longer than the hits themselves
+    return (get_max_age() + 1) * 24 * 60 * 60
+
+
+def get_cache_counter_key(query_id, date):
+    return f"{CACHE_KEY_PREFIX}:{date.isoformat()}:{query_id}"
+
+
+def get_cache_entry_count_key(date):
+    return f"{CACHE_KEY_PREFIX}:{date.isoformat()}:entries"
+
+
+def get_cache_entry_key(date, number):
+    return f"{CACHE_KEY_PREFIX}:{date.isoformat()}:entry:{number}"
+
+
+def record_hit_in_cache(query_id, date):
+    counter_key = get_cache_counter_key(query_id, date)
+    timeout = get_cache_timeout()
+
+    try:
+        cache.incr(counter_key)
+        return
+    except ValueError:
+        # The first hit for this query on this date
+        pass
+
+    if not cache.add(counter_key, 1, timeout):
+        # Another process counted the first hit first
+        cache.incr(counter_key)
+        return
+
+    # Register the counter, so that the flush command can find it. Entries
+    # are numbered, as caches can't list their keys
+    entry_count_key = get_cache_entry_count_key(date)
+    cache.add(entry_count_key, 0, timeout)
+    number = cache.incr(entry_count_key)
+    cache.set(get_cache_entry_key(date, number), query_id, timeout)
+
+
+def flush_cached_hits():
+    """
+    Write the hits counted in the Django cache to the database, for dates
+    within the last ``WAGTAILSEARCH_HITS_MAX_AGE`` days. Returns the number of
+    hits written.
+    """
+    today = timezone.now().date()
+    hit_count = 0
+
+    for days_ago in range(get_max_age(), -1, -1):
+        date = today - datetime.timedelta(days=days_ago)
+
+        entry_count = cache.get(get_cache_entry_count_key(date))
+        if not entry_count:
+            continue
+
+        query_ids = cache.get_many(
+            [get_cache_entry_key(date, number) for number in range(1, entry_count + 1)]
+        ).values()
+        counter_keys = {
+            get_cache_counter_key(query_id, date): query_id for query_id in query_ids
+        }
+        counts = {
+            key: count
+            for key, count in cache.get_many(list(counter_keys)).items()
+            if count
+        }
+
+        with transaction.atomic():
+            add_hits(
+                {(counter_keys[key], date): count for key, count in counts.items()}
+            )
+            # Hits counted since the counters were read are kept for the next flush
+            for key, count in counts.items():
+                cache.decr(key, count)
+
+        hit_count += sum(counts.values())
+
+    return hit_count
+
+
+def flush_hits():
+    """
+    Write all buffered hits to the database. Returns the number of hits written
+    from the Django cache.
+    """
+    flush_buffered_hits()
+    return flush_cached_hits()
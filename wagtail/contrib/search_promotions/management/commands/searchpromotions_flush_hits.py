@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from wagtail.contrib.search_promotions.hits import flush_hits
+
+
+class Command(BaseCommand):
+    help = "Write search query hits buffered in the cache to the database"
+
+    def handle(self, **options):
+        hit_count = flush_hits()
+        self.stdout.write("Flushed %d hits" % hit_count)
@@ -5,6 +5,7 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from wagtail.contrib.search_promotions.hits import get_hits_mode, record_hit
 from wagtail.search.utils import MAX_QUERY_STRING_LENGTH, normalise_query_string
 
 
@@ -20,6 +21,9 @@ class Query(models.Model):
     def add_hit(self, date=None):
         if date is None:
             date = timezone.now().date()
+        if get_hits_mode() != "immediate":
+            record_hit(self.pk, date)
+            return
         daily_hits, created = QueryDailyHits.objects.get_or_create(
             query=self, date=date
         )
@@ -1,13 +1,17 @@
 import json
 from datetime import date, datetime, timedelta
 from io import StringIO
+from unittest import mock
 
 from django.contrib.auth.models import Permission
 from django.core import management
-from django.test import TestCase
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 
 from wagtail.admin.admin_url_finder import AdminURLFinder
+from wagtail.contrib.search_promotions import hits
 from wagtail.contrib.search_promotions.models import (
     Query,
     QueryDailyHits,
@@ -906,6 +910,144 @@ class TestHitCounter(TestCase):
         self.assertEqual(Query.get("Hello").hits, 10)
 
 
+@override_settings(WAGTAILSEARCH_HITS_MODE="memory")
+class TestMemoryHitCounter(TestCase):
+    def setUp(self):
+        hits.flush_buffered_hits()
+
+    def tearDown(self):
+        hits.flush_buffered_hits()
+        if hits._flush_timer is not None:
+            hits._flush_timer.cancel()
+            hits._flush_timer = None
+
+    def test_hits_buffered_until_flushed(self):
+        query = Query.get("Hello")
+        for i in range(10):
+            query.add_hit()
+        Query.get("World").add_hit(date=date(2024, 5, 1))
+
+        self.assertEqual(query.hits, 0)
+
+        hits.flush_buffered_hits()
+
+        self.assertEqual(query.hits, 10)
+        self.assertEqual(
+            QueryDailyHits.objects.get(query__query_string="world").date,
+            date(2024, 5, 1),
+        )
+
+    def test_flush_adds_to_existing_hits(self):
+        query = Query.get("Hello")
+        with self.settings(WAGTAILSEARCH_HITS_MODE="immediate"):
+            query.add_hit()
+
+        query.add_hit()
+        query.add_hit()
+        hits.flush_buffered_hits()
+
+        self.assertEqual(QueryDailyHits.objects.get(query=query).hits, 3)
+
+    @override_settings(WAGTAILSEARCH_HITS_FLUSH_INTERVAL=0)
+    def test_flush_interval(self):
+        query = Query.get("Hello")
+        query.add_hit()
+        self.assertEqual(query.hits, 1)
+
+    @override_settings(WAGTAILSEARCH_HITS_FLUSH_INTERVAL=30)
+    def test_flush_timer(self):
+        query = Query.get("Hello")
+        with mock.patch.object(hits.threading, "Timer") as timer:
+            query.add_hit()
+            query.add_hit()
+
+        # A single timer is started to flush the hits if no more are recorded
+        timer.assert_called_once_with(30, hits.flush_on_timer)
+        self.assertEqual(query.hits, 0)
+
+        # The timer thread closes its own database connections when done
+        with mock.patch.object(hits.connections, "close_all"):
+            hits.flush_on_timer()
+        self.assertEqual(query.hits, 2)
+        self.assertIsNone(hits._flush_timer)
+
+    def test_flush_at_exit(self):
+        query = Query.get("Hello")
+        query.add_hit()
+
+        hits.flush_at_exit()
+
+        self.assertEqual(query.hits, 1)
+
+    def test_hits_for_deleted_query_discarded(self):
+        query = Query.get("Hello")
+        query.add_hit()
+        query.delete()
+
+        hits.flush_buffered_hits()
+
+        self.assertFalse(QueryDailyHits.objects.exists())
+
+
+@override_settings(
+    WAGTAILSEARCH_HITS_MODE="cache",
+    CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}},
+)
+class TestCacheHitCounter(TestCase):
+    def setUp(self):
+        cache.clear()
+
+    def tearDown(self):
+        cache.clear()
+
+    def test_hits_counted_in_cache(self):
+        query = Query.get("Hello")
+        with self.assertNumQueries(0):
+            for i in range(10):
+                query.add_hit()
+
+        self.assertEqual(query.hits, 0)
+
+        stdout = StringIO()
+        management.call_command("searchpromotions_flush_hits", stdout=stdout)
+
+        self.assertEqual(stdout.getvalue().strip(), "Flushed 10 hits")
+        self.assertEqual(query.hits, 10)
+
+        # Counted hits are only written once
+        query.add_hit()
+        management.call_command("searchpromotions_flush_hits", stdout=StringIO())
+        self.assertEqual(query.hits, 11)
+
+    def test_hits_on_multiple_dates(self):
+        today = timezone.now().date()
+        yesterday = today - timedelta(days=1)
+        hello = Query.get("Hello")
+        world = Query.get("World")
+        hello.add_hit()
+        hello.add_hit(date=yesterday)
+        world.add_hit(date=yesterday)
+        world.add_hit(date=yesterday)
+
+        self.assertEqual(hits.flush_hits(), 4)
+
+        self.assertEqual(
+            set(QueryDailyHits.objects.values_list("query_id", "date", "hits")),
+            {
+                (hello.pk, today, 1),
+                (hello.pk, yesterday, 1),
+                (world.pk, yesterday, 2),
+            },
+        )
+
+    def test_hits_older_than_max_age_not_written(self):
+        query = Query.get("Hello")
+        query.add_hit(date=timezone.now().date() - timedelta(days=30))
+
+        self.assertEqual(hits.flush_hits(), 0)
+        self.assertFalse(QueryDailyHits.objects.exists())
+
+
 class TestQueryStringNormalisation(TestCase):
     def setUp(self):
         self.query = Query.get("  Hello  World!  ")
@@ -6,3 +6,9 @@ class WagtailSitemapsAppConfig(AppConfig):
     name = "wagtail.contrib.sitemaps"
     label = "wagtailsitemaps"
     verbose_name = _("Wagtail sitemaps")
+    default_auto_field = "django.db.models.AutoField"
+
+    def ready(self):
+        from wagtail.contrib.sitemaps.signal_handlers import register_signal_handlers
+
+        register_signal_handlers()
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from wagtail.contrib.sitemaps.models import PendingSitemapShard
+from wagtail.contrib.sitemaps.sitemap_files import SitemapFiles
+from wagtail.models import Site
+from wagtail.utils.pending_updates import delete_processed_entries
+
+
+class Command(BaseCommand):
+    """Command to write the sitemap files served by the stored_sitemap view."""
+
+    help = "Write the sitemap of each site to storage, as sharded sitemap files and an index file."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--changed",
+            action="store_true",
+            help="Only rewrite the shards containing pages that have been published or unpublished since they were written",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Number of pages to fetch from the database at a time (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        sites = Site.objects.select_related("root_page")
+        chunk_size = options["chunk_size"]
+
+        if options["changed"]:
+            entries = list(PendingSitemapShard.objects.order_by("shard"))
+            shards = [entry.shard for entry in entries]
+            if not shards:
+                self.stdout.write("No sitemap shards have changed")
+                return
+
+            for site in sites:
+                url_count = SitemapFiles(site).build_shards(
+                    shards, chunk_size=chunk_size
+                )
+                self.stdout.write(
+                    f"{site}: wrote {len(shards)} shard(s) with {url_count} URL(s)"
+                )
+
+            # Shards that were queued again while they were being written are kept
+            delete_processed_entries(PendingSitemapShard, entries)
+        else:
+            started_at = timezone.now()
+            for site in sites:
+                url_count = SitemapFiles(site).build(chunk_size=chunk_size)
+                self.stdout.write(f"{site}: wrote {url_count} URL(s)")
+
+            # All shards are up to date with changes made before the build started
+            PendingSitemapShard.objects.filter(queued_at__lte=started_at).delete()
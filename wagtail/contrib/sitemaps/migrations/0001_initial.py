@@ -0,0 +1,32 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="PendingSitemapShard",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("shard", models.PositiveIntegerField(unique=True)),
+                ("queued_at", models.DateTimeField(db_index=True)),
+            ],
+            options={
+                "verbose_name": "pending sitemap shard",
+                "verbose_name_plural": "pending sitemap shards",
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class PendingSitemapShard(models.Model):
+    """
+    A shard of the stored sitemap files that contains pages that have been published,
+    unpublished, moved or had their slug changed since it was written, when ``WAGTAILSITEMAPS_TRACK_CHANGES`` is
+    enabled. The shards are rewritten by ``build_sitemap_files --changed``.
+    """
+
+    shard = models.PositiveIntegerField(unique=True)
+    queued_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        verbose_name = _("pending sitemap shard")
+        verbose_name_plural = _("pending sitemap shards")
+
+    @classmethod
+    def enqueue(cls, shards, using=None):
+        """
+        Add the given shards to the queue. If a shard is already queued, it is moved
+        to the back of the queue, so that it is not removed by a build that read its
+        pages before this change was made.
+        """
+        connection = connections[using or DEFAULT_DB_ALIAS]
+        queued_at = timezone.now()
+        kwargs = {}
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs["unique_fields"] = ["shard"]
+
+        cls.objects.using(using).bulk_create(
+            [cls(shard=shard, queued_at=queued_at) for shard in set(shards)],
+            update_conflicts=True,
+            update_fields=["queued_at"],
+            **kwargs,
+        )
@@ -0,0 +1,59 @@
+from django.conf import settings
+from django.db.models import F
+from django.db.models.functions import Floor
+
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
+
+
+def page_changed_signal_handler(instance, **kwargs):
+    if not getattr(settings, "WAGTAILSITEMAPS_TRACK_CHANGES", False):
+        return
+
+    from wagtail.contrib.sitemaps.models import PendingSitemapShard
+    from wagtail.contrib.sitemaps.sitemap_files import get_shard_for_page
+
+    PendingSitemapShard.enqueue([get_shard_for_page(instance)])
+
+
+def enqueue_descendant_shards(page):
+    """
+    Queue the shards of a page and its live descendants, whose URLs have changed.
+    """
+    if not getattr(settings, "WAGTAILSITEMAPS_TRACK_CHANGES", False):
+        return
+
+    from wagtail.contrib.sitemaps.models import PendingSitemapShard
+    from wagtail.contrib.sitemaps.sitemap_files import get_shard_size
+
+    # Work out the shards in the database, as there may be many descendants
+    shards = (
+        page.get_descendants(inclusive=True)
+        .live()
+        .order_by()
+        .annotate(shard=Floor(F("pk") / get_shard_size()))
+        .values_list("shard", flat=True)
+        .distinct()
+    )
+    PendingSitemapShard.enqueue([int(shard) for shard in shards])
+
+
+def page_slug_changed_signal_handler(instance, **kwargs):
+    enqueue_descendant_shards(instance)
+
+
+def page_moved_signal_handler(instance, url_path_before, url_path_after, **kwargs):
+    # Reordering a page doesn't change its URL
+    if url_path_before != url_path_after:
+        enqueue_descendant_shards(instance)
+
+
+def register_signal_handlers():
+    page_published.connect(page_changed_signal_handler)
+    page_unpublished.connect(page_changed_signal_handler)
+    page_slug_changed.connect(page_slug_changed_signal_handler)
+    post_page_move.connect(page_moved_signal_handler)
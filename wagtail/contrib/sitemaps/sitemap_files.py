@@ -0,0 +1,251 @@
+import datetime
+import itertools
+import os
+import re
+import tempfile
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import FileSystemStorage, storages
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.html import escape
+
+DEFAULT_SHARD_SIZE = 10000
+
+URLSET_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"'
+    ' xmlns:xhtml="http://www.w3.org/1999/xhtml">\n'
+)
+URLSET_FOOTER = "</urlset>\n"
+
+SITEMAPINDEX_HEADER = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+)
+SITEMAPINDEX_FOOTER = "</sitemapindex>\n"
+
+
+def get_sitemap_storage():
+    return storages[getattr(settings, "WAGTAILSITEMAPS_STORAGE", "default")]
+
+
+def get_shard_size():
+    return getattr(settings, "WAGTAILSITEMAPS_SHARD_SIZE", DEFAULT_SHARD_SIZE)
+
+
+def get_shard_for_page(page, shard_size=None):
+    """
+    Returns the number of the sitemap shard that ``page`` belongs to.
+    """
+    return page.pk // (shard_size or get_shard_size())
+
+
+class SitemapFiles:
+    """
+    Writes the sitemap of a Wagtail site to storage, so that it can be served
+    without querying the pages on each request.
+
+    The live, public pages of the site are split into sitemap files ("shards") by
+    page ID, with each shard containing the pages in a range of ``shard_size`` IDs,
+    and an index file lists the shards. As a page always belongs to the same shard,
+    the shards containing pages that have changed can be rebuilt on their own.
+    """
+
+    index_name = "sitemap.xml"
+    shard_name_re = re.compile(r"^sitemap-(\d+)\.xml$")
+
+    def __init__(
+        self,
+        site,
+        storage=None,
+        shard_size=None,
+        shard_url_name="wagtailsitemaps_stored_sitemap",
+    ):
+        self.site = site
+        self.storage = storage or get_sitemap_storage()
+        self.shard_size = shard_size or get_shard_size()
+        self.shard_url_name = shard_url_name
+
+    def get_path(self, name):
+        return f"sitemaps/{self.site.pk}/{name}"
+
+    def get_shard_name(self, shard):
+        return f"sitemap-{shard}.xml"
+
+    def get_shard_url(self, shard):
+        return self.site.root_url + reverse(self.shard_url_name, args=[shard])
+
+    def get_pages(self):
+        return (
+            self.site.root_page.get_descendants(inclusive=True)
+            .live()
+            .public()
+            .defer_streamfields()
+            .specific()
+        )
+
+    def get_stored_shards(self):
+        """
+        Returns the numbers of the shards that have been written to storage.
+        """
+        try:
+            _, filenames = self.storage.listdir(self.get_path(""))
+        except FileNotFoundError:
+            return []
+
+        shards = []
+        for filename in filenames:
+            match = self.shard_name_re.match(filename)
+            if match:
+                shards.append(int(match.group(1)))
+        return sorted(shards)
+
+    def render_url(self, url_info):
+        parts = ["<url><loc>%s</loc>" % escape(url_info["location"])]
+        lastmod = url_info.get("lastmod")
+        if lastmod:
+            if isinstance(lastmod, datetime.datetime) and timezone.is_aware(lastmod):
+                lastmod = timezone.localtime(lastmod)
+            parts.append("<lastmod>%s</lastmod>" % lastmod.strftime("%Y-%m-%d"))
+        if url_info.get("changefreq"):
+            parts.append("<changefreq>%s</changefreq>" % url_info["changefreq"])
+        if url_info.get("priority"):
+            parts.append("<priority>%s</priority>" % url_info["priority"])
+        for alternate in url_info.get("alternates", []):
+            parts.append(
+                '<xhtml:link rel="alternate" hreflang="%s" href="%s"/>'
+                % (escape(alternate["lang_code"]), escape(alternate["location"]))
+            )
+        parts.append("</url>\n")
+        return "".join(parts)
+
+    def save(self, name, chunks):
+        """
+        Write the strings yielded by ``chunks`` to the file ``name`` in storage,
+        through a temporary file so that the whole file is never held in memory.
+        """
+        path = self.get_path(name)
+        with tempfile.TemporaryFile() as f:
+            for chunk in chunks:
+                f.write(chunk.encode())
+
+            f.seek(0)
+            self.replace(path, File(f, name=name))
+
+    def replace(self, path, content):
+        """
+        Save ``content`` to ``path`` in storage, replacing any existing file without
+        it going missing while the new file is written, where the storage allows.
+        """
+        if isinstance(self.storage, FileSystemStorage):
+            # Write to a temporary file alongside the existing one, then swap it in
+            temp_path = self.storage.save(path + ".tmp", content)
+            os.replace(self.storage.path(temp_path), self.storage.path(path))
+        elif self.storage.get_available_name(path) == path:
+            # The storage writes over existing files, such as cloud storages
+            # configured to allow overwriting
+            self.storage.save(path, content)
+        else:
+            self.storage.delete(path)
+            self.storage.save(path, content)
+
+    def write_shard(self, shard, pages):
+        """
+        Write the sitemap of ``pages`` to the file for ``shard``, or delete the file
+        if the pages have no sitemap URLs. Returns the number of URLs written.
+        """
+        url_count = 0
+
+        def get_chunks():
+            nonlocal url_count
+            yield URLSET_HEADER
+            for page in pages:
+                for url_info in page.get_sitemap_urls():
+                    url_count += 1
+                    yield self.render_url(url_info)
+            yield URLSET_FOOTER
+
+        self.save(self.get_shard_name(shard), get_chunks())
+
+        if not url_count:
+            self.storage.delete(self.get_path(self.get_shard_name(shard)))
+        return url_count
+
+    def write_index(self):
+        """
+        Write the index file, listing the shards in storage.
+        """
+
+        def get_chunks():
+            yield SITEMAPINDEX_HEADER
+            for shard in self.get_stored_shards():
+                yield "<sitemap><loc>%s</loc>" % escape(self.get_shard_url(shard))
+                try:
+                    last_modified = self.storage.get_modified_time(
+                        self.get_path(self.get_shard_name(shard))
+                    )
+                except NotImplementedError:
+                    pass
+                else:
+                    yield "<lastmod>%s</lastmod>" % last_modified.isoformat()
+                yield "</sitemap>\n"
+            yield SITEMAPINDEX_FOOTER
+
+        self.save(self.index_name, get_chunks())
+
+    def build(self, chunk_size=2000):
+        """
+        Write all the shards and the index file, fetching the pages in a single
+        pass. Returns the number of URLs written.
+        """
+        url_count = 0
+        written_shards = set()
+
+        pages = self.get_pages().order_by("pk").iterator(chunk_size=chunk_size)
+        for shard, shard_pages in itertools.groupby(
+            pages, key=lambda page: get_shard_for_page(page, self.shard_size)
+        ):
+            url_count += self.write_shard(shard, shard_pages)
+            written_shards.add(shard)
+
+        # Remove shards that no longer contain any pages
+        for shard in self.get_stored_shards():
+            if shard not in written_shards:
+                self.storage.delete(self.get_path(self.get_shard_name(shard)))
+
+        self.write_index()
+        return url_count
+
+    def build_shards(self, shards, chunk_size=2000):
+        """
+        Rewrite the given shards, and the index file. Returns the number of URLs
+        written.
+        """
+        url_count = 0
+
+        for shard in sorted(shards):
+            pages = (
+                self.get_pages()
+                .filter(
+                    pk__gte=shard * self.shard_size,
+                    pk__lt=(shard + 1) * self.shard_size,
+                )
+                .order_by("pk")
+                .iterator(chunk_size=chunk_size)
+            )
+            url_count += self.write_shard(shard, pages)
+
+        self.write_index()
+        return url_count
+
+    def open(self, name):
+        """
+        Open the file ``name`` from storage, raising ``FileNotFoundError`` if it
+        hasn't been written.
+        """
+        path = self.get_path(name)
+        if not self.storage.exists(path):
+            raise FileNotFoundError(path)
+        return self.storage.open(path, "rb")
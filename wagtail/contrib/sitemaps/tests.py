@@ -1,14 +1,24 @@
 import datetime
+import re
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock
 
 from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
 from django.contrib.sites.shortcuts import get_current_site
+from django.core import management
+from django.core.files.storage import FileSystemStorage
 from django.test import RequestFactory, TestCase, override_settings
 from django.utils import timezone
 
 from wagtail.models import Page, PageViewRestriction, Site
 from wagtail.test.testapp.models import EventIndex, SimplePage
 
+from .models import PendingSitemapShard
+from .signal_handlers import enqueue_descendant_shards
+from .sitemap_files import SitemapFiles
 from .sitemap_generator import Sitemap
 
 
@@ -284,3 +294,199 @@ class TestSitemapView(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response["Content-Type"], "application/xml")
+
+
+@override_settings(
+    STORAGES={
+        **settings.STORAGES,
+        "sitemaps": {"BACKEND": "django.core.files.storage.InMemoryStorage"},
+    },
+    WAGTAILSITEMAPS_STORAGE="sitemaps",
+    WAGTAILSITEMAPS_SHARD_SIZE=5,
+)
+class TestStoredSitemap(TestCase):
+    def setUp(self):
+        self.site = Site.objects.get(is_default_site=True)
+        self.home_page = self.site.root_page
+        self.pages = [
+            self.home_page.add_child(
+                instance=SimplePage(
+                    title=f"Page {i}", slug=f"page-{i}", content="hello", live=True
+                )
+            )
+            for i in range(6)
+        ]
+        self.unpublished_page = self.home_page.add_child(
+            instance=SimplePage(
+                title="Unpublished", slug="unpublished", content="hello", live=False
+            )
+        )
+
+    def tearDown(self):
+        sitemap_files = SitemapFiles(self.site)
+        for name in sitemap_files.storage.listdir(sitemap_files.get_path(""))[1]:
+            sitemap_files.storage.delete(sitemap_files.get_path(name))
+
+    def get_sitemap(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/xml")
+        if response.streaming:
+            return b"".join(response.streaming_content).decode()
+        return response.content.decode()
+
+    def get_shards(self, pages):
+        return sorted({page.pk // 5 for page in pages})
+
+    def test_build(self):
+        management.call_command("build_sitemap_files", stdout=StringIO())
+
+        index = self.get_sitemap("/stored-sitemap.xml")
+        shards = self.get_shards([self.home_page, *self.pages])
+        self.assertEqual(
+            re.findall(r"<loc>(.*?)</loc>", index),
+            [f"http://localhost/stored-sitemap-{shard}.xml" for shard in shards],
+        )
+
+        urls = []
+        for shard in shards:
+            sitemap = self.get_sitemap(f"/stored-sitemap-{shard}.xml")
+            urls.extend(re.findall(r"<loc>(.*?)</loc>", sitemap))
+
+        self.assertEqual(
+            urls,
+            ["http://localhost/"] + [f"http://localhost/page-{i}/" for i in range(6)],
+        )
+
+    def test_missing_files(self):
+        # Before the files are built, the sitemap is generated on each request
+        sitemap = self.get_sitemap("/stored-sitemap.xml")
+        self.assertIn("<loc>http://localhost/page-0/</loc>", sitemap)
+
+        response = self.client.get("/stored-sitemap-0.xml")
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(WAGTAILSITEMAPS_TRACK_CHANGES=True)
+    def test_build_changed_shards(self):
+        management.call_command("build_sitemap_files", stdout=StringIO())
+        self.assertFalse(PendingSitemapShard.objects.exists())
+
+        self.unpublished_page.save_revision().publish()
+        self.pages[0].unpublish()
+        self.assertEqual(
+            sorted(PendingSitemapShard.objects.values_list("shard", flat=True)),
+            self.get_shards([self.unpublished_page, self.pages[0]]),
+        )
+
+        with mock.patch.object(
+            SitemapFiles,
+            "write_shard",
+            autospec=True,
+            side_effect=SitemapFiles.write_shard,
+        ) as write_shard:
+            management.call_command(
+                "build_sitemap_files", changed=True, stdout=StringIO()
+            )
+
+        # Only the shards containing the changed pages are rewritten
+        self.assertEqual(
+            [call.args[1] for call in write_shard.call_args_list],
+            self.get_shards([self.unpublished_page, self.pages[0]]),
+        )
+        self.assertFalse(PendingSitemapShard.objects.exists())
+
+        urls = []
+        for shard in self.get_shards(
+            [self.home_page, *self.pages, self.unpublished_page]
+        ):
+            urls.extend(
+                re.findall(
+                    r"<loc>(.*?)</loc>",
+                    self.get_sitemap(f"/stored-sitemap-{shard}.xml"),
+                )
+            )
+        self.assertIn("http://localhost/unpublished/", urls)
+        self.assertNotIn("http://localhost/page-0/", urls)
+
+    @override_settings(WAGTAILSITEMAPS_TRACK_CHANGES=True)
+    def test_track_moved_pages(self):
+        child_page = self.pages[0].add_child(
+            instance=SimplePage(title="Child", slug="child", content="hello", live=True)
+        )
+        PendingSitemapShard.objects.all().delete()
+
+        # Reordering pages doesn't change their URLs
+        self.pages[0].move(self.pages[1], pos="left")
+        self.assertFalse(PendingSitemapShard.objects.exists())
+
+        self.pages[0].move(self.pages[5], pos="last-child")
+        self.assertEqual(
+            sorted(PendingSitemapShard.objects.values_list("shard", flat=True)),
+            self.get_shards([self.pages[0], child_page]),
+        )
+
+    @override_settings(WAGTAILSITEMAPS_TRACK_CHANGES=True)
+    def test_descendant_shards_found_in_database(self):
+        PendingSitemapShard.objects.all().delete()
+
+        # One query finds the shards, and another queues them
+        with self.assertNumQueries(2):
+            enqueue_descendant_shards(self.home_page)
+
+        self.assertEqual(
+            sorted(PendingSitemapShard.objects.values_list("shard", flat=True)),
+            self.get_shards([self.home_page, *self.pages]),
+        )
+
+    def test_build_many_changed_shards(self):
+        PendingSitemapShard.enqueue(range(1200))
+
+        with mock.patch.object(SitemapFiles, "build_shards", return_value=0):
+            management.call_command(
+                "build_sitemap_files", changed=True, stdout=StringIO()
+            )
+
+        self.assertFalse(PendingSitemapShard.objects.exists())
+
+    @override_settings(WAGTAILSITEMAPS_TRACK_CHANGES=True)
+    def test_track_slug_changes(self):
+        child_page = self.pages[0].add_child(
+            instance=SimplePage(title="Child", slug="child", content="hello", live=True)
+        )
+        PendingSitemapShard.objects.all().delete()
+
+        self.pages[0].slug = "renamed"
+        with self.captureOnCommitCallbacks(execute=True):
+            self.pages[0].save()
+
+        self.assertEqual(
+            sorted(PendingSitemapShard.objects.values_list("shard", flat=True)),
+            self.get_shards([self.pages[0], child_page]),
+        )
+
+    def test_rewrite_with_local_storage(self):
+        location = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, location)
+        storage = FileSystemStorage(location=location)
+        sitemap_files = SitemapFiles(self.site, storage=storage)
+        sitemap_files.build()
+
+        self.pages[0].unpublish()
+        with mock.patch.object(storage, "delete") as delete:
+            sitemap_files.build_shards(self.get_shards([self.pages[0]]))
+
+        # The files are written over rather than deleted and written again, so
+        # that they are never missing
+        delete.assert_not_called()
+        self.assertEqual(
+            sorted(storage.listdir(sitemap_files.get_path(""))[1]),
+            [
+                sitemap_files.get_shard_name(shard)
+                for shard in self.get_shards([self.home_page, *self.pages])
+            ]
+            + ["sitemap.xml"],
+        )
+        with sitemap_files.open(
+            sitemap_files.get_shard_name(self.pages[0].pk // 5)
+        ) as f:
+            self.assertNotIn(b"/page-0/", f.read())
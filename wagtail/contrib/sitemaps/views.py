@@ -1,7 +1,9 @@
 import inspect
 
 from django.contrib.sitemaps import views as sitemap_views
+from django.http import FileResponse, Http404
 
+from .sitemap_files import SitemapFiles
 from .sitemap_generator import Sitemap
 
 
@@ -26,3 +28,27 @@ def prepare_sitemaps(request, sitemaps):
         else:
             initialised_sitemaps[name] = sitemap_cls
     return initialised_sitemaps
+
+
+@sitemap_views.x_robots_tag
+def stored_sitemap(request, shard=None):
+    """
+    Serve the sitemap files written by the ``build_sitemap_files`` management
+    command for the current site: the index file if ``shard`` is not given,
+    otherwise the shard with that number. If the files haven't been written yet,
+    the sitemap is generated on the fly instead.
+    """
+    sitemap_files = SitemapFiles(Sitemap(request).get_wagtail_site())
+    if shard is None:
+        name = sitemap_files.index_name
+    else:
+        name = sitemap_files.get_shard_name(shard)
+
+    try:
+        f = sitemap_files.open(name)
+    except FileNotFoundError:
+        if shard is None:
+            return sitemap(request)
+        raise Http404
+
+    return FileResponse(f, content_type="application/xml")
@@ -0,0 +1,81 @@
+"""
+A cache of the metadata used to serve documents, so that the document serve
+view doesn't need to query the storage backend for the file's path, URL and
+size on every download.
+
+When ``WAGTAILDOCS_METADATA_CACHE`` is enabled, the metadata of each served
+document is stored in the Django cache, and cleared whenever the document is
+saved or deleted. Requests with an ``If-None-Match`` header matching the file
+hash are then answered with a 304 response without querying the database.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+METADATA_CACHE_KEY_PREFIX = "wagtaildocs_metadata"
+
+# Kept short, as storage URLs may expire (such as signed Amazon S3 URLs)
+METADATA_CACHE_TIMEOUT = 60 * 5
+
+
+def is_enabled():
+    return getattr(settings, "WAGTAILDOCS_METADATA_CACHE", False)
+
+
+def get_cache_key(document_id):
+    return f"{METADATA_CACHE_KEY_PREFIX}:{document_id}"
+
+
+def build_document_metadata(document):
+    """
+    Return a dict of the metadata needed to serve ``document``.
+    """
+    try:
+        local_path = document.file.path
+    except NotImplementedError:
+        local_path = None
+
+    try:
+        url = document.file.url
+    except NotImplementedError:
+        url = None
+
+    return {
+        "id": document.pk,
+        "filename": document.filename,
+        "file_hash": getattr(document, "file_hash", ""),
+        "file_size": document.get_file_size(),
+        "content_type": document.content_type,
+        "content_disposition": document.content_disposition,
+        "local_path": local_path,
+        "url": url,
+    }
+
+
+def get_document_metadata(document_id):
+    """
+    Return the cached metadata of the document with the given ID, or ``None``
+    if it isn't cached or the cache is disabled.
+    """
+    if not is_enabled():
+        return None
+    return cache.get(get_cache_key(document_id))
+
+
+def cache_document_metadata(document):
+    """
+    Return the metadata of ``document``, storing it in the cache if the cache
+    is enabled.
+    """
+    metadata = build_document_metadata(document)
+    if is_enabled():
+        cache.set(get_cache_key(document.pk), metadata, METADATA_CACHE_TIMEOUT)
+    return metadata
+
+
+def clear_document_metadata(document_id):
+    """
+    Remove the cached metadata of the document with the given ID. This is
+    called when a document is saved or deleted.
+    """
+    cache.delete(get_cache_key(document_id))
@@ -1,7 +1,8 @@
 from django.db import transaction
-from django.db.models.signals import post_delete
+from django.db.models.signals import post_delete, post_save
 
 from wagtail.documents import get_document_model
+from wagtail.documents.metadata import clear_document_metadata
 
 
 def post_delete_file_cleanup(instance, **kwargs):
@@ -9,6 +10,15 @@ def post_delete_file_cleanup(instance, **kwargs):
     transaction.on_commit(lambda: instance.file.delete(False))
 
 
+def clear_document_metadata_cache(instance, **kwargs):
+    # Clear the cache once the change is committed, so that it can't be filled
+    # again with the old metadata in the meantime
+    document_id = instance.pk
+    transaction.on_commit(lambda: clear_document_metadata(document_id))
+
+
 def register_signal_handlers():
     Document = get_document_model()
     post_delete.connect(post_delete_file_cleanup, sender=Document)
+    post_save.connect(clear_document_metadata_cache, sender=Document)
+    post_delete.connect(clear_document_metadata_cache, sender=Document)
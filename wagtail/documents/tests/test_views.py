@@ -4,6 +4,7 @@ import urllib
 from unittest import mock
 
 from django.conf import settings
+from django.core.cache import cache
 from django.core.files.base import ContentFile
 from django.test import TestCase, override_settings
 from django.urls import reverse
@@ -75,6 +76,8 @@ class TestServeView(TestCase):
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
+        mock_doc.file_hash = ""
+        mock_doc.get_file_size.return_value = 160
         mock_get_object_or_404.return_value = mock_doc
 
         # Bypass 'before_serve_document' hooks
@@ -108,6 +111,8 @@ class TestServeView(TestCase):
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
+        mock_doc.file_hash = ""
+        mock_doc.get_file_size.return_value = 160
         mock_get_object_or_404.return_value = mock_doc
 
         # Bypass 'before_serve_document' hooks
@@ -173,6 +178,241 @@ class TestServeView(TestCase):
         _get_sendfile.clear()
 
 
+@override_settings(WAGTAILDOCS_SERVE_METHOD=None)
+class TestServeViewRangeRequests(TestCase):
+    def setUp(self):
+        self.document = models.Document(title="Test document", file_hash="123456")
+        self.document.file.save(
+            "serve_view_range.doc", ContentFile(b"A boring example document")
+        )
+
+    def tearDown(self):
+        # delete the FieldFile directly because the TestCase does not commit
+        # transactions to trigger transaction.on_commit() in the signal handler
+        self.document.file.delete()
+
+    def get(self, **headers):
+        response = self.client.get(
+            reverse(
+                "wagtaildocs_serve", args=(self.document.id, self.document.filename)
+            ),
+            headers=headers,
+        )
+        # Read the response so that the file is closed before it's deleted
+        response.body = (
+            b"".join(response.streaming_content)
+            if response.streaming
+            else response.content
+        )
+        return response
+
+    def test_accept_ranges_header(self):
+        self.assertEqual(self.get()["Accept-Ranges"], "bytes")
+
+    def test_single_range(self):
+        response = self.get(range="bytes=2-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+        self.assertEqual(response["Content-Length"], "6")
+        self.assertEqual(response["Content-Type"], "application/msword")
+        self.assertEqual(response.body, b"boring")
+        self.assertTrue(response["Content-Disposition"].startswith("attachment;"))
+
+    def test_open_ended_and_suffix_ranges(self):
+        response = self.get(range="bytes=17-")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.body, b"document")
+
+        response = self.get(range="bytes=-8")
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 17-24/25")
+        self.assertEqual(response.body, b"document")
+
+    def test_multiple_ranges(self):
+        response = self.get(range="bytes=0-0, 17-24")
+
+        self.assertEqual(response.status_code, 206)
+        content_type, _, boundary = response["Content-Type"].partition("; boundary=")
+        self.assertEqual(content_type, "multipart/byteranges")
+        self.assertEqual(response["Content-Length"], str(len(response.body)))
+        self.assertEqual(
+            response.body,
+            (
+                f"\r\n--{boundary}\r\n"
+                "Content-Type: application/msword\r\n"
+                "Content-Range: bytes 0-0/25\r\n\r\n"
+                "A"
+                f"\r\n--{boundary}\r\n"
+                "Content-Type: application/msword\r\n"
+                "Content-Range: bytes 17-24/25\r\n\r\n"
+                "document"
+                f"\r\n--{boundary}--\r\n"
+            ).encode(),
+        )
+
+    def test_overlapping_ranges_are_merged(self):
+        response = self.get(range="bytes=2-5, 4-7")
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Range"], "bytes 2-7/25")
+        self.assertEqual(response.body, b"boring")
+
+    def test_unsatisfiable_range(self):
+        response = self.get(range="bytes=100-200")
+
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response["Content-Range"], "bytes */25")
+
+    def test_invalid_range_is_ignored(self):
+        response = self.get(range="bytes=7-2")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, b"A boring example document")
+
+    def test_if_range_matching_etag(self):
+        response = self.get(range="bytes=2-7", if_range='"123456"')
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response.body, b"boring")
+
+    def test_if_range_not_matching_etag(self):
+        response = self.get(range="bytes=2-7", if_range='"654321"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.body, b"A boring example document")
+
+    def test_if_range_matching_date(self):
+        last_modified = self.get()["Last-Modified"]
+
+        response = self.get(range="bytes=2-7", if_range=last_modified)
+
+        self.assertEqual(response.status_code, 206)
+
+    def test_if_none_match(self):
+        response = self.get(if_none_match='"123456"')
+
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(
+    WAGTAILDOCS_SERVE_METHOD="serve_view",
+    STORAGES={
+        **settings.STORAGES,
+        "default": {
+            "BACKEND": "wagtail.test.dummy_external_storage.DummyExternalStorage"
+        },
+    },
+)
+class TestServeViewRangeRequestsWithExternalStorage(TestServeViewRangeRequests):
+    """
+    Test byte range requests for documents in a remote storage backend, which
+    are served without sendfile.
+    """
+
+    def test_if_range_matching_date(self):
+        # Files are served without a Last-Modified header, so If-Range dates
+        # never match
+        response = self.get(range="bytes=2-7", if_range="Sat, 1 Jan 2000 00:00:00 GMT")
+
+        self.assertEqual(response.status_code, 200)
+
+
+@override_settings(
+    WAGTAILDOCS_SERVE_METHOD=None,
+    WAGTAILDOCS_METADATA_CACHE=True,
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+)
+class TestServeViewWithMetadataCache(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.document = models.Document(title="Test document", file_hash="123456")
+        self.document.file.save(
+            "serve_view_metadata.doc", ContentFile(b"A boring example document")
+        )
+
+    def tearDown(self):
+        # delete the FieldFile directly because the TestCase does not commit
+        # transactions to trigger transaction.on_commit() in the signal handler
+        self.document.file.delete()
+        cache.clear()
+
+    def get(self, filename=None, **headers):
+        response = self.client.get(
+            reverse(
+                "wagtaildocs_serve",
+                args=(self.document.id, filename or self.document.filename),
+            ),
+            headers=headers,
+        )
+        # Read the response so that the file is closed before it's deleted
+        if response.streaming:
+            response.body = b"".join(response.streaming_content)
+        return response
+
+    def test_not_modified_without_queries(self):
+        self.get()
+
+        with self.assertNumQueries(0):
+            response = self.get(if_none_match='"123456"')
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"123456"')
+
+    @override_settings(WAGTAILDOCS_METADATA_CACHE=False)
+    def test_not_modified_with_cache_disabled(self):
+        self.get()
+
+        # The document is only fetched once
+        with self.assertNumQueries(1):
+            response = self.get(if_none_match='"123456"')
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_cached_metadata_is_used(self):
+        self.get()
+
+        with mock.patch(
+            "wagtail.documents.metadata.build_document_metadata"
+        ) as build_document_metadata:
+            response = self.get()
+
+        build_document_metadata.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Length"], "25")
+        self.assertEqual(response["ETag"], '"123456"')
+        self.assertEqual(response.body, b"A boring example document")
+
+    def test_metadata_cleared_on_save(self):
+        self.get()
+
+        self.document.file_hash = "654321"
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.document.save()
+
+            # The cache is cleared once the change is committed
+            response = self.get(if_none_match='"123456"')
+            self.assertEqual(response.status_code, 304)
+
+        for callback in callbacks:
+            callback()
+        response = self.get(if_none_match='"123456"')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], '"654321"')
+
+    def test_with_incorrect_filename(self):
+        self.get()
+
+        response = self.get(filename="incorrectfilename", if_none_match='"123456"')
+
+        self.assertEqual(response.status_code, 404)
+
+
 @override_settings(WAGTAILDOCS_SERVE_METHOD="redirect")
 class TestServeViewWithRedirect(TestCase):
     def setUp(self):
@@ -388,6 +628,8 @@ class TestServeWithUnicodeFilename(TestCase):
         mock_doc.file = ContentFile(b"file-like object" * 10)
         mock_doc.file.path = None
         mock_doc.file.url = None
+        mock_doc.file_hash = ""
+        mock_doc.get_file_size.return_value = 160
         mock_get_object_or_404.return_value = mock_doc
 
         # Bypass 'before_serve_document' hooks
@@ -1,20 +1,25 @@
 from warnings import warn
 
 from django.conf import settings
-from django.http import FileResponse, Http404, HttpResponse
+from django.http import Http404, HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.template.response import TemplateResponse
 from django.urls import reverse
-from django.utils.http import url_has_allowed_host_and_scheme
-from django.views.decorators.http import etag
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag, url_has_allowed_host_and_scheme
 
 from wagtail import hooks
 from wagtail.documents import get_document_model
+from wagtail.documents.metadata import (
+    cache_document_metadata,
+    get_document_metadata,
+)
 from wagtail.documents.models import document_served
 from wagtail.forms import PasswordViewRestrictionForm
 from wagtail.models import CollectionViewRestriction
 from wagtail.utils import sendfile_streaming_backend
 from wagtail.utils.deprecation import RemovedInWagtail70Warning
+from wagtail.utils.file_response import serve_file
 from wagtail.utils.sendfile import sendfile
 
 
@@ -28,34 +33,54 @@ def document_etag(request, document_id, document_filename):
         )
 
 
-@etag(document_etag)
 def serve(request, document_id, document_filename):
     Document = get_document_model()
-    doc = get_object_or_404(Document, id=document_id)
 
-    # We want to ensure that the document filename provided in the URL matches the one associated with the considered
-    # document_id. If not we can't be sure that the document the user wants to access is the one corresponding to the
-    # <document_id, document_filename> pair.
-    if doc.filename != document_filename:
-        raise Http404("This document does not match the given filename.")
+    # If the document's metadata is cached, conditional requests are answered
+    # without querying the database. Otherwise, the document is only fetched once
+    metadata = get_document_metadata(document_id)
+    if metadata is not None and metadata["filename"] == document_filename:
+        doc = None
+        file_hash = metadata["file_hash"]
+    else:
+        metadata = None
+        doc = get_object_or_404(Document, id=document_id)
+
+        # We want to ensure that the document filename provided in the URL matches the one associated with the considered
+        # document_id. If not we can't be sure that the document the user wants to access is the one corresponding to the
+        # <document_id, document_filename> pair.
+        if doc.filename != document_filename:
+            raise Http404("This document does not match the given filename.")
+
+        file_hash = getattr(doc, "file_hash", "")
+
+    res_etag = quote_etag(file_hash) if file_hash else None
+    response = get_conditional_response(request, etag=res_etag)
+    if response is None:
+        if doc is None:
+            doc = get_object_or_404(Document, id=document_id)
+        response = serve_document(request, doc, metadata)
+
+    if res_etag and request.method in ("GET", "HEAD"):
+        response.headers.setdefault("ETag", res_etag)
+    return response
 
+
+def serve_document(request, doc, metadata=None):
     for fn in hooks.get_hooks("before_serve_document"):
         result = fn(doc, request)
         if isinstance(result, HttpResponse):
             return result
 
     # Send document_served signal
-    document_served.send(sender=Document, instance=doc, request=request)
-
-    try:
-        local_path = doc.file.path
-    except NotImplementedError:
-        local_path = None
+    document_served.send(sender=get_document_model(), instance=doc, request=request)
 
-    try:
-        direct_url = doc.file.url
-    except NotImplementedError:
-        direct_url = None
+    # Avoid querying the storage backend for the file's path, URL and size
+    # where possible, as this can be slow for remote storages
+    if metadata is None:
+        metadata = cache_document_metadata(doc)
+    local_path = metadata["local_path"]
+    direct_url = metadata["url"]
 
     serve_method = getattr(settings, "WAGTAILDOCS_SERVE_METHOD", None)
 
@@ -77,14 +102,19 @@ def serve(request, document_id, document_filename):
         # backwards compatibility behaviour.
         return redirect(direct_url)
 
+    # The file hash is a strong validator for byte range requests
+    file_hash = metadata["file_hash"] or None
+
     if local_path:
         # Use wagtail.utils.sendfile to serve the file;
-        # this provides support for mimetypes, if-modified-since and django-sendfile backends
+        # this provides support for mimetypes, conditional and byte range requests
+        # and django-sendfile backends
 
         sendfile_opts = {
-            "attachment": (doc.content_disposition != "inline"),
-            "attachment_filename": doc.filename,
-            "mimetype": doc.content_type,
+            "attachment": (metadata["content_disposition"] != "inline"),
+            "attachment_filename": metadata["filename"],
+            "mimetype": metadata["content_type"],
+            "etag": file_hash,
         }
         if not hasattr(settings, "SENDFILE_BACKEND"):
             # Fallback to streaming backend if user hasn't specified SENDFILE_BACKEND
@@ -97,15 +127,19 @@ def serve(request, document_id, document_filename):
         # (e.g. storages.backends.s3boto.S3BotoStorage) AND the developer has not allowed
         # redirecting to the file url directly.
         # Fall back on pre-sendfile behaviour of reading the file content and serving it
-        # as a FileResponse
-        response = FileResponse(doc.file, doc.content_type)
+        # as a streamed response, supporting conditional and byte range requests
+        doc.file.open("rb")
+        response = serve_file(
+            request,
+            doc.file,
+            metadata["content_type"],
+            size=metadata["file_size"],
+            etag=file_hash,
+        )
 
         # set filename and filename* to handle non-ascii characters in filename
         # see https://developer.mozilla.org/en-US/docs/Web/HTTP/Headers/Content-Disposition
-        response["Content-Disposition"] = doc.content_disposition
-
-        # FIXME: storage backends are not guaranteed to implement 'size'
-        response["Content-Length"] = doc.file.size
+        response["Content-Disposition"] = metadata["content_disposition"]
 
         return response
 
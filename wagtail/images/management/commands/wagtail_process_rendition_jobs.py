@@ -0,0 +1,114 @@
+import logging
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+
+from wagtail.images.exceptions import InvalidFilterSpecError
+from wagtail.images.models import Filter, RenditionJob, SourceImageIOError
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    """Command to generate renditions that have been queued by get_deferred_rendition()."""
+
+    help = "Generate image renditions that have been queued for background processing."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=50,
+            help="Number of jobs to claim at a time (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=3,
+            help="Number of times to retry a failing job before discarding it (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--retry-after",
+            type=int,
+            default=600,
+            help="Number of seconds to wait before retrying a failed or abandoned job (default: %(default)s)",
+        )
+        parser.add_argument(
+            "--watch",
+            action="store_true",
+            help="Keep running and poll for new jobs, instead of exiting once the queue is empty",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=5,
+            help="Number of seconds to wait between polls when using --watch (default: %(default)s)",
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+
+        while True:
+            jobs = RenditionJob.claim(
+                options["batch_size"], stale_after=options["retry_after"]
+            )
+            if jobs:
+                processed += self.process_jobs(jobs, options["max_attempts"])
+            elif options["watch"]:
+                time.sleep(options["interval"])
+            else:
+                break
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Successfully processed {processed} rendition job(s)")
+        )
+
+    def process_jobs(self, jobs, max_attempts):
+        jobs_by_image = defaultdict(list)
+        for job in jobs:
+            jobs_by_image[(job.content_type_id, job.object_id)].append(job)
+
+        processed = 0
+        for image_jobs in jobs_by_image.values():
+            job = image_jobs[0]
+            model = job.content_type.model_class()
+            image = (
+                model._default_manager.filter(pk=job.object_id).first()
+                if model
+                else None
+            )
+            job_ids = [job.pk for job in image_jobs]
+
+            if image is None:
+                # The image has been deleted since the jobs were queued
+                RenditionJob.objects.filter(pk__in=job_ids).delete()
+                continue
+
+            filters = [Filter(spec=job.filter_spec) for job in image_jobs]
+            try:
+                image.get_renditions(*filters)
+            except (SourceImageIOError, InvalidFilterSpecError):
+                logger.exception(
+                    "Cannot generate queued renditions for image %s", image.pk
+                )
+                RenditionJob.objects.filter(pk__in=job_ids).delete()
+            except Exception:
+                logger.exception(
+                    "Error generating queued renditions for image %s", image.pk
+                )
+                self.stderr.write(
+                    self.style.ERROR(
+                        f"Failed to generate renditions for image {image.pk}"
+                    )
+                )
+                # Leave the remaining jobs claimed, so that they are retried
+                # once the claim has expired
+                RenditionJob.objects.filter(
+                    pk__in=job_ids, attempts__gte=max_attempts
+                ).delete()
+            else:
+                RenditionJob.objects.filter(pk__in=job_ids).delete()
+                processed += len(image_jobs)
+
+        return processed
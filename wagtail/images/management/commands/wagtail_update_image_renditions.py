@@ -1,9 +1,16 @@
+import concurrent.futures
 import logging
+import multiprocessing
+import time
+from io import BytesIO
 
+from django.core.files import File
 from django.core.management.base import BaseCommand
 from django.db import transaction
 
 from wagtail.images import get_image_model
+from wagtail.images.models import generate_rendition_file_contents
+from wagtail.images.utils import setup_rendition_worker
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +43,12 @@ class Command(BaseCommand):
             default=50,
             help="Operate in x size chunks (default: %(default)s)",
         )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Regenerate each chunk of renditions across x worker processes (default: %(default)s)",
+        )
 
     def handle(self, *args, **options):
         Rendition = get_image_model().get_rendition_model()
@@ -60,14 +73,64 @@ class Command(BaseCommand):
                 self.style.HTTP_INFO(f"Regenerating {num_renditions} rendition(s)")
             )
 
+        start_time = time.monotonic()
+
+        if options["workers"] > 1 and not purge_only:
+            num_renditions -= self.regenerate_in_parallel(
+                renditions,
+                rendition_ids,
+                chunk_size=options["chunk_size"],
+                workers=options["workers"],
+            )
+        else:
+            num_renditions -= self.process_sequentially(
+                renditions,
+                rendition_ids,
+                chunk_size=options["chunk_size"],
+                purge_only=purge_only,
+            )
+
+        duration = time.monotonic() - start_time
+
+        if num_renditions:
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Successfully processed {num_renditions} rendition(s)"
+                )
+            )
+            if not purge_only:
+                self.stdout.write(
+                    f"Throughput: {num_renditions / max(duration, 0.001):.1f} rendition(s) per second"
+                )
+        else:
+            self.stdout.write(self.style.WARNING("Could not process any renditions."))
+
+    def write_progress(self, current, total):
+        _progress_bar = progress_bar(current, total)
+        self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
+
+    def report_failure(self, rendition_id):
+        logger.exception("Error operating on rendition %d", rendition_id)
+        self.stderr.write(
+            self.style.ERROR(f"Failed to operate on rendition {rendition_id}")
+        )
+
+    def process_sequentially(self, renditions, rendition_ids, chunk_size, purge_only):
+        """
+        Delete, and unless ``purge_only`` is set, regenerate each rendition in turn.
+        Returns the number of renditions that could not be processed.
+        """
+        num_renditions = len(rendition_ids)
+        num_failed = 0
         progress_bar_current = 1
         for rendition in (
             # Pre-calculate the ids of the renditions to change,
             # otherwise `.iterator` never ends.
             renditions.filter(id__in=rendition_ids)
             .select_related("image")
-            .iterator(chunk_size=options["chunk_size"])
+            .iterator(chunk_size=chunk_size)
         ):
+            rendition_id = rendition.id
             try:
                 with transaction.atomic():
                     rendition_filter = rendition.filter
@@ -76,25 +139,89 @@ class Command(BaseCommand):
                     # Delete the existing rendition
                     rendition.delete()
 
-                    _progress_bar = progress_bar(progress_bar_current, num_renditions)
-                    self.stdout.write(_progress_bar[0], ending=_progress_bar[1])
+                    self.write_progress(
+                        progress_bar_current, num_renditions - num_failed
+                    )
                     progress_bar_current = progress_bar_current + 1
 
                     if not purge_only:
                         # Create a new one
                         rendition_image.get_rendition(rendition_filter)
             except:  # noqa:E722
-                logger.exception("Error operating on rendition %d", rendition.id)
-                self.stderr.write(
-                    self.style.ERROR(f"Failed to operate on rendition {rendition.id}")
-                )
-                num_renditions -= 1
+                self.report_failure(rendition_id)
+                num_failed += 1
+
+        return num_failed
+
+    def regenerate_in_parallel(self, renditions, rendition_ids, chunk_size, workers):
+        """
+        Regenerate the renditions one chunk at a time, generating the image files
+        for each chunk across a pool of ``workers`` processes. The original image
+        file is only read once per image in each chunk.
+        Returns the number of renditions that could not be processed.
+        """
+        num_renditions = len(rendition_ids)
+        num_failed = 0
+        progress_bar_current = 1
 
-        if num_renditions:
-            self.stdout.write(
-                self.style.SUCCESS(
-                    f"Successfully processed {num_renditions} rendition(s)"
-                )
-            )
+        if multiprocessing.current_process().daemon:
+            # Daemonic processes cannot start child processes
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
         else:
-            self.stdout.write(self.style.WARNING("Could not process any renditions."))
+            executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers, initializer=setup_rendition_worker
+            )
+
+        with executor:
+            for chunk_start in range(0, num_renditions, chunk_size):
+                chunk = list(
+                    renditions.filter(
+                        id__in=rendition_ids[chunk_start : chunk_start + chunk_size]
+                    ).select_related("image")
+                )
+
+                # Read each original image once, and submit all of its
+                # renditions in this chunk to the pool
+                futures = []
+                sources = {}
+                for rendition in chunk:
+                    image = rendition.image
+                    try:
+                        if image.pk not in sources:
+                            with image.open_file() as file:
+                                sources[image.pk] = file.read()
+                        future = executor.submit(
+                            generate_rendition_file_contents,
+                            image,
+                            rendition.filter_spec,
+                            sources[image.pk],
+                        )
+                        futures.append((rendition.id, rendition, future))
+                    except:  # noqa:E722
+                        self.report_failure(rendition.id)
+                        num_failed += 1
+
+                for rendition_id, rendition, future in futures:
+                    try:
+                        name, contents = future.result()
+                        with transaction.atomic():
+                            image = rendition.image
+                            rendition_filter = rendition.filter
+
+                            # Replace the existing rendition
+                            rendition.delete()
+                            image.renditions.get_or_create(
+                                filter_spec=rendition_filter.spec,
+                                focal_point_key=rendition_filter.get_cache_key(image),
+                                defaults={"file": File(BytesIO(contents), name=name)},
+                            )
+
+                        self.write_progress(
+                            progress_bar_current, num_renditions - num_failed
+                        )
+                        progress_bar_current = progress_bar_current + 1
+                    except:  # noqa:E722
+                        self.report_failure(rendition_id)
+                        num_failed += 1
+
+        return num_failed
@@ -0,0 +1,51 @@
+from wagtail.coreutils import safe_md5
+from wagtail.images import get_image_model
+from wagtail.images.rendition_resolver import RenditionResolver
+
+
+class RenditionResolverMiddleware:
+    """
+    Looks up the image renditions needed to render each request in bulk, using
+    a ``RenditionResolver``.
+
+    The renditions used to render each URL path are remembered in the renditions
+    cache, so that on later requests for the same path, they can all be looked
+    up with a single database query when the first one is needed.
+    """
+
+    manifest_timeout = 60 * 60 * 24
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def get_manifest_cache_key(self, request):
+        # Paths can be of any length, and contain characters that aren't valid in
+        # the keys of some cache backends
+        path_hash = safe_md5(request.path.encode(), usedforsecurity=False).hexdigest()
+        return "wagtail-rendition-manifest-" + path_hash
+
+    def __call__(self, request):
+        use_manifest = request.method in ("GET", "HEAD")
+        cache_backend = get_image_model().get_rendition_model().cache_backend
+
+        with RenditionResolver() as resolver:
+            manifest = None
+            if use_manifest:
+                manifest = cache_backend.get(self.get_manifest_cache_key(request))
+                if manifest:
+                    resolver.add_from_manifest(manifest)
+
+            response = self.get_response(request)
+
+            # Only remember the renditions of pages that exist, so that requests
+            # for arbitrary paths don't fill the cache
+            if use_manifest and resolver.used and response.status_code == 200:
+                new_manifest = resolver.get_manifest()
+                if new_manifest != manifest:
+                    cache_backend.set(
+                        self.get_manifest_cache_key(request),
+                        new_manifest,
+                        self.manifest_timeout,
+                    )
+
+        return response
@@ -1,15 +1,20 @@
 from __future__ import annotations
 
+import atexit
 import concurrent.futures
 import hashlib
 import itertools
 import logging
+import math
+import multiprocessing
 import os.path
 import re
+import threading
 import time
 from collections import OrderedDict, defaultdict, namedtuple
 from collections.abc import Iterable
 from contextlib import contextmanager
+from datetime import timedelta
 from io import BytesIO
 from tempfile import SpooledTemporaryFile
 from typing import Any
@@ -17,6 +22,7 @@ from typing import Any
 import willow
 from django.apps import apps
 from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
 from django.core import checks
 from django.core.cache import DEFAULT_CACHE_ALIAS, InvalidCacheBackendError, caches
 from django.core.cache.backends.base import BaseCache
@@ -26,7 +32,8 @@ from django.core.files.storage import InvalidStorageError, default_storage, stor
 from django.db import models
 from django.db.models import Q
 from django.forms.utils import flatatt
-from django.urls import reverse
+from django.urls import NoReverseMatch, reverse
+from django.utils import timezone
 from django.utils.functional import cached_property, classproperty
 from django.utils.module_loading import import_string
 from django.utils.safestring import mark_safe
@@ -46,6 +53,8 @@ from wagtail.images.image_operations import (
     TransformOperation,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_resolver import get_rendition_resolver
+from wagtail.images.utils import setup_rendition_worker
 from wagtail.models import CollectionMember, ReferenceIndex
 from wagtail.search import index
 from wagtail.search.queryset import SearchableQuerySetMixin
@@ -148,6 +157,51 @@ def get_rendition_storage():
     return storage
 
 
+_rendition_process_pool = None
+
+
+def get_rendition_workers():
+    """
+    Return the number of workers used to generate multiple renditions in parallel,
+    as configured by the ``WAGTAILIMAGES_RENDITION_WORKERS`` setting.
+    """
+    return getattr(settings, "WAGTAILIMAGES_RENDITION_WORKERS", 3)
+
+
+def get_rendition_process_pool():
+    """
+    Return the process pool used to generate renditions when
+    ``WAGTAILIMAGES_RENDITION_EXECUTOR`` is set to ``"process"``. The pool is
+    created on first use and shared for the lifetime of the process.
+    """
+    global _rendition_process_pool
+
+    if _rendition_process_pool is None:
+        _rendition_process_pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=get_rendition_workers(),
+            initializer=setup_rendition_worker,
+        )
+        atexit.register(_rendition_process_pool.shutdown)
+    return _rendition_process_pool
+
+
+def generate_rendition_file_contents(
+    image: AbstractImage, filter_spec: str, source: bytes
+) -> tuple[str, bytes]:
+    """
+    Generate the rendition of ``image`` for ``filter_spec`` from the original
+    image bytes in ``source``, returning the rendition's filename and contents.
+
+    This does not access the database or file storage, so it can be run in a
+    separate process (see ``get_rendition_process_pool()``).
+    """
+    file = image.generate_rendition_file(
+        Filter(filter_spec), source=File(BytesIO(source), name=image.file.name)
+    )
+    file.seek(0)
+    return file.name, file.read()
+
+
 class ImageFileMixin:
     def is_stored_locally(self):
         """
@@ -490,6 +544,11 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         return getattr(self, "prefetched_renditions", None)
 
     def _add_to_prefetched_renditions(self, rendition: AbstractRendition) -> None:
+        # Reuse this rendition if requested again during the current request
+        resolver = get_rendition_resolver()
+        if resolver is not None:
+            resolver.add_rendition(self, rendition)
+
         # Reuse this rendition if requested again from this object
         try:
             self._prefetched_objects_cache["renditions"]._result_cache.append(rendition)
@@ -528,6 +587,87 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         return rendition
 
+    def get_deferred_rendition(self, filter: Filter | str) -> AbstractRendition:
+        """
+        Like ``get_rendition()``, but if the rendition does not exist yet, a
+        ``RenditionJob`` is queued for it (to be processed by the
+        ``wagtail_process_rendition_jobs`` management command) instead of
+        generating it during the current request.
+
+        In that case, an unsaved placeholder rendition is returned, with the
+        expected dimensions and a URL pointing to the image serve view, which
+        generates the rendition on demand if it is requested before the job
+        has been processed.
+        """
+        if isinstance(filter, str):
+            filter = Filter(spec=filter)
+
+        return self.get_deferred_renditions(filter)[filter.spec]
+
+    def get_deferred_renditions(
+        self, *filters: Filter | str
+    ) -> dict[str, AbstractRendition]:
+        """
+        Like ``get_renditions()``, but queues ``RenditionJob`` objects for any
+        renditions that do not exist yet, returning placeholder renditions for
+        them instead of generating them during the current request. See
+        ``get_deferred_rendition()``.
+        """
+        Rendition = self.get_rendition_model()
+        if isinstance(filters[0], str):
+            filters = [Filter(spec) for spec in dict.fromkeys(filters).keys()]
+
+        renditions = self.find_existing_renditions(*filters)
+
+        not_found = [f for f in filters if f not in renditions]
+        if not_found:
+            try:
+                placeholders = {
+                    filter: self.generate_placeholder_rendition(filter)
+                    for filter in not_found
+                }
+            except NoReverseMatch:
+                # The image serve view is not available to generate the
+                # renditions on demand, so create them now
+                return self.get_renditions(*filters)
+
+            RenditionJob.enqueue(self, *not_found)
+            renditions.update(placeholders)
+
+        cache_additions = {
+            Rendition.construct_cache_key(
+                self, filter.get_cache_key(self), filter.spec
+            ): rendition
+            for filter, rendition in renditions.items()
+            if not getattr(rendition, "_from_cache", False)
+            and rendition.deferred_url is None
+        }
+        if cache_additions:
+            Rendition.cache_backend.set_many(cache_additions)
+
+        return {filter.spec: renditions[filter] for filter in filters}
+
+    def generate_placeholder_rendition(self, filter: Filter) -> AbstractRendition:
+        """
+        Returns an **unsaved** ``Rendition`` instance to stand in for a
+        rendition that has not been generated yet. Its dimensions are
+        calculated from the filter without opening the image file, and its
+        URL points to the image serve view, so that the rendition is
+        generated when it is first requested from there.
+        """
+        from wagtail.images.views.serve import generate_image_url
+
+        width, height = filter.get_transform(self).size
+        rendition = self.get_rendition_model()(
+            image=self,
+            filter_spec=filter.spec,
+            focal_point_key=filter.get_cache_key(self),
+            width=round(width),
+            height=round(height),
+        )
+        rendition.deferred_url = generate_image_url(self, filter.spec)
+        return rendition
+
     def find_existing_rendition(self, filter: Filter) -> AbstractRendition:
         """
         Returns an existing ``Rendition`` instance with a ``file`` field value
@@ -650,6 +790,10 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
                         found[filter] = rendition
                         # skip to the next filter
                         break
+        elif (resolver := get_rendition_resolver()) is not None:
+            # Look up the renditions along with any others needed for the
+            # current request
+            found = resolver.find(self, filters_by_spec.values())
         else:
             # Renditions are not prefetched, so attempt to find suitable
             # items in the cache or database
@@ -714,16 +858,55 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
 
         to_create = []
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=3) as executor:
-            for future in concurrent.futures.as_completed(
-                executor.submit(
-                    self.generate_rendition_instance,
-                    filter,
-                    BytesIO(original_image_bytes),
+        if (
+            getattr(settings, "WAGTAILIMAGES_RENDITION_EXECUTOR", "thread") == "process"
+            # Daemonic processes (such as some task queue workers) cannot
+            # start child processes, so fall back to using threads
+            and not multiprocessing.current_process().daemon
+        ):
+            # Generate the image files in worker processes, and create the
+            # rendition instances from the results in this process
+            executor = get_rendition_process_pool()
+            futures = {
+                filter: executor.submit(
+                    generate_rendition_file_contents,
+                    self,
+                    filter.spec,
+                    original_image_bytes,
                 )
                 for filter in filters
-            ):
-                to_create.append(future.result())
+            }
+            for filter, future in futures.items():
+                name, contents = future.result()
+                to_create.append(
+                    Rendition(
+                        image=self,
+                        filter_spec=filter.spec,
+                        focal_point_key=filter.get_cache_key(self),
+                        file=File(BytesIO(contents), name=name),
+                    )
+                )
+        else:
+            # Decode the original image once, to be shared between the filters
+            shared_source = SharedSourceImage.open(
+                self,
+                filters,
+                source=File(BytesIO(original_image_bytes), name=self.file.name),
+            )
+
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=get_rendition_workers()
+            ) as executor:
+                for future in concurrent.futures.as_completed(
+                    executor.submit(
+                        self.generate_rendition_instance,
+                        filter,
+                        BytesIO(original_image_bytes),
+                        shared_source=shared_source,
+                    )
+                    for filter in filters
+                ):
+                    to_create.append(future.result())
 
         # Rendition generation can take a while. So, if other processes have created
         # identical renditions in the meantime, we should find them to avoid clashes.
@@ -765,7 +948,10 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         return return_value
 
     def generate_rendition_instance(
-        self, filter: Filter, source: BytesIO
+        self,
+        filter: Filter,
+        source: BytesIO,
+        shared_source: SharedSourceImage = None,
     ) -> AbstractRendition:
         """
         Use the supplied ``source`` image to create and return an
@@ -777,11 +963,19 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
             filter_spec=filter.spec,
             focal_point_key=filter.get_cache_key(self),
             file=self.generate_rendition_file(
-                filter, source=File(source, name=self.file.name)
+                filter,
+                source=File(source, name=self.file.name),
+                shared_source=shared_source,
             ),
         )
 
-    def generate_rendition_file(self, filter: Filter, *, source: File = None) -> File:
+    def generate_rendition_file(
+        self,
+        filter: Filter,
+        *,
+        source: File = None,
+        shared_source: SharedSourceImage = None,
+    ) -> File:
         """
         Generates an in-memory image matching the supplied ``filter`` value
         and focal point value from this object, wraps it in a ``File`` object
@@ -793,6 +987,11 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         ``source`` keyword can be used to provide a reference to the in-memory
         ``File``, bypassing the need to reload the image contents from storage.
 
+        When generating several renditions of this image, the ``shared_source``
+        keyword can be used to provide a ``SharedSourceImage``, so that the
+        original image is only decoded once. It is ignored for ``Filter``
+        subclasses that override ``run()``.
+
         NOTE: The responsibility of generating the new image from the original
         falls to the supplied ``filter`` object. If you want to do anything
         custom with rendition images (for example, to preserve metadata from
@@ -811,11 +1010,11 @@ class AbstractImage(ImageFileMixin, CollectionMember, index.Indexed, models.Mode
         start_time = time.time()
 
         try:
-            generated_image = filter.run(
-                self,
-                SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE),
-                source=source,
-            )
+            output = SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+            if shared_source is not None and type(filter).run is Filter.run:
+                generated_image = filter.run(self, output, shared_source=shared_source)
+            else:
+                generated_image = filter.run(self, output, source=source)
 
             logger.debug(
                 "Generated '%s' rendition for image %d in %.1fms",
@@ -902,6 +1101,135 @@ class Image(AbstractImage):
         ]
 
 
+class SharedSourceImage:
+    """
+    An original image that has been decoded and auto-oriented once, to be shared
+    between several filters (see ``Filter.run()``) when generating multiple
+    renditions of the same image.
+
+    Filters that shrink the image a lot are run on a downscaled copy of the
+    original, rather than on the full size bitmap. JPEG files are decoded at a
+    reduced size up front (using Pillow's draft mode) when none of the filters
+    need the full size image.
+    """
+
+    # The smallest ratio between the size of a downscaled copy and the size of
+    # a rendition generated from it, to preserve the quality of the final resize
+    minimum_downscale_ratio = 2
+
+    # The factors that the original image can be downscaled by
+    downscale_factors = (8, 4, 2)
+
+    def __init__(self, willow_image, original_format, original_size):
+        self.willow_image = willow_image
+        self.original_format = original_format
+        self.original_size = original_size
+        self._downscaled = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, image: AbstractImage, filters, source: File = None):
+        """
+        Decode and auto-orient the original image once, to be used for all of
+        the given ``filters``. Returns ``None`` if the decoded image cannot be
+        shared between filters (for example, SVG images), in which case each
+        filter should be run on the original file separately.
+        """
+        from PIL import ExifTags, ImageOps
+        from PIL import Image as PILImage
+        from willow.plugins.pillow import PillowImage
+
+        with Filter().get_willow_image(image, source) as willow_image:
+            original_format = willow_image.format_name
+
+            if original_format == "jpeg":
+                willow_image.f.seek(0)
+                pillow_image = PILImage.open(willow_image.f)
+
+                # Find the size of the auto-oriented image without decoding it
+                # (orientations 5 to 8 rotate the image by 90 degrees)
+                original_size = pillow_image.size
+                orientation = pillow_image.getexif().get(ExifTags.Base.Orientation)
+                if orientation in (5, 6, 7, 8):
+                    original_size = original_size[::-1]
+
+                # Decode the image at the smallest size that all the filters
+                # can be generated from
+                scale = max(
+                    cls.get_required_scale(filter.get_transform(image, original_size))
+                    for filter in filters
+                )
+                pillow_image.draft(
+                    pillow_image.mode,
+                    (
+                        math.ceil(pillow_image.width * scale),
+                        math.ceil(pillow_image.height * scale),
+                    ),
+                )
+                willow_image = PillowImage(ImageOps.exif_transpose(pillow_image))
+            else:
+                willow_image = willow_image.auto_orient()
+                if not isinstance(willow_image, PillowImage):
+                    return None
+                original_size = willow_image.get_size()
+
+        return cls(willow_image, original_format, original_size)
+
+    @classmethod
+    def get_required_scale(cls, transform: ImageTransform) -> float:
+        """
+        Return the smallest scale, relative to the original image, that the
+        rendition for ``transform`` can be generated from without losing quality.
+        """
+        rect = transform.get_rect()
+        if not rect.width or not rect.height:
+            return 1
+
+        return min(
+            1,
+            max(
+                transform.size[0] / rect.width,
+                transform.size[1] / rect.height,
+            )
+            * cls.minimum_downscale_ratio,
+        )
+
+    def get_willow_image_for(self, transform: ImageTransform):
+        """
+        Return the image that the rendition for ``transform`` should be generated
+        from, along with the region of it that should be cropped.
+        """
+        required_scale = self.get_required_scale(transform)
+        scale = self.willow_image.image.width / self.original_size[0]
+        willow_image = self.willow_image
+        for factor in self.downscale_factors:
+            if scale / factor >= required_scale:
+                willow_image = self.get_downscaled_willow_image(factor)
+                break
+
+        # Map the region of the original image onto the image being used
+        rect = transform.get_rect()
+        scale_x = willow_image.image.width / self.original_size[0]
+        scale_y = willow_image.image.height / self.original_size[1]
+        if scale_x != 1 or scale_y != 1:
+            rect = Rect(
+                rect.left * scale_x,
+                rect.top * scale_y,
+                rect.right * scale_x,
+                rect.bottom * scale_y,
+            )
+        return willow_image, rect
+
+    def get_downscaled_willow_image(self, factor: int):
+        # Filters may be run in several threads at once
+        with self._lock:
+            if factor not in self._downscaled:
+                self._downscaled[factor] = type(self.willow_image)(
+                    self.willow_image.image.reduce(factor)
+                )
+            return self._downscaled[factor]
+
+
 class Filter:
     """
     Represents one or more operations that can be applied to an Image to produce a rendition
@@ -1011,7 +1339,25 @@ class Filter:
             with image.get_willow_image() as willow_image:
                 yield willow_image
 
-    def run(self, image: AbstractImage, output: BytesIO, source: File = None):
+    @contextmanager
+    def get_transformed_willow_image(
+        self,
+        image: AbstractImage,
+        source: File = None,
+        shared_source: SharedSourceImage = None,
+    ):
+        """
+        Yields the original image, auto-oriented, cropped and resized according
+        to the transform operations of this filter, along with its original format.
+        """
+        if shared_source is not None:
+            transform = self.get_transform(image, shared_source.original_size)
+            willow, rect = shared_source.get_willow_image_for(transform)
+            willow = willow.crop(rect.round())
+            willow = willow.resize(transform.size)
+            yield willow, shared_source.original_format
+            return
+
         with self.get_willow_image(image, source) as willow:
             original_format = willow.format_name
 
@@ -1025,6 +1371,26 @@ class Filter:
             willow = willow.crop(transform.get_rect().round())
             willow = willow.resize(transform.size)
 
+            yield willow, original_format
+
+    def run(
+        self,
+        image: AbstractImage,
+        output: BytesIO,
+        source: File = None,
+        shared_source: SharedSourceImage = None,
+    ):
+        """
+        Generates the image for this filter and saves it to ``output``.
+
+        If a ``shared_source`` is given (see ``SharedSourceImage.open()``), the
+        original image that it has already decoded is used, rather than
+        decoding the original image again.
+        """
+        with self.get_transformed_willow_image(image, source, shared_source) as (
+            willow,
+            original_format,
+        ):
             # Apply filters
             env = {
                 "original-format": original_format,
@@ -1281,8 +1647,13 @@ class AbstractRendition(ImageFileMixin, models.Model):
 
     wagtail_reference_index_ignore = True
 
+    # Set on placeholder renditions returned by ``AbstractImage.get_deferred_rendition()``
+    deferred_url = None
+
     @property
     def url(self):
+        if self.deferred_url is not None:
+            return self.deferred_url
         return self.file.url
 
     @property
@@ -1433,3 +1804,74 @@ class Rendition(AbstractRendition):
 
     class Meta:
         unique_together = (("image", "filter_spec", "focal_point_key"),)
+
+
+class RenditionJob(models.Model):
+    """
+    A rendition that has been requested through ``AbstractImage.get_deferred_rendition()``
+    and is waiting to be generated by the ``wagtail_process_rendition_jobs`` management
+    command. Jobs are stored in the database, so that identical requests made by
+    different processes are only queued once.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    object_id = models.CharField(max_length=255, verbose_name=_("object id"))
+    filter_spec = models.CharField(max_length=255)
+    focal_point_key = models.CharField(max_length=16, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = _("rendition job")
+        verbose_name_plural = _("rendition jobs")
+        unique_together = [
+            ("content_type", "object_id", "filter_spec", "focal_point_key")
+        ]
+
+    @classmethod
+    def enqueue(cls, image: AbstractImage, *filters: Filter) -> None:
+        """
+        Queue jobs to generate renditions of ``image`` for the given filters,
+        ignoring any that are already queued.
+        """
+        content_type = ContentType.objects.get_for_model(image)
+        cls.objects.bulk_create(
+            [
+                cls(
+                    content_type=content_type,
+                    object_id=str(image.pk),
+                    filter_spec=filter.spec,
+                    focal_point_key=filter.get_cache_key(image),
+                )
+                for filter in filters
+            ],
+            ignore_conflicts=True,
+        )
+
+    @classmethod
+    def claim(cls, limit: int, stale_after: int = 600) -> list[RenditionJob]:
+        """
+        Claim up to ``limit`` jobs for processing by the current worker and return
+        them. Jobs claimed more than ``stale_after`` seconds ago are assumed to have
+        failed or been abandoned, and may be claimed again.
+        """
+        now = timezone.now()
+        available = Q(claimed_at__isnull=True) | Q(
+            claimed_at__lt=now - timedelta(seconds=stale_after)
+        )
+        claimed = []
+        for job in cls.objects.filter(available).order_by("created_at", "pk")[:limit]:
+            # Conditionally update each job, so that only one worker can claim it
+            if (
+                cls.objects.filter(available, pk=job.pk).update(
+                    claimed_at=now, attempts=models.F("attempts") + 1
+                )
+                == 1
+            ):
+                job.claimed_at = now
+                job.attempts += 1
+                claimed.append(job)
+        return claimed
@@ -0,0 +1,211 @@
+import copy
+from collections import defaultdict
+
+from asgiref.local import Local
+from django.apps import apps
+from django.db.models import Q
+
+_active = Local()
+
+
+class RenditionResolver:
+    """
+    Finds the renditions needed while rendering a response in bulk, rather than
+    one image at a time.
+
+    While a resolver is active (see ``RenditionResolverMiddleware``), images look
+    up their renditions through it. Each lookup also resolves any other
+    renditions that have been declared with ``add()`` and not resolved yet,
+    with a single cache lookup and a single database query across all of them.
+    Renditions are then kept for the rest of the render, so requesting the same
+    rendition of the same image again (such as from another block or snippet
+    that refers to it) doesn't need any further queries.
+    """
+
+    def __init__(self):
+        # Renditions found so far, keyed by (rendition model, image ID, filter
+        # spec, focal point key). A value of None means the rendition doesn't exist
+        self.renditions = {}
+        # Renditions declared with add() that haven't been looked up yet, with
+        # the image instance and filter needed to look them up
+        self.pending = {}
+        # Renditions that may exist for image IDs and filter specs declared with
+        # add_for_image_ids(), with the focal point key not known until they are used
+        self.pending_ids = defaultdict(set)
+        self.resolved_ids = set()
+        # The (rendition model, image ID, filter spec) of each rendition used
+        self.used = set()
+
+    def __enter__(self):
+        self._old_resolver = getattr(_active, "value", None)
+        activate(self)
+        return self
+
+    def __exit__(self, type, value, traceback):
+        if self._old_resolver:
+            activate(self._old_resolver)
+        else:
+            deactivate()
+
+    @staticmethod
+    def get_key(image, filter):
+        return (
+            image.get_rendition_model(),
+            image.pk,
+            filter.spec,
+            filter.get_cache_key(image),
+        )
+
+    def add(self, image, *filters):
+        """
+        Declare that the given renditions of ``image`` will be needed, so that
+        they are looked up along with any other renditions the next time one is
+        needed.
+        """
+        from wagtail.images.models import Filter
+
+        for filter in filters:
+            if isinstance(filter, str):
+                filter = Filter(spec=filter)
+            key = self.get_key(image, filter)
+            if key not in self.renditions:
+                self.pending[key] = (image, filter)
+
+    def add_for_image_ids(self, rendition_model, image_ids_and_specs):
+        """
+        Like ``add()``, but takes ``(image ID, filter spec)`` pairs, for when the
+        images haven't been fetched.
+        """
+        for image_id, spec in image_ids_and_specs:
+            if (rendition_model, image_id, spec) not in self.resolved_ids:
+                self.pending_ids[rendition_model].add((image_id, spec))
+
+    def resolve(self):
+        """
+        Look up all the pending renditions, in the cache and then the database.
+        """
+        if not self.pending and not self.pending_ids:
+            return
+
+        pending = self.pending
+        pending_ids = self.pending_ids
+        self.pending = {}
+        self.pending_ids = defaultdict(set)
+
+        # Query the cache first. All rendition models share the same cache backend
+        cache_keys = {}
+        for key, (image, filter) in pending.items():
+            rendition_model, _, spec, focal_point_key = key
+            cache_keys[
+                rendition_model.construct_cache_key(image, focal_point_key, spec)
+            ] = key
+
+        if cache_keys:
+            cache_backend = next(iter(pending))[0].cache_backend
+            for cache_key, rendition in cache_backend.get_many(
+                list(cache_keys)
+            ).items():
+                # to prevent writing of cached data back to the cache
+                rendition._from_cache = True
+                self.renditions[cache_keys[cache_key]] = rendition
+                del pending[cache_keys[cache_key]]
+
+        # For items not found in the cache, look in the database
+        lookups = defaultdict(Q)
+        for rendition_model, image_id, spec, focal_point_key in pending:
+            lookups[rendition_model] |= Q(
+                image_id=image_id, filter_spec=spec, focal_point_key=focal_point_key
+            )
+        for rendition_model, image_ids_and_specs in pending_ids.items():
+            for image_id, spec in image_ids_and_specs:
+                lookups[rendition_model] |= Q(image_id=image_id, filter_spec=spec)
+                self.resolved_ids.add((rendition_model, image_id, spec))
+
+        for rendition_model, lookup_q in lookups.items():
+            for rendition in rendition_model.objects.filter(lookup_q):
+                key = (
+                    rendition_model,
+                    rendition.image_id,
+                    rendition.filter_spec,
+                    rendition.focal_point_key,
+                )
+                self.renditions.setdefault(key, rendition)
+
+        # Anything not found doesn't exist, so doesn't need to be looked up again
+        for key in pending:
+            self.renditions.setdefault(key, None)
+
+    def find(self, image, filters):
+        """
+        Return a dictionary of the existing renditions of ``image`` for the given
+        ``filters``, keyed by filter, as ``AbstractImage.find_existing_renditions()``
+        does.
+        """
+        self.add(image, *filters)
+        self.resolve()
+
+        found = {}
+        for filter in filters:
+            key = self.get_key(image, filter)
+            self.used.add(key[:3])
+            rendition = self.renditions.get(key)
+            if rendition is not None:
+                # The rendition needs to be associated with the current image
+                # instance, so that any locally-set properties such as
+                # contextual_alt_text are respected
+                rendition = copy.copy(rendition)
+                rendition.image = image
+                found[filter] = rendition
+        return found
+
+    def add_rendition(self, image, rendition):
+        """
+        Keep a newly-created rendition of ``image``, to be reused if it is
+        requested again.
+        """
+        key = (
+            image.get_rendition_model(),
+            image.pk,
+            rendition.filter_spec,
+            rendition.focal_point_key,
+        )
+        self.renditions[key] = rendition
+        self.pending.pop(key, None)
+        self.used.add(key[:3])
+
+    def get_manifest(self):
+        """
+        Return the renditions used so far, in a form that can be stored in the
+        cache and passed to ``add_from_manifest()``.
+        """
+        return sorted(
+            (rendition_model._meta.label_lower, image_id, spec)
+            for rendition_model, image_id, spec in self.used
+        )
+
+    def add_from_manifest(self, manifest):
+        """
+        Declare that the renditions returned by ``get_manifest()`` for an
+        earlier render will be needed.
+        """
+        for label, image_id, spec in manifest:
+            try:
+                rendition_model = apps.get_model(label)
+            except LookupError:
+                continue
+            self.add_for_image_ids(rendition_model, [(image_id, spec)])
+
+
+def activate(resolver):
+    _active.value = resolver
+
+
+def deactivate():
+    del _active.value
+
+
+def get_rendition_resolver():
+    """
+    Return the active ``RenditionResolver``, or ``None`` if there isn't one.
+    """
+    return getattr(_active, "value", None)
@@ -1,3 +1,5 @@
+from django.conf import settings
+
 from wagtail.images.models import SourceImageIOError
 
 
@@ -10,6 +12,8 @@ def get_rendition_or_not_found(image, specs):
     :return: Rendition
     """
     try:
+        if getattr(settings, "WAGTAILIMAGES_DEFER_RENDITIONS", False):
+            return image.get_deferred_rendition(specs)
         return image.get_rendition(specs)
     except SourceImageIOError:
         # Image file is (probably) missing from /media/original_images - generate a dummy
@@ -32,6 +36,8 @@ def get_renditions_or_not_found(image, specs):
     :param specs: iterable of str or Filter
     """
     try:
+        if getattr(settings, "WAGTAILIMAGES_DEFER_RENDITIONS", False):
+            return image.get_deferred_renditions(*specs)
         return image.get_renditions(*specs)
     except SourceImageIOError:
         Rendition = image.renditions.model
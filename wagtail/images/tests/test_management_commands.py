@@ -1,11 +1,14 @@
 import re
 import warnings
 from io import StringIO
+from unittest import mock
 
+from django.contrib.contenttypes.models import ContentType
 from django.core import management
 from django.test import TestCase, override_settings
 
 from ..management.commands.wagtail_update_image_renditions import progress_bar
+from ..models import RenditionJob
 from .utils import Image, get_test_image_file
 
 # note .utils.Image already does get_image_model()
@@ -91,11 +94,12 @@ class TestUpdateImageRenditions(TestCase):
         output = self.run_command()
         output_string = self.REAESC.sub("", output.read())
         # checking if the number of renditions regenerated equal total_renditions
-        self.assertEqual(
+        self.assertRegex(
             output_string,
-            f"Regenerating {total_renditions} rendition(s)\n"
-            f"Progress: [------------------------------------------------->] 100%\n"
-            f"Successfully processed {total_renditions} rendition(s)\n",
+            rf"^Regenerating {total_renditions} rendition\(s\)\n"
+            r"Progress: \[------------------------------------------------->\] 100%\n"
+            rf"Successfully processed {total_renditions} rendition\(s\)\n"
+            r"Throughput: \d+\.\d rendition\(s\) per second\n$",
         )
 
         # checking if the number of renditions now equal total_renditions
@@ -138,3 +142,106 @@ class TestUpdateImageRenditions(TestCase):
         self.assertIn(
             f"Successfully processed {total_renditions} rendition(s)\n", output_string
         )
+
+    def test_image_renditions_with_workers(self):
+        Rendition.objects.create(
+            image=self.image,
+            filter_spec="fill-100x100",
+            focal_point_key="",
+            width=100,
+            height=100,
+            file=get_test_image_file(
+                filename="test_rendition.png", colour="white", size=(100, 100)
+            ),
+        )
+        old_ids = set(Rendition.objects.values_list("id", flat=True))
+
+        output = self.run_command(workers=2, chunk_size=1)
+        output_string = self.REAESC.sub("", output.read())
+        self.assertIn("Regenerating 2 rendition(s)\n", output_string)
+        self.assertIn("Successfully processed 2 rendition(s)\n", output_string)
+        self.assertIn("rendition(s) per second\n", output_string)
+
+        # All renditions have been replaced with newly generated ones
+        renditions = Rendition.objects.filter(image=self.image)
+        self.assertEqual(
+            {r.filter_spec for r in renditions}, {"original", "fill-100x100"}
+        )
+        self.assertFalse(old_ids & {r.id for r in renditions})
+        fill = renditions.get(filter_spec="fill-100x100")
+        self.assertEqual((fill.width, fill.height), (100, 100))
+        original = renditions.get(filter_spec="original")
+        self.assertEqual((original.width, original.height), (640, 480))
+
+
+class TestProcessRenditionJobs(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(filename="test_image.png"),
+        )
+
+    def run_command(self, **options):
+        output = StringIO()
+        management.call_command(
+            "wagtail_process_rendition_jobs",
+            stdout=output,
+            stderr=StringIO(),
+            **options,
+        )
+        return output.getvalue()
+
+    def test_process_jobs(self):
+        self.image.get_deferred_renditions("width-100", "fill-50x50")
+
+        output = self.run_command()
+
+        self.assertIn("Successfully processed 2 rendition job(s)", output)
+        self.assertFalse(RenditionJob.objects.exists())
+        self.assertEqual(
+            set(self.image.renditions.values_list("filter_spec", flat=True)),
+            {"width-100", "fill-50x50"},
+        )
+
+        # Renditions are now returned directly
+        rendition = self.image.get_deferred_rendition("width-100")
+        self.assertIsNone(rendition.deferred_url)
+        self.assertFalse(RenditionJob.objects.exists())
+
+    def test_jobs_for_deleted_images_are_discarded(self):
+        self.image.get_deferred_rendition("width-100")
+        self.image.delete()
+
+        output = self.run_command()
+
+        self.assertIn("Successfully processed 0 rendition job(s)", output)
+        self.assertFalse(RenditionJob.objects.exists())
+
+    def test_invalid_jobs_are_discarded(self):
+        RenditionJob.objects.create(
+            content_type=ContentType.objects.get_for_model(Image),
+            object_id=str(self.image.pk),
+            filter_spec="bogus-100",
+        )
+
+        self.run_command()
+
+        self.assertFalse(RenditionJob.objects.exists())
+        self.assertFalse(self.image.renditions.exists())
+
+    def test_failing_jobs_are_retried(self):
+        self.image.get_deferred_rendition("width-100")
+
+        with mock.patch.object(
+            Image, "get_renditions", side_effect=RuntimeError("oops")
+        ):
+            self.run_command(max_attempts=2)
+            job = RenditionJob.objects.get()
+            self.assertEqual(job.attempts, 1)
+
+            # The job is not retried until its claim has expired
+            self.run_command(max_attempts=2)
+            self.assertEqual(RenditionJob.objects.get().attempts, 1)
+
+            self.run_command(max_attempts=2, retry_after=-1)
+            self.assertFalse(RenditionJob.objects.exists())
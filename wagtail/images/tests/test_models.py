@@ -1,26 +1,46 @@
 import unittest
+from io import BytesIO
+from unittest import mock
 
+import PIL.ExifTags
+import PIL.Image
 from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.core.cache import caches
 from django.core.files import File
+from django.core.files.images import ImageFile
 from django.core.files.storage import Storage, default_storage, storages
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db.models import Prefetch
 from django.db.utils import IntegrityError
-from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
-from django.urls import reverse
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory,
+    SimpleTestCase,
+    TestCase,
+    TransactionTestCase,
+    override_settings,
+)
+from django.urls import NoReverseMatch, reverse
 from willow.image import Image as WillowImage
 
+from wagtail.images.middleware import RenditionResolverMiddleware
 from wagtail.images.models import (
     Filter,
     Picture,
     Rendition,
+    RenditionJob,
     ResponsiveImage,
+    SharedSourceImage,
     SourceImageIOError,
     get_rendition_storage,
 )
 from wagtail.images.rect import Rect
+from wagtail.images.rendition_resolver import (
+    RenditionResolver,
+    get_rendition_resolver,
+)
+from wagtail.images.views.serve import generate_image_url
 from wagtail.models import Collection, GroupCollectionPermission, Page, ReferenceIndex
 from wagtail.test.testapp.models import (
     EventPage,
@@ -764,6 +784,26 @@ class TestRenditions(TestCase):
         # But, we should see equality on the keys
         self.assertEqual(third_result.keys(), result.keys())
 
+    @override_settings(WAGTAILIMAGES_RENDITION_EXECUTOR="process")
+    def test_create_renditions_with_process_executor(self):
+        filter_list = [Filter(spec) for spec in self.SPECS]
+        with self.assertNumQueries(2):
+            result = self.image.create_renditions(*filter_list)
+
+        self.assertEqual(
+            {filter.spec for filter in result.keys()},
+            {filter.spec for filter in filter_list},
+        )
+        for filter, rendition in result.items():
+            self.assertEqual(filter.spec, rendition.filter_spec)
+            self.assertEqual(
+                rendition.focal_point_key, filter.get_cache_key(self.image)
+            )
+
+        width_400 = result[filter_list[self.SPECS.index("width-400")]]
+        self.assertEqual(width_400.width, 400)
+        self.assertTrue(width_400.file.storage.exists(width_400.file.name))
+
     def test_alt_attribute(self):
         rendition = self.image.get_rendition("width-400")
         self.assertEqual(rendition.alt, "Test image")
@@ -913,6 +953,155 @@ class TestRenditions(TestCase):
         )
 
 
+class TestSharedSourceImage(TestCase):
+    def get_image(self, file):
+        return Image.objects.create(title="Test image", file=file)
+
+    def get_jpeg_file(self, size, orientation=None):
+        f = BytesIO()
+        exif = PIL.Image.Exif()
+        if orientation:
+            exif[PIL.ExifTags.Base.Orientation] = orientation
+        PIL.Image.new("RGB", size, "white").save(f, "JPEG", exif=exif)
+        return ImageFile(f, name="test.jpg")
+
+    def test_jpeg_decoded_at_reduced_size(self):
+        image = self.get_image(self.get_jpeg_file((2000, 1000)))
+        filters = [Filter("width-100"), Filter("width-200")]
+        shared_source = SharedSourceImage.open(image, filters)
+
+        self.assertEqual(shared_source.original_format, "jpeg")
+        self.assertEqual(shared_source.original_size, (2000, 1000))
+        # The largest rendition needs at least 400x200, so the JPEG is
+        # decoded at a quarter of its size
+        self.assertEqual(shared_source.willow_image.get_size(), (500, 250))
+
+    def test_jpeg_decoded_at_full_size_when_required(self):
+        image = self.get_image(self.get_jpeg_file((2000, 1000)))
+        filters = [Filter("width-100"), Filter("original")]
+        shared_source = SharedSourceImage.open(image, filters)
+        self.assertEqual(shared_source.willow_image.get_size(), (2000, 1000))
+
+    def test_jpeg_orientation(self):
+        image = self.get_image(self.get_jpeg_file((2000, 1000), orientation=6))
+        shared_source = SharedSourceImage.open(image, [Filter("height-100")])
+        self.assertEqual(shared_source.original_size, (1000, 2000))
+        self.assertEqual(shared_source.willow_image.get_size(), (125, 250))
+
+    def test_downscaled_copy(self):
+        image = self.get_image(get_test_image_file(size=(2000, 1000)))
+        shared_source = SharedSourceImage.open(image, [Filter("width-100")])
+        self.assertEqual(shared_source.willow_image.get_size(), (2000, 1000))
+
+        willow_image, rect = shared_source.get_willow_image_for(
+            Filter("fill-100x100").get_transform(image, (2000, 1000))
+        )
+        # The 1000x1000 crop is resized to a tenth of its size, so the
+        # image is downscaled by a factor of 4
+        self.assertEqual(willow_image.get_size(), (500, 250))
+        self.assertEqual(rect, Rect(125, 0, 375, 250))
+
+        willow_image, rect = shared_source.get_willow_image_for(
+            Filter("width-1000").get_transform(image, (2000, 1000))
+        )
+        self.assertIs(willow_image, shared_source.willow_image)
+        self.assertEqual(rect, Rect(0, 0, 2000, 1000))
+
+    def test_svg_is_not_shared(self):
+        image = self.get_image(get_test_image_file_svg())
+        self.assertIsNone(SharedSourceImage.open(image, [Filter("width-50")]))
+
+    def test_create_renditions_decodes_once(self):
+        image = self.get_image(self.get_jpeg_file((2000, 1000)))
+        filters = [Filter(spec) for spec in ("width-100", "width-400", "fill-50x50")]
+
+        with mock.patch.object(
+            Filter,
+            "get_willow_image",
+            autospec=True,
+            side_effect=Filter.get_willow_image,
+        ) as get_willow_image:
+            renditions = image.create_renditions(*filters)
+
+        get_willow_image.assert_called_once()
+        self.assertEqual(
+            {
+                filter.spec: (rendition.width, rendition.height)
+                for filter, rendition in renditions.items()
+            },
+            {"width-100": (100, 50), "width-400": (400, 200), "fill-50x50": (50, 50)},
+        )
+
+
+class TestDeferredRenditions(TestCase):
+    def setUp(self):
+        self.image = Image.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+
+    def test_existing_rendition_is_returned(self):
+        rendition = self.image.get_rendition("width-400")
+        deferred = self.image.get_deferred_rendition("width-400")
+        self.assertEqual(deferred, rendition)
+        self.assertIsNone(deferred.deferred_url)
+        self.assertFalse(RenditionJob.objects.exists())
+
+    def test_missing_rendition_is_queued(self):
+        rendition = self.image.get_deferred_rendition("fill-100x50")
+
+        # Nothing has been generated yet
+        self.assertIsNone(rendition.pk)
+        self.assertFalse(self.image.renditions.exists())
+
+        # The placeholder has the expected dimensions, and a URL for the serve view
+        self.assertEqual((rendition.width, rendition.height), (100, 50))
+        self.assertEqual(rendition.url, generate_image_url(self.image, "fill-100x50"))
+        self.assertIn(f'src="{rendition.url}"', rendition.img_tag())
+
+        job = RenditionJob.objects.get()
+        self.assertEqual(job.object_id, str(self.image.pk))
+        self.assertEqual(job.filter_spec, "fill-100x50")
+        self.assertEqual(job.focal_point_key, "2e16d0ba")
+
+    def test_identical_requests_are_queued_once(self):
+        self.image.get_deferred_renditions("width-100", "width-200")
+        self.image.get_deferred_renditions("width-200", "width-300")
+        self.assertEqual(
+            sorted(RenditionJob.objects.values_list("filter_spec", flat=True)),
+            ["width-100", "width-200", "width-300"],
+        )
+
+    def test_placeholder_url_is_served(self):
+        rendition = self.image.get_deferred_rendition("width-100")
+        response = self.client.get(rendition.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(self.image.renditions.filter(filter_spec="width-100").exists())
+
+    def test_renditions_generated_without_serve_view(self):
+        with mock.patch(
+            "wagtail.images.views.serve.generate_image_url",
+            side_effect=NoReverseMatch,
+        ):
+            rendition = self.image.get_deferred_rendition("width-100")
+        self.assertIsNotNone(rendition.pk)
+        self.assertIsNone(rendition.deferred_url)
+        self.assertFalse(RenditionJob.objects.exists())
+
+    def test_claim(self):
+        self.image.get_deferred_renditions("width-100", "width-200")
+        first = RenditionJob.claim(limit=1)
+        self.assertEqual([job.filter_spec for job in first], ["width-100"])
+        self.assertEqual(first[0].attempts, 1)
+
+        second = RenditionJob.claim(limit=10)
+        self.assertEqual([job.filter_spec for job in second], ["width-200"])
+        self.assertEqual(RenditionJob.claim(limit=10), [])
+
+        # Abandoned jobs can be claimed again
+        self.assertEqual(len(RenditionJob.claim(limit=10, stale_after=-1)), 2)
+
+
 @override_settings(
     CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
 )
@@ -971,6 +1160,140 @@ class TestPrefetchRenditions(TestCase):
         self.assertListEqual(self.large_renditions, large_renditions)
 
 
+@override_settings(
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "renditions": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+)
+class TestRenditionResolver(TestCase):
+    def setUp(self):
+        self.images = [
+            Image.objects.create(
+                title=f"Test image {i}",
+                file=get_test_image_file(),
+            )
+            for i in range(3)
+        ]
+        for image in self.images:
+            image.get_rendition("max-100x100")
+            image.get_rendition("width-50")
+        caches["renditions"].clear()
+
+    def tearDown(self):
+        caches["renditions"].clear()
+
+    def test_resolve_declared_renditions_together(self):
+        with RenditionResolver() as resolver:
+            for image in self.images:
+                resolver.add(image, "max-100x100", "width-50")
+
+            # One query to find all six renditions
+            with self.assertNumQueries(1):
+                renditions = [
+                    image.get_renditions("max-100x100", "width-50")
+                    for image in self.images
+                ]
+
+        for image, image_renditions in zip(self.images, renditions):
+            self.assertEqual(len(image_renditions), 2)
+            self.assertEqual(image_renditions["max-100x100"].image, image)
+
+    def test_resolve_from_cache(self):
+        for image in self.images:
+            image.get_rendition("max-100x100")
+
+        with RenditionResolver() as resolver:
+            for image in self.images:
+                resolver.add(image, "max-100x100")
+
+            with self.assertNumQueries(0):
+                renditions = [
+                    image.get_rendition("max-100x100") for image in self.images
+                ]
+
+        self.assertEqual([r.image for r in renditions], self.images)
+
+    def test_reuse_rendition_for_other_instance_of_image(self):
+        with RenditionResolver():
+            with self.assertNumQueries(1):
+                self.images[0].get_rendition("max-100x100")
+
+            image = Image.objects.get(pk=self.images[0].pk)
+            with self.assertNumQueries(0):
+                rendition = image.get_rendition("max-100x100")
+
+        # The rendition is associated with the instance it was requested from
+        self.assertIs(rendition.image, image)
+
+    def test_reuse_created_rendition(self):
+        with RenditionResolver():
+            rendition = self.images[0].get_rendition("fill-20x20")
+            with self.assertNumQueries(0):
+                self.assertEqual(
+                    self.images[0].get_rendition("fill-20x20").pk, rendition.pk
+                )
+
+    def test_no_resolver_outside_context(self):
+        with RenditionResolver() as resolver:
+            self.assertIs(get_rendition_resolver(), resolver)
+        self.assertIsNone(get_rendition_resolver())
+
+    def test_middleware_uses_manifest_from_previous_request(self):
+        def get_response(request):
+            for image in Image.objects.filter(
+                pk__in=[image.pk for image in self.images]
+            ).order_by("pk"):
+                image.get_rendition("max-100x100")
+            return HttpResponse()
+
+        middleware = RenditionResolverMiddleware(get_response)
+        request = RequestFactory().get("/some/page/")
+
+        # One query for the images, and one for each rendition
+        with self.assertNumQueries(4):
+            middleware(request)
+
+        caches["renditions"].delete_many(
+            [
+                rendition.get_cache_key()
+                for rendition in Rendition.objects.filter(image__in=self.images)
+            ]
+        )
+
+        # One query for the images, and one for all renditions used last time
+        with self.assertNumQueries(2):
+            middleware(request)
+
+    def test_middleware_manifest_cache_key(self):
+        middleware = RenditionResolverMiddleware(HttpResponse)
+        request = RequestFactory().get("/" + "a very long path/" * 50)
+
+        cache_key = middleware.get_manifest_cache_key(request)
+
+        self.assertLess(len(cache_key), 250)
+        self.assertNotIn(" ", cache_key)
+        self.assertNotEqual(
+            cache_key,
+            middleware.get_manifest_cache_key(RequestFactory().get("/other/")),
+        )
+
+    def test_middleware_ignores_unsuccessful_responses(self):
+        def get_response(request):
+            self.images[0].get_rendition("max-100x100")
+            return HttpResponse(status=404)
+
+        middleware = RenditionResolverMiddleware(get_response)
+        request = RequestFactory().get("/missing/")
+        middleware(request)
+
+        self.assertIsNone(
+            caches["renditions"].get(middleware.get_manifest_cache_key(request))
+        )
+
+
 class TestUsageCount(TestCase):
     fixtures = ["test.json"]
 
@@ -606,6 +606,33 @@ class TestFrontendServeView(TestCase):
         )
         self.assertEqual(response["Cache-Control"], "max-age=3600, public")
 
+    def test_get_range(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+        url = reverse(
+            "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+        )
+        content = b"".join(self.client.get(url).streaming_content)
+
+        response = self.client.get(url, headers={"range": "bytes=0-7"})
+
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response["Content-Type"], "image/png")
+        self.assertEqual(response["Content-Range"], f"bytes 0-7/{len(content)}")
+        self.assertEqual(b"".join(response.streaming_content), content[:8])
+
+    def test_get_not_modified(self):
+        signature = generate_signature(self.image.id, "fill-800x600")
+        url = reverse(
+            "wagtailimages_serve", args=(signature, self.image.id, "fill-800x600")
+        )
+        response = self.client.get(url)
+        b"".join(response.streaming_content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+
+        response = self.client.get(url, headers={"if-none-match": response["ETag"]})
+
+        self.assertEqual(response.status_code, 304)
+
 
 class TestFrontendSendfileView(TestCase):
     def setUp(self):
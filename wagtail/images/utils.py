@@ -132,3 +132,13 @@ def to_svg_safe_spec(filter_specs):
         if any(x.startswith(prefix) for prefix in svg_preserving_specs)
     ]
     return "|".join(safe_specs)
+
+
+def setup_rendition_worker():
+    """
+    Initialise a worker process used to generate image renditions, so that
+    Django is set up when the process was not forked from a configured one.
+    """
+    import django
+
+    django.setup()
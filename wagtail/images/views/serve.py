@@ -1,15 +1,17 @@
 from django.core.exceptions import ImproperlyConfigured, PermissionDenied
-from django.http import FileResponse, HttpResponse
+from django.http import HttpResponse
 from django.shortcuts import get_object_or_404, redirect
 from django.urls import reverse
 from django.utils.decorators import classonlymethod, method_decorator
 from django.views.decorators.cache import cache_control
 from django.views.generic import View
 
+from wagtail.coreutils import safe_md5
 from wagtail.images import get_image_model
 from wagtail.images.exceptions import InvalidFilterSpecError
 from wagtail.images.models import SourceImageIOError
 from wagtail.images.utils import generate_signature, verify_signature
+from wagtail.utils.file_response import serve_file
 from wagtail.utils.sendfile import sendfile
 
 
@@ -64,9 +66,19 @@ class ServeView(View):
         with rendition.get_willow_image() as willow_image:
             mime_type = willow_image.mime_type
 
-        # Serve the file
+        # Serve the file, supporting conditional and byte range requests.
+        # Rendition files aren't changed once created, so they are identified by
+        # the rendition and the file name
         rendition.file.open("rb")
-        return FileResponse(rendition.file, content_type=mime_type)
+        return serve_file(
+            self.request,
+            rendition.file,
+            mime_type,
+            etag=safe_md5(
+                f"{rendition.pk}:{rendition.file.name}".encode(),
+                usedforsecurity=False,
+            ).hexdigest(),
+        )
 
     def redirect(self, rendition):
         # Redirect to the file's public location
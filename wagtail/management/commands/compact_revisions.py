@@ -0,0 +1,93 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from wagtail.models import Revision
+from wagtail.models.revision_storage import encode_delta, get_keyframe_interval
+
+
+class Command(BaseCommand):
+    help = "Store the content of existing revisions as deltas against keyframes, or as full content with --full"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Store the full content of every revision, such as before changing WAGTAIL_REVISION_STORAGE back to 'full'",
+        )
+        parser.add_argument(
+            "--keyframe-interval",
+            type=int,
+            default=None,
+            help="Store the full content of one in this number of revisions of each object. Defaults to WAGTAIL_REVISION_KEYFRAME_INTERVAL",
+        )
+
+    def handle(self, *args, **options):
+        full = options["full"]
+        keyframe_interval = options["keyframe_interval"] or get_keyframe_interval()
+
+        object_count = 0
+        revision_count = 0
+
+        objects = (
+            Revision.objects.order_by()
+            .values_list("base_content_type_id", "object_id")
+            .distinct()
+        )
+        for base_content_type_id, object_id in objects.iterator():
+            revision_count += self.convert_revisions(
+                Revision.objects.filter(
+                    base_content_type_id=base_content_type_id, object_id=object_id
+                ),
+                keyframe_interval=1 if full else keyframe_interval,
+            )
+            object_count += 1
+
+        self.stdout.write(
+            "Converted %d revisions of %d objects" % (revision_count, object_count)
+        )
+
+    @transaction.atomic
+    def convert_revisions(self, revisions, keyframe_interval):
+        """
+        Store the content of ``revisions`` (which should all be revisions of the
+        same object) with a keyframe every ``keyframe_interval`` revisions, in the
+        order they were created. Returns the number of revisions changed.
+        """
+        revisions = list(
+            revisions.select_related("keyframe").order_by("created_at", "id")
+        )
+        # Load the content of every revision before any keyframes change
+        for revision in revisions:
+            revision.content  # noqa: B018
+
+        changed_count = 0
+        keyframe = None
+        revisions_since_keyframe = 0
+
+        for revision in revisions:
+            content_delta = None
+            if (
+                keyframe is not None
+                and revisions_since_keyframe < keyframe_interval - 1
+            ):
+                content_delta = encode_delta(keyframe.content, revision.content)
+
+            if content_delta is None:
+                keyframe = revision
+                revisions_since_keyframe = 0
+                if revision.keyframe_id is not None:
+                    Revision.objects.filter(pk=revision.pk).update(
+                        content=revision.content, keyframe=None, content_delta=None
+                    )
+                    changed_count += 1
+            else:
+                revisions_since_keyframe += 1
+                if revision.keyframe_id != keyframe.pk or (
+                    bytes(revision.content_delta) != content_delta
+                ):
+                    Revision.objects.filter(pk=revision.pk).update(
+                        content=None, keyframe=keyframe, content_delta=content_delta
+                    )
+                    changed_count += 1
+
+        return changed_count
@@ -1,14 +1,27 @@
+import time
+
+from django.apps import apps
 from django.conf import settings
 from django.core.management.base import BaseCommand
-from django.db.models import Q
-from django.db.models.deletion import ProtectedError
+from django.db import models, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.deletion import ProtectedError, RestrictedError
 from django.utils import timezone
 
-from wagtail.models import Revision, WorkflowState
+from wagtail.models import (
+    Comment,
+    DraftStateMixin,
+    Revision,
+    TaskState,
+    WorkflowState,
+)
+from wagtail.models.audit_log import BaseLogEntry
+
+DEFAULT_BATCH_SIZE = 1000
 
 
 class Command(BaseCommand):
-    help = "Delete revisions which are not the latest revision, published or scheduled to be published, or in moderation"
+    help = "Delete revisions which are not the latest revision, published or scheduled to be published, in moderation, or referenced by the audit log"
 
     def add_arguments(self, parser):
         parser.add_argument(
@@ -26,14 +39,51 @@ class Command(BaseCommand):
             action="store_true",
             help="Only delete revisions of non-page models",
         )
+        parser.add_argument(
+            "--delete-logged",
+            action="store_false",
+            dest="keep_logged",
+            help="Also delete revisions that are referenced by the audit log",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Count the revisions that would be deleted, without deleting them",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="The number of revisions to delete in each transaction",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="The number of seconds to wait between batches, to reduce the load on the database",
+        )
 
     def handle(self, *args, **options):
         days = options.get("days")
         pages = options.get("pages")
         non_pages = options.get("non_pages")
+        keep_logged = options.get("keep_logged")
+
+        if options.get("dry_run"):
+            revisions_count = get_purgeable_revisions(
+                days=days, pages=pages, non_pages=non_pages, keep_logged=keep_logged
+            ).count()
+            self.stdout.write("Would delete %d revisions" % revisions_count)
+            return
 
         revisions_deleted, protected_error_count = purge_revisions(
-            days=days, pages=pages, non_pages=non_pages
+            days=days,
+            pages=pages,
+            non_pages=non_pages,
+            keep_logged=keep_logged,
+            batch_size=options["batch_size"],
+            sleep=options["sleep"],
+            progress=self.write_progress if options["verbosity"] > 1 else None,
         )
 
         if revisions_deleted:
@@ -51,8 +101,39 @@ class Command(BaseCommand):
         else:
             self.stdout.write("No revisions deleted")
 
+    def write_progress(self, deleted_count, total_count):
+        self.stdout.write("Deleted %d of %d revisions" % (deleted_count, total_count))
+
+
+def get_protected_revisions_q():
+    """
+    Return a Q object matching revisions that can't be deleted, because another
+    object refers to them through a ``PROTECT`` or ``RESTRICT`` foreign key.
+    """
+    q = Q()
+    for relation in Revision._meta.related_objects:
+        if relation.on_delete not in (models.PROTECT, models.RESTRICT):
+            continue
+        if relation.related_model is Revision:
+            # Revisions stored as a delta against a revision are given a new
+            # keyframe before it's deleted
+            continue
+        q |= Exists(
+            relation.related_model._base_manager.filter(
+                **{relation.field.attname: OuterRef("pk")}
+            )
+        )
+    return q
+
 
-def purge_revisions(days=None, pages=True, non_pages=True):
+def get_purgeable_revisions(
+    days=None, pages=True, non_pages=True, keep_logged=True, protected=False
+):
+    """
+    Return a queryset of the revisions that can be purged, or with
+    ``protected=True``, of the revisions that would be purged if they weren't
+    protected from deletion by a foreign key.
+    """
     if pages == non_pages:
         # If both are True or both are False, purge revisions of pages and non-pages
         objects = Revision.objects.all()
@@ -62,32 +143,167 @@ def purge_revisions(days=None, pages=True, non_pages=True):
         objects = Revision.objects.not_page_revisions()
 
     purgeable_revisions = objects.exclude(
-        # and exclude revisions with an approved_go_live_at date
+        # exclude revisions with an approved_go_live_at date
         approved_go_live_at__isnull=False
+    ).filter(
+        # and the latest revision of each object
+        Exists(
+            Revision.objects.filter(
+                base_content_type_id=OuterRef("base_content_type_id"),
+                object_id=OuterRef("object_id"),
+            ).filter(
+                Q(created_at__gt=OuterRef("created_at"))
+                | Q(created_at=OuterRef("created_at"), pk__gt=OuterRef("pk"))
+            )
+        )
     )
 
+    # and the live revision of each object
+    for model in apps.get_models():
+        if (
+            issubclass(model, DraftStateMixin)
+            and model._meta.get_field("live_revision").model is model
+        ):
+            purgeable_revisions = purgeable_revisions.exclude(
+                Exists(model._base_manager.filter(live_revision_id=OuterRef("pk")))
+            )
+
     if getattr(settings, "WAGTAIL_WORKFLOW_ENABLED", True):
         purgeable_revisions = purgeable_revisions.exclude(
             # and exclude revisions linked to an in progress or needs changes workflow state
-            Q(task_states__workflow_state__status=WorkflowState.STATUS_IN_PROGRESS)
-            | Q(task_states__workflow_state__status=WorkflowState.STATUS_NEEDS_CHANGES)
+            Exists(
+                TaskState.objects.filter(
+                    revision_id=OuterRef("pk"),
+                    workflow_state__status__in=[
+                        WorkflowState.STATUS_IN_PROGRESS,
+                        WorkflowState.STATUS_NEEDS_CHANGES,
+                    ],
+                )
+            )
         )
 
+    if keep_logged:
+        for model in apps.get_models():
+            if issubclass(model, BaseLogEntry):
+                purgeable_revisions = purgeable_revisions.exclude(
+                    Exists(model._base_manager.filter(revision_id=OuterRef("pk")))
+                )
+
     if days:
         purgeable_until = timezone.now() - timezone.timedelta(days=days)
         # only include revisions which were created before the cut off date
         purgeable_revisions = purgeable_revisions.filter(created_at__lt=purgeable_until)
 
+    protected_q = get_protected_revisions_q()
+    if protected:
+        return (
+            purgeable_revisions.filter(protected_q) if protected_q else objects.none()
+        )
+    return (
+        purgeable_revisions.exclude(protected_q) if protected_q else purgeable_revisions
+    )
+
+
+def delete_revisions(revision_ids):
+    """
+    Delete the revisions with the given IDs, in a single transaction, doing the
+    same as ``Revision.delete()`` for each of them. Returns the number of
+    revisions deleted.
+    """
+    with transaction.atomic():
+        revisions = Revision.objects.filter(pk__in=revision_ids)
+
+        # Move comments created on these revisions to the next revision that
+        # isn't being deleted, as they may well still apply if they're unresolved
+        for revision in revisions.filter(
+            Exists(Comment.objects.filter(revision_created_id=OuterRef("pk")))
+        ):
+            next_revision = (
+                Revision.objects.filter(
+                    base_content_type_id=revision.base_content_type_id,
+                    object_id=revision.object_id,
+                )
+                .filter(
+                    Q(created_at__gt=revision.created_at)
+                    | Q(created_at=revision.created_at, pk__gt=revision.pk)
+                )
+                .exclude(pk__in=revision_ids)
+                .order_by("created_at", "pk")
+                .first()
+            )
+            if next_revision:
+                revision.created_comments.all().update(revision_created=next_revision)
+
+        # Give revisions that are stored as a delta against these revisions, but
+        # aren't being deleted, a new keyframe
+        for keyframe in Revision.objects.filter(
+            pk__in=Revision.objects.filter(keyframe_id__in=revision_ids)
+            .exclude(pk__in=revision_ids)
+            .values("keyframe_id")
+        ):
+            keyframe.detach_dependent_revisions(exclude_ids=revision_ids)
+
+        _, deleted_counts = revisions.delete()
+
+    return deleted_counts.get(Revision._meta.label, 0)
+
+
+def purge_revisions(
+    days=None,
+    pages=True,
+    non_pages=True,
+    keep_logged=True,
+    batch_size=DEFAULT_BATCH_SIZE,
+    sleep=0,
+    progress=None,
+):
+    """
+    Delete the purgeable revisions in batches of ``batch_size``, waiting
+    ``sleep`` seconds between batches. If given, ``progress`` is called with the
+    number of revisions deleted so far and the total number to delete after each
+    batch. Returns the number of revisions deleted, and the number of revisions
+    that were kept because they are protected from deletion.
+    """
+    purgeable_revisions = get_purgeable_revisions(
+        days=days, pages=pages, non_pages=non_pages, keep_logged=keep_logged
+    )
+    protected_error_count = get_purgeable_revisions(
+        days=days,
+        pages=pages,
+        non_pages=non_pages,
+        keep_logged=keep_logged,
+        protected=True,
+    ).count()
+
+    total_count = purgeable_revisions.count() if progress else None
     deleted_revisions_count = 0
-    protected_error_count = 0
-
-    for revision in purgeable_revisions.iterator():
-        # don't delete the latest revision
-        if not revision.is_latest_revision():
-            try:
-                revision.delete()
-                deleted_revisions_count += 1
-            except ProtectedError:
-                protected_error_count += 1
+    last_id = None
+
+    while True:
+        batch_queryset = purgeable_revisions.order_by("pk")
+        if last_id is not None:
+            batch_queryset = batch_queryset.filter(pk__gt=last_id)
+        revision_ids = list(batch_queryset.values_list("pk", flat=True)[:batch_size])
+        if not revision_ids:
+            break
+        last_id = revision_ids[-1]
+
+        try:
+            deleted_revisions_count += delete_revisions(revision_ids)
+        except (ProtectedError, RestrictedError):
+            # A revision became protected after it was selected, so delete the
+            # revisions in this batch one at a time
+            for revision in Revision.objects.filter(pk__in=revision_ids):
+                try:
+                    revision.delete()
+                    deleted_revisions_count += 1
+                except (ProtectedError, RestrictedError):
+                    protected_error_count += 1
+
+        if progress:
+            progress(deleted_revisions_count, total_count)
+
+        if sleep:
+            time.sleep(sleep)
 
     return deleted_revisions_count, protected_error_count
@@ -1,13 +1,60 @@
+import functools
+
 from django.apps import apps
 from django.core.management.base import BaseCommand
 from django.db import transaction
+from modelcluster.models import ClusterableModel, get_all_child_relations
 
-from wagtail.models import ReferenceIndex
+from wagtail.models import (
+    PendingReferenceIndexUpdate,
+    ReferenceIndex,
+    ReferenceIndexRebuildCheckpoint,
+)
 from wagtail.signal_handlers import disable_reference_index_auto_update
+from wagtail.utils.pending_updates import drain_pending_updates
+from wagtail.utils.pk_ranges import process_in_ranges
 
 DEFAULT_CHUNK_SIZE = 1000
 
 
+def get_indexed_objects(model):
+    """
+    Returns a queryset of all objects of ``model`` in primary key order, with
+    their child relations prefetched so that their references can be extracted
+    without a query for each object.
+    """
+    queryset = model._default_manager.order_by("pk")
+    if issubclass(model, ClusterableModel):
+        queryset = queryset.prefetch_related(
+            *[
+                relation.get_accessor_name()
+                for relation in get_all_child_relations(model)
+            ]
+        )
+    return queryset
+
+
+def index_objects(model, after_pk, last_pk):
+    """
+    Add the references of the objects of ``model`` with primary keys after
+    ``after_pk`` (or from the start, if ``None``) up to and including ``last_pk``
+    to the reference index, committing them in a single transaction. Returns the
+    number of objects indexed.
+    """
+    queryset = get_indexed_objects(model).filter(pk__lte=last_pk)
+    if after_pk is not None:
+        queryset = queryset.filter(pk__gt=after_pk)
+
+    objects = list(queryset)
+    with transaction.atomic():
+        ReferenceIndex.create_for_objects(objects)
+    return len(objects)
+
+
+def index_objects_in_worker(model_label, after_pk, last_pk):
+    return index_objects(apps.get_model(model_label), after_pk, last_pk)
+
+
 class Command(BaseCommand):
     def write(self, *args, **kwargs):
         """
@@ -27,40 +74,173 @@ class Command(BaseCommand):
             type=int,
             help="Set number of records to be fetched at once for inserting into the index",
         )
+        parser.add_argument(
+            "--drain-queue",
+            action="store_true",
+            dest="drain_queue",
+            default=False,
+            help="Update the objects queued by the 'queue' reference index update mode, instead of rebuilding the index",
+        )
+        parser.add_argument(
+            "--workers",
+            action="store",
+            dest="workers",
+            default=1,
+            type=int,
+            help="Split the objects of each model across this number of worker processes",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            dest="resume",
+            default=False,
+            help="Record the progress of the rebuild, and continue a previous rebuild that was interrupted",
+        )
 
     def handle(self, **options):
         self.verbosity = options["verbosity"]
 
         chunk_size = options.get("chunk_size")
-        object_count = 0
+
+        if options.get("drain_queue"):
+            self.drain_queue(chunk_size=chunk_size)
+            return
+
+        workers = options["workers"]
+        resume = options["resume"]
 
         self.write("Rebuilding reference index")
 
-        with transaction.atomic():
-            with disable_reference_index_auto_update():
-                # Use `_raw_delete` to avoid loading instances into memory
-                all_references = ReferenceIndex.objects.all()
-                all_references._raw_delete(using=all_references.db)
+        if workers > 1 or resume:
+            object_count = self.rebuild_in_ranges(
+                chunk_size=chunk_size, workers=workers, resume=resume
+            )
+        else:
+            object_count = self.rebuild(chunk_size=chunk_size)
+
+        self.write("Indexed %d objects" % object_count)
+        self.print_newline()
+
+    def get_indexed_models(self):
+        return [
+            model for model in apps.get_models() if ReferenceIndex.is_indexed(model)
+        ]
+
+    def clear_index(self):
+        with disable_reference_index_auto_update():
+            # Use `_raw_delete` to avoid loading instances into memory
+            all_references = ReferenceIndex.objects.all()
+            all_references._raw_delete(using=all_references.db)
+
+    def rebuild(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Rebuild the whole index in a single transaction.
+        """
+        object_count = 0
 
-            for model in apps.get_models():
-                if not ReferenceIndex.is_indexed(model):
-                    continue
+        with transaction.atomic():
+            self.clear_index()
 
+            for model in self.get_indexed_models():
                 self.write(str(model))
 
                 # Add items (chunk_size at a time)
                 for chunk in self.print_iter_progress(
-                    self.queryset_chunks(model.objects.all().order_by("pk"), chunk_size)
+                    self.queryset_chunks(get_indexed_objects(model), chunk_size)
                 ):
-                    for instance in chunk:
-                        ReferenceIndex.create_or_update_for_object(instance)
-
+                    ReferenceIndex.create_for_objects(chunk)
                     object_count += len(chunk)
 
                 self.print_newline()
 
-        self.write("Indexed %d objects" % object_count)
-        self.print_newline()
+        return object_count
+
+    def rebuild_in_ranges(self, chunk_size=DEFAULT_CHUNK_SIZE, workers=1, resume=False):
+        """
+        Rebuild the index one range of primary keys at a time, across ``workers``
+        processes, committing each range as it is indexed. If ``resume`` is set,
+        progress is recorded so that an interrupted rebuild can be continued.
+        """
+        models = self.get_indexed_models()
+        checkpoints = {}
+
+        if resume:
+            checkpoints = {
+                checkpoint.model: checkpoint
+                for checkpoint in ReferenceIndexRebuildCheckpoint.objects.all()
+            }
+
+        if not checkpoints:
+            self.clear_index()
+
+            if resume:
+                checkpoints = {
+                    checkpoint.model: checkpoint
+                    for checkpoint in ReferenceIndexRebuildCheckpoint.objects.bulk_create(
+                        [
+                            ReferenceIndexRebuildCheckpoint(model=model._meta.label)
+                            for model in models
+                        ]
+                    )
+                }
+        else:
+            self.write("Resuming previous rebuild")
+
+        object_count = 0
+        for model in models:
+            checkpoint = None
+            if resume:
+                checkpoint = checkpoints.get(model._meta.label)
+                if checkpoint is None:
+                    # The model was added since the previous rebuild started
+                    checkpoint = ReferenceIndexRebuildCheckpoint.objects.create(
+                        model=model._meta.label
+                    )
+
+            self.write(str(model))
+            object_count += self.index_model_in_ranges(
+                model, chunk_size, workers=workers, checkpoint=checkpoint
+            )
+            self.print_newline()
+
+        if resume:
+            ReferenceIndexRebuildCheckpoint.objects.all().delete()
+
+        return object_count
+
+    def index_model_in_ranges(self, model, chunk_size, workers=1, checkpoint=None):
+        """
+        Index the objects of ``model`` one range of primary keys at a time, across
+        ``workers`` processes. If a ``checkpoint`` is given, indexing starts after
+        its last primary key, and it is updated as each range is completed.
+        Returns the number of objects indexed.
+        """
+        return process_in_ranges(
+            model._default_manager.all(),
+            functools.partial(index_objects, model),
+            functools.partial(index_objects_in_worker, model._meta.label),
+            chunk_size,
+            workers=workers,
+            checkpoint=checkpoint,
+            progress=self.print_iter_progress,
+        )
+
+    def drain_queue(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update the references of all objects in the ``PendingReferenceIndexUpdate``
+        queue, in the order they were queued, removing them from the queue once
+        updated.
+        """
+
+        def update_objects(model, pks):
+            if ReferenceIndex.is_indexed(model):
+                ReferenceIndex.update_for_objects(model, pks)
+
+        object_count = drain_pending_updates(
+            PendingReferenceIndexUpdate, update_objects, chunk_size
+        )
+
+        self.write("Updated %d queued objects" % object_count)
 
     def print_newline(self):
         self.write("")
@@ -0,0 +1,33 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0095_pendingreferenceindexupdate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ReferenceIndexRebuildCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("model", models.CharField(max_length=255, unique=True)),
+                ("last_pk", models.CharField(max_length=255, null=True)),
+                ("completed", models.BooleanField(default=False)),
+            ],
+            options={
+                "verbose_name": "reference index rebuild checkpoint",
+                "verbose_name_plural": "reference index rebuild checkpoints",
+            },
+        ),
+    ]
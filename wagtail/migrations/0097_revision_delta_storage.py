@@ -0,0 +1,44 @@
+# Generated by Django 5.1.15 on 2026-10-18 21:32
+
+import django.core.serializers.json
+import django.db.models.deletion
+import wagtail.models.revision_storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0096_referenceindexrebuildcheckpoint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="revision",
+            name="content_delta",
+            field=models.BinaryField(
+                blank=True, null=True, verbose_name="content delta"
+            ),
+        ),
+        migrations.AddField(
+            model_name="revision",
+            name="keyframe",
+            field=models.ForeignKey(
+                blank=True,
+                editable=False,
+                null=True,
+                on_delete=django.db.models.deletion.RESTRICT,
+                related_name="+",
+                to="wagtailcore.revision",
+                verbose_name="keyframe",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="revision",
+            name="content",
+            field=wagtail.models.revision_storage.RevisionContentField(
+                encoder=django.core.serializers.json.DjangoJSONEncoder,
+                null=True,
+                verbose_name="content JSON",
+            ),
+        ),
+    ]
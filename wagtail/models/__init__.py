@@ -14,10 +14,11 @@ from __future__ import annotations
 import functools
 import logging
 import posixpath
+import re
 import uuid
 from io import StringIO
 from typing import TYPE_CHECKING
-from urllib.parse import urlsplit
+from urllib.parse import quote, urlsplit
 from warnings import warn
 
 from django import forms
@@ -26,6 +27,7 @@ from django.contrib.auth.models import Group, Permission
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRelation
 from django.contrib.contenttypes.models import ContentType
 from django.core import checks
+from django.core.cache import cache
 from django.core.exceptions import (
     FieldDoesNotExist,
     ImproperlyConfigured,
@@ -48,6 +50,7 @@ from django.utils import translation as translation
 from django.utils.cache import patch_cache_control
 from django.utils.encoding import force_bytes, force_str
 from django.utils.functional import Promise, cached_property
+from django.utils.http import RFC3986_SUBDELIMS
 from django.utils.module_loading import import_string
 from django.utils.text import capfirst, slugify
 from django.utils.translation import gettext_lazy as _
@@ -126,7 +129,17 @@ from .media import (  # noqa: F401
     UploadedFile,
     get_root_collection_id,
 )
-from .reference_index import ReferenceIndex  # noqa: F401
+from .reference_index import (  # noqa: F401
+    PendingReferenceIndexUpdate,
+    ReferenceIndex,
+    ReferenceIndexRebuildCheckpoint,
+)
+from .revision_storage import (
+    RevisionContentField,
+    encode_delta,
+    get_keyframe_interval,
+    get_revision_storage,
+)
 from .sites import Site, SiteManager, SiteRootPath  # noqa: F401
 from .specific import SpecificMixin
 from .view_restrictions import BaseViewRestriction
@@ -141,6 +154,13 @@ COMMENTS_RELATION_NAME = getattr(
     settings, "WAGTAIL_COMMENTS_RELATION_NAME", "wagtail_admin_comments"
 )
 
+# Relative page paths that can be appended to a reversed ``wagtail_serve`` prefix
+# without changing the result that ``reverse()`` would give for the full path
+BULK_URL_PATH_RE = re.compile(r"^(?:[\w\-]+/)*$")
+
+ROUTE_CACHE_KEY_PREFIX = "wagtail_route"
+ROUTE_CACHE_GENERATION_KEY = "wagtail_route_generation"
+
 
 @receiver(pre_validate_delete, sender=Locale)
 def reassign_root_page_locale_on_delete(sender, instance, **kwargs):
@@ -1398,7 +1418,8 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         """
         Find the page route for the given HTTP request object, and URL path. The route
         result (`page`, `args`, and `kwargs`) will be cached via
-        ``request._wagtail_route_for_request``.
+        ``request._wagtail_route_for_request``, and additionally in the shared
+        route cache if ``WAGTAIL_ROUTE_CACHE`` is enabled.
         """
         if not hasattr(request, "_wagtail_route_for_request"):
             try:
@@ -1407,11 +1428,16 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
                     path_components = [
                         component for component in path.split("/") if component
                     ]
-                    request._wagtail_route_for_request = (
-                        site.root_page.localized.specific.route(
-                            request, path_components
+                    if getattr(settings, "WAGTAIL_ROUTE_CACHE", False):
+                        request._wagtail_route_for_request = Page._route_with_cache(
+                            request, site, path_components
+                        )
+                    else:
+                        request._wagtail_route_for_request = (
+                            site.root_page.localized.specific.route(
+                                request, path_components
+                            )
                         )
-                    )
                 else:
                     request._wagtail_route_for_request = None
             except Http404:
@@ -1420,6 +1446,80 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
 
         return request._wagtail_route_for_request
 
+    @staticmethod
+    def _get_route_cache_key(site, path_components):
+        generation = cache.get(ROUTE_CACHE_GENERATION_KEY)
+        if generation is None:
+            cache.add(ROUTE_CACHE_GENERATION_KEY, uuid.uuid4().hex, None)
+            generation = cache.get(ROUTE_CACHE_GENERATION_KEY)
+
+        language_code = ""
+        if getattr(settings, "WAGTAIL_I18N_ENABLED", False):
+            language_code = translation.get_language() or ""
+
+        path_hash = safe_md5(
+            "/".join(path_components).encode(), usedforsecurity=False
+        ).hexdigest()
+        return ":".join(
+            [
+                ROUTE_CACHE_KEY_PREFIX,
+                str(generation),
+                str(site.pk),
+                language_code,
+                path_hash,
+            ]
+        )
+
+    @staticmethod
+    def _route_with_cache(
+        request: HttpRequest, site: Site, path_components: list[str]
+    ) -> RouteResult:
+        """
+        Route the request from the site's root page, consulting the shared route
+        cache first. Only routes that resolve to the page at the requested path
+        through the default ``Page.route`` implementation are stored, so pages
+        with custom routing (such as ``RoutablePageMixin``) are always routed
+        through ``route()``.
+        """
+        cache_key = Page._get_route_cache_key(site, path_components)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            page_id, content_type_id, args, kwargs = cached
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            if model is not None:
+                page = model._default_manager.filter(pk=page_id, live=True).first()
+                if page is not None:
+                    return RouteResult(page, args=args, kwargs=kwargs)
+
+        root_page = site.root_page.localized.specific
+        result = root_page.route(request, path_components)
+
+        page = result.page
+        expected_url_path = root_page.url_path + "".join(
+            component + "/" for component in path_components
+        )
+        if type(page).route is Page.route and page.url_path == expected_url_path:
+            cache.set(
+                cache_key,
+                (
+                    page.pk,
+                    page.content_type_id,
+                    list(result.args),
+                    dict(result.kwargs),
+                ),
+                getattr(settings, "WAGTAIL_ROUTE_CACHE_TIMEOUT", 3600),
+            )
+
+        return result
+
+    @staticmethod
+    def clear_route_cache():
+        """
+        Invalidate all entries in the shared route cache used when
+        ``WAGTAIL_ROUTE_CACHE`` is enabled.
+        """
+        cache.delete(ROUTE_CACHE_GENERATION_KEY)
+
     @staticmethod
     def find_for_request(request: HttpRequest, path: str) -> Page | None:
         """
@@ -1646,6 +1746,7 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         # always check if this page is a site root, even if it's new.
         if self.is_site_root():
             Site.clear_site_root_paths_cache()
+            transaction.on_commit(Site.clear_site_cache)
 
         # Log
         if is_new:
@@ -2269,6 +2370,130 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         """
         return self.get_url(request=request, current_site=current_site)
 
+    @staticmethod
+    def get_urls_for_pages(pages, request=None):
+        """
+        Return a list of URLs for the given iterable of pages, in the same order. Each URL is
+        identical to the result of calling ``page.get_url(request)``, but site root paths, the
+        current site and the ``wagtail_serve`` URL prefix are resolved once for the whole list,
+        rather than once per page. This is useful for menus, listings and sitemaps that need
+        the URLs of many pages at once.
+
+        Pages that override ``get_url_parts`` or ``get_url`` are resolved by calling their
+        ``get_url`` method as normal.
+        """
+        if request is not None:
+            try:
+                site_root_paths = request._wagtail_cached_site_root_paths
+            except AttributeError:
+                site_root_paths = Site.get_site_root_paths()
+                request._wagtail_cached_site_root_paths = site_root_paths
+        else:
+            site_root_paths = Site.get_site_root_paths()
+
+        current_site = Site.find_for_request(request)
+        num_sites = len({root_path.site_id for root_path in site_root_paths})
+        use_wagtail_i18n = getattr(settings, "WAGTAIL_I18N_ENABLED", False)
+
+        # Map each site root path to its (position, SiteRootPath) entries, so that the
+        # relevant sites for a page can be found by looking up the prefixes of its url_path
+        root_paths_by_prefix = {}
+        for position, root_path in enumerate(site_root_paths):
+            root_paths_by_prefix.setdefault(root_path.root_path, []).append(
+                (position, root_path)
+            )
+
+        # ``(reusable, prefix)`` for ``reverse("wagtail_serve")`` per language code;
+        # ``reusable`` is False if relative paths cannot simply be appended to the prefix
+        serve_prefixes = {}
+
+        def get_serve_prefix(language_code):
+            if language_code not in serve_prefixes:
+                try:
+                    with translation.override(language_code):
+                        prefix = reverse("wagtail_serve", args=("",))
+                        probe = reverse("wagtail_serve", args=("a/",))
+                except NoReverseMatch:
+                    serve_prefixes[language_code] = (False, None)
+                else:
+                    # Only reuse the prefix if the page path is appended to the end
+                    reusable = probe == prefix + "a/"
+                    serve_prefixes[language_code] = (reusable, prefix)
+            return serve_prefixes[language_code]
+
+        urls = []
+        for page in pages:
+            page_class = type(page)
+            if (
+                page_class.get_url_parts is not Page.get_url_parts
+                or page_class.get_url is not Page.get_url
+            ):
+                urls.append(page.get_url(request=request))
+                continue
+
+            url_path = page.url_path
+            possible_sites = [
+                root_path
+                for position, root_path in sorted(
+                    entry
+                    for index, char in enumerate(url_path)
+                    if char == "/"
+                    for entry in root_paths_by_prefix.get(url_path[: index + 1], ())
+                )
+            ]
+            if not possible_sites:
+                urls.append(None)
+                continue
+
+            site_id, root_path, root_url, language_code = possible_sites[0]
+            if current_site:
+                for site_id, root_path, root_url, language_code in possible_sites:
+                    if site_id == current_site.pk:
+                        break
+                else:
+                    site_id, root_path, root_url, language_code = possible_sites[0]
+
+            if use_wagtail_i18n:
+                try:
+                    if (
+                        get_supported_content_language_variant(
+                            translation.get_language()
+                        )
+                        == language_code
+                    ):
+                        language_code = translation.get_language()
+                except LookupError:
+                    pass
+            else:
+                language_code = translation.get_language()
+
+            relative_path = url_path[len(root_path) :]
+            reusable, prefix = get_serve_prefix(language_code)
+            if reusable and BULK_URL_PATH_RE.match(relative_path):
+                page_path = prefix + quote(
+                    relative_path, safe=RFC3986_SUBDELIMS + "/~:@"
+                )
+            else:
+                try:
+                    with translation.override(language_code):
+                        page_path = reverse("wagtail_serve", args=(relative_path,))
+                except NoReverseMatch:
+                    # wagtail_serve is not registered, so the page is not routable
+                    urls.append(None)
+                    continue
+
+            if not WAGTAIL_APPEND_SLASH and page_path != "/":
+                page_path = page_path.rstrip("/")
+
+            if (
+                current_site is not None and site_id == current_site.id
+            ) or num_sites == 1:
+                urls.append(page_path)
+            else:
+                urls.append(root_url + page_path)
+
+        return urls
+
     def get_site(self):
         """
         Return the Site object that this page belongs to.
@@ -2289,6 +2514,12 @@ class Page(AbstractPage, index.Indexed, ClusterableModel, metaclass=PageBase):
         content_type = ContentType.objects.get_for_model(cls)
         return super().get_indexed_objects().filter(content_type=content_type)
 
+    @classmethod
+    def get_indexed_objects_modified_since(cls, since):
+        return cls.get_indexed_objects().filter(
+            Q(latest_revision_created_at__gte=since) | Q(last_published_at__gte=since)
+        )
+
     def get_indexed_instance(self):
         # This is accessed on save by the wagtailsearch signal handler, and in edge
         # cases (e.g. loading test fixtures), may be called before the specific instance's
@@ -2969,8 +3200,22 @@ class Revision(models.Model):
         related_name="wagtail_revisions",
     )
     object_str = models.TextField(default="")
-    content = models.JSONField(
-        verbose_name=_("content JSON"), encoder=DjangoJSONEncoder
+    content = RevisionContentField(
+        verbose_name=_("content JSON"), encoder=DjangoJSONEncoder, null=True
+    )
+    # When WAGTAIL_REVISION_STORAGE is "delta", the content of most revisions is
+    # stored as a compressed delta against an earlier revision with full content
+    keyframe = models.ForeignKey(
+        "self",
+        verbose_name=_("keyframe"),
+        null=True,
+        blank=True,
+        editable=False,
+        on_delete=models.RESTRICT,
+        related_name="+",
+    )
+    content_delta = models.BinaryField(
+        verbose_name=_("content delta"), null=True, blank=True, editable=False
     )
     approved_go_live_at = models.DateTimeField(
         verbose_name=_("approved go live at"), null=True, blank=True, db_index=True
@@ -3002,8 +3247,28 @@ class Revision(models.Model):
         if self.base_content_type_id is None:
             self.base_content_type_id = self.content_type_id
 
+        update_fields = kwargs.get("update_fields")
+        dependents = []
+        if self.pk is None:
+            self.set_keyframe(self.get_keyframe_for_new_revision())
+        elif update_fields is None or "content" in update_fields:
+            if self.keyframe_id is not None:
+                self.set_keyframe(self.keyframe)
+            else:
+                self.content_delta = None
+                # Revisions stored as a delta against this one are stored against
+                # its new content once it has been saved
+                dependents = self.get_dependent_revisions()
+
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "keyframe", "content_delta"}
+
         super().save(*args, **kwargs)
 
+        for dependent in dependents:
+            dependent.keyframe = self
+            dependent.save(update_fields=["content"])
+
         if (
             self.approved_go_live_at is None
             and "update_fields" in kwargs
@@ -3032,6 +3297,86 @@ class Revision(models.Model):
     def as_object(self):
         return self.content_object.with_content_json(self.content)
 
+    def get_keyframe_for_new_revision(self):
+        """
+        Return the revision that a new revision of this object should store its
+        content as a delta against, or ``None`` to store its full content.
+        """
+        if get_revision_storage() != "delta":
+            return None
+
+        latest_revision = (
+            Revision.objects.filter(
+                base_content_type_id=self.base_content_type_id,
+                object_id=self.object_id,
+            )
+            .order_by("-created_at", "-id")
+            .values_list("id", "keyframe_id")
+            .first()
+        )
+        if latest_revision is None:
+            return None
+
+        latest_revision_id, keyframe_id = latest_revision
+        keyframe_id = keyframe_id or latest_revision_id
+        # Start a new keyframe once the current one has enough revisions stored
+        # against it, so that deltas don't grow as the content changes
+        if (
+            Revision.objects.filter(keyframe_id=keyframe_id).count()
+            >= get_keyframe_interval() - 1
+        ):
+            return None
+
+        return Revision.objects.get(id=keyframe_id)
+
+    def set_keyframe(self, keyframe):
+        """
+        Store the content of this revision as a delta against ``keyframe``, or
+        store its full content if ``keyframe`` is ``None`` or the delta would be
+        no smaller. Takes effect when the revision is saved.
+        """
+        content_delta = None
+        if keyframe is not None:
+            content_delta = encode_delta(keyframe.content, self.content)
+
+        if content_delta is None:
+            self.keyframe = None
+            self.content_delta = None
+        else:
+            self.keyframe = keyframe
+            self.content_delta = content_delta
+
+    def get_dependent_revisions(self, exclude_ids=()):
+        """
+        Return the revisions whose content is stored as a delta against this one,
+        with their content loaded from the stored content of this revision.
+        """
+        dependents = list(
+            Revision.objects.filter(keyframe_id=self.pk)
+            .exclude(id__in=exclude_ids)
+            .select_related("keyframe")
+            .order_by("created_at", "id")
+        )
+        for dependent in dependents:
+            dependent.content  # noqa: B018
+        return dependents
+
+    def detach_dependent_revisions(self, exclude_ids=()):
+        """
+        Store the revisions whose content is stored as a delta against this one
+        against the earliest of them instead, which is given the full content, so
+        that this revision can be deleted. Revisions in ``exclude_ids`` (such as
+        those being deleted along with this one) are left unchanged.
+        """
+        dependents = self.get_dependent_revisions(exclude_ids=exclude_ids)
+        if dependents:
+            new_keyframe = dependents[0]
+            new_keyframe.keyframe = None
+            new_keyframe.save(update_fields=["content"])
+            for dependent in dependents[1:]:
+                dependent.keyframe = new_keyframe
+                dependent.save(update_fields=["content"])
+
     def is_latest_revision(self):
         if self.id is None:
             # special case: a revision without an ID is presumed to be newly-created and is thus
@@ -3061,6 +3406,8 @@ class Revision(models.Model):
             # move comments created on this revision to the next revision, as they may well still apply if they're unresolved
             self.created_comments.all().update(revision_created=next_revision)
 
+        self.detach_dependent_revisions()
+
         return super().delete()
 
     def publish(
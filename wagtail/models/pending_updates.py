@@ -0,0 +1,50 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import DEFAULT_DB_ALIAS, connections, models
+from django.utils import timezone
+
+
+class AbstractPendingUpdate(models.Model):
+    """
+    An object that has changed and needs to be processed by a management command,
+    such as ``update_index --drain-queue``. Each object is queued at most once.
+    """
+
+    content_type = models.ForeignKey(
+        ContentType, on_delete=models.CASCADE, related_name="+"
+    )
+    # We do not use an IntegerField since primary keys are not always integers.
+    object_id = models.CharField(max_length=255)
+    queued_at = models.DateTimeField(db_index=True)
+
+    # Whether objects of proxy models are queued under their concrete model
+    for_concrete_model = True
+
+    class Meta:
+        abstract = True
+        unique_together = [("content_type", "object_id")]
+
+    @classmethod
+    def enqueue(cls, model, pks, using=None):
+        """
+        Add the objects of ``model`` with the given primary keys to the queue. If an
+        object is already queued, it is moved to the back of the queue, so that it
+        is not removed by a drain that fetched it before this change was made.
+        """
+        connection = connections[using or DEFAULT_DB_ALIAS]
+        content_type = ContentType.objects.db_manager(using).get_for_model(
+            model, for_concrete_model=cls.for_concrete_model
+        )
+        queued_at = timezone.now()
+        kwargs = {}
+        if connection.features.supports_update_conflicts_with_target:
+            kwargs["unique_fields"] = ["content_type", "object_id"]
+
+        cls.objects.using(using).bulk_create(
+            [
+                cls(content_type=content_type, object_id=str(pk), queued_at=queued_at)
+                for pk in pks
+            ],
+            update_conflicts=True,
+            update_fields=["queued_at"],
+            **kwargs,
+        )
@@ -2,7 +2,7 @@ import uuid
 
 from django.contrib.contenttypes.fields import GenericForeignKey, GenericRel
 from django.contrib.contenttypes.models import ContentType
-from django.db import connection, models
+from django.db import connection, models, transaction
 from django.utils.functional import cached_property
 from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy as _
@@ -12,6 +12,7 @@ from taggit.models import ItemBase
 
 from wagtail.blocks import StreamBlock
 from wagtail.fields import StreamField
+from wagtail.models.pending_updates import AbstractPendingUpdate
 
 
 class ReferenceGroups:
@@ -509,6 +510,78 @@ class ReferenceIndex(models.Model):
         # Perform the deletion
         cls.objects.filter(id__in=deleted_reference_ids).delete()
 
+    @classmethod
+    def create_for_objects(cls, objects, batch_size=1000):
+        """
+        Creates ReferenceIndex records for the given objects, without looking for
+        existing records to update or delete.
+
+        This is much faster than calling ``create_or_update_for_object`` for each
+        object, but should only be used for objects that have no existing records,
+        such as when rebuilding the index from scratch.
+
+        Args:
+            objects (iterable): The model instances to create ReferenceIndex records for
+            batch_size (int): The number of records to insert in each query
+        """
+        content_types_by_model = {}
+        records = []
+
+        for object in objects:
+            model = type(object)
+            if model not in content_types_by_model:
+                content_types = [
+                    ContentType.objects.get_for_model(
+                        model_or_object, for_concrete_model=False
+                    )
+                    for model_or_object in ([object] + object._meta.get_parent_list())
+                ]
+                content_types_by_model[model] = (content_types[0], content_types[-1])
+
+            content_type, base_content_type = content_types_by_model[model]
+            records.extend(
+                cls(
+                    content_type=content_type,
+                    base_content_type=base_content_type,
+                    object_id=object.pk,
+                    to_content_type_id=to_content_type_id,
+                    to_object_id=to_object_id,
+                    model_path=model_path,
+                    content_path=content_path,
+                    content_path_hash=cls._get_content_path_hash(content_path),
+                )
+                for to_content_type_id, to_object_id, model_path, content_path in set(
+                    cls._extract_references_from_object(object)
+                )
+            )
+
+        bulk_create_kwargs = {}
+        if connection.features.supports_ignore_conflicts:
+            bulk_create_kwargs["ignore_conflicts"] = True
+
+        cls.objects.bulk_create(records, batch_size=batch_size, **bulk_create_kwargs)
+
+    @classmethod
+    def update_for_objects(cls, model, pks):
+        """
+        Creates or updates ReferenceIndex records for the objects of the given model
+        with the given primary keys, fetching them from the database. Records are
+        deleted for any of the objects that no longer exist.
+
+        Args:
+            model (Model): The model of the objects to update ReferenceIndex records for
+            pks (iterable): The primary keys of the objects
+        """
+        remaining_pks = set(pks)
+
+        for object in model._default_manager.filter(pk__in=remaining_pks):
+            with transaction.atomic():
+                cls.create_or_update_for_object(object)
+            remaining_pks.discard(object.pk)
+
+        for pk in remaining_pks:
+            cls.remove_for_object(model(pk=pk))
+
     @classmethod
     def remove_for_object(cls, object):
         """
@@ -718,3 +791,36 @@ class ReferenceIndex(models.Model):
 # correctly will require support for ManyToMany relations with through models:
 # https://github.com/wagtail/wagtail/issues/9629
 ItemBase.wagtail_reference_index_ignore = True
+
+
+class PendingReferenceIndexUpdate(AbstractPendingUpdate):
+    """
+    An object whose references need to be updated in the reference index, when
+    ``WAGTAIL_REFERENCE_INDEX_UPDATE_MODE`` is set to ``"queue"``. The queue is
+    processed by the ``rebuild_references_index --drain-queue`` management command.
+    """
+
+    wagtail_reference_index_ignore = True
+
+    class Meta(AbstractPendingUpdate.Meta):
+        verbose_name = _("pending reference index update")
+        verbose_name_plural = _("pending reference index updates")
+
+
+class ReferenceIndexRebuildCheckpoint(models.Model):
+    """
+    Records the progress of rebuilding the reference index with
+    ``rebuild_references_index --resume``, so that an interrupted rebuild can
+    continue where it stopped.
+    """
+
+    model = models.CharField(max_length=255, unique=True)
+    # The primary key of the last object to be indexed, in primary key order
+    last_pk = models.CharField(max_length=255, null=True)
+    completed = models.BooleanField(default=False)
+
+    wagtail_reference_index_ignore = True
+
+    class Meta:
+        verbose_name = _("reference index rebuild checkpoint")
+        verbose_name_plural = _("reference index rebuild checkpoints")
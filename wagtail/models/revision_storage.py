@@ -0,0 +1,210 @@
+"""
+Compact storage of revision content.
+
+When ``WAGTAIL_REVISION_STORAGE`` is set to ``"delta"``, only some revisions of
+an object ("keyframes") store the full content. The others store a compressed
+delta against the content of their keyframe, which is applied when their
+``content`` is accessed.
+"""
+
+import copy
+import difflib
+import json
+import zlib
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models.query_utils import DeferredAttribute
+
+DEFAULT_KEYFRAME_INTERVAL = 20
+
+
+def get_revision_storage():
+    return getattr(settings, "WAGTAIL_REVISION_STORAGE", "full")
+
+
+def get_keyframe_interval():
+    return getattr(
+        settings, "WAGTAIL_REVISION_KEYFRAME_INTERVAL", DEFAULT_KEYFRAME_INTERVAL
+    )
+
+
+def dumps(value):
+    return json.dumps(value, cls=DjangoJSONEncoder)
+
+
+def normalize(value):
+    """
+    Convert ``value`` to the form it takes once stored in a ``JSONField``, such
+    as dates becoming strings.
+    """
+    return json.loads(dumps(value))
+
+
+def load_json_container(value):
+    # StreamField values are stored in revision content as JSON strings, so
+    # these are diffed as the data they contain, rather than as text
+    if not value.startswith(("[", "{")):
+        return None
+    try:
+        data = json.loads(value)
+    except ValueError:
+        return None
+    # Only use this if the string can be reproduced exactly from the data
+    if dumps(data) != value:
+        return None
+    return data
+
+
+def diff(old, new):
+    """
+    Return a delta that turns the JSON-compatible value ``old`` into ``new``
+    when passed to ``patch``, or ``None`` if they are equal.
+    """
+    if old == new:
+        return None
+
+    if isinstance(old, dict) and isinstance(new, dict):
+        changes = {}
+        for key, value in new.items():
+            if key in old:
+                delta = diff(old[key], value)
+                if delta is not None:
+                    changes[key] = delta
+            else:
+                changes[key] = ["=", value]
+        return ["{", changes, [key for key in old if key not in new]]
+
+    if isinstance(old, list) and isinstance(new, list):
+        return ["[", diff_lists(old, new)]
+
+    if isinstance(old, str) and isinstance(new, str):
+        old_data = load_json_container(old)
+        new_data = load_json_container(new) if old_data is not None else None
+        if new_data is not None:
+            return ["s", diff(old_data, new_data)]
+
+    return ["=", new]
+
+
+def diff_lists(old, new):
+    """
+    Return a list of operations that build ``new`` from the items of ``old``:
+    ``["c", i, j]`` copies ``old[i:j]``, ``["p", i, delta]`` patches ``old[i]``
+    and ``["i", items]`` inserts new items.
+    """
+    matcher = difflib.SequenceMatcher(
+        None, [dumps(item) for item in old], [dumps(item) for item in new], False
+    )
+    operations = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            operations.append(["c", i1, i2])
+            continue
+
+        # Items that replace an item at the same position are usually that item
+        # with some changes, such as a StreamField block that has been edited
+        paired_count = min(i2 - i1, j2 - j1) if tag == "replace" else 0
+        for offset in range(paired_count):
+            operations.append(
+                ["p", i1 + offset, diff(old[i1 + offset], new[j1 + offset])]
+            )
+        if j1 + paired_count < j2:
+            operations.append(["i", new[j1 + paired_count : j2]])
+
+    return operations
+
+
+def patch(old, delta):
+    """
+    Apply a delta returned by ``diff`` to ``old``. ``old`` is not modified, but
+    parts of it may be shared with the returned value.
+    """
+    if delta is None:
+        return old
+
+    operation = delta[0]
+    if operation == "=":
+        return delta[1]
+
+    if operation == "{":
+        _, changes, removed = delta
+        value = {key: item for key, item in old.items() if key not in removed}
+        for key, item_delta in changes.items():
+            value[key] = patch(old.get(key), item_delta)
+        return value
+
+    if operation == "[":
+        value = []
+        for list_operation in delta[1]:
+            if list_operation[0] == "c":
+                value.extend(old[list_operation[1] : list_operation[2]])
+            elif list_operation[0] == "p":
+                value.append(patch(old[list_operation[1]], list_operation[2]))
+            else:
+                value.extend(list_operation[1])
+        return value
+
+    if operation == "s":
+        return dumps(patch(json.loads(old), delta[1]))
+
+    raise ValueError("Unknown revision content delta operation: %r" % operation)
+
+
+def encode_delta(keyframe_content, content):
+    """
+    Return the compressed delta between the content of a keyframe and
+    ``content``, or ``None`` if it would be no smaller than ``content`` itself.
+    """
+    content = normalize(content)
+    content_delta = zlib.compress(
+        dumps(diff(normalize(keyframe_content), content)).encode()
+    )
+    if len(content_delta) >= len(dumps(content).encode()):
+        return None
+    return content_delta
+
+
+def decode_delta(keyframe_content, content_delta):
+    """
+    Rebuild the content of a revision from its keyframe's content and the delta
+    returned by ``encode_delta``.
+    """
+    delta = json.loads(zlib.decompress(content_delta))
+    return patch(copy.deepcopy(keyframe_content), delta)
+
+
+class RevisionContentDescriptor(DeferredAttribute):
+    """
+    Rebuilds the content of revisions stored as a delta when it's accessed.
+    """
+
+    def __get__(self, instance, cls=None):
+        if instance is None:
+            return self
+
+        value = super().__get__(instance, cls)
+        if value is None and instance.keyframe_id is not None:
+            value = decode_delta(instance.keyframe.content, instance.content_delta)
+            instance.__dict__[self.field.attname] = value
+        return value
+
+    def __set__(self, instance, value):
+        # Defining __set__ makes this a data descriptor, so that __get__ is
+        # called even when the value is in the instance's __dict__
+        instance.__dict__[self.field.attname] = value
+
+
+class RevisionContentField(models.JSONField):
+    """
+    Holds the full content of a revision, which is only stored in the database
+    for revisions that aren't stored as a delta against a keyframe.
+    """
+
+    descriptor_class = RevisionContentDescriptor
+
+    def pre_save(self, model_instance, add):
+        if model_instance.keyframe_id is not None:
+            return None
+        return super().pre_save(model_instance, add)
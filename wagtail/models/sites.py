@@ -1,3 +1,5 @@
+import copy
+import uuid
 from collections import namedtuple
 
 from django.apps import apps
@@ -44,21 +46,76 @@ def get_site_for_hostname(hostname, port):
         .select_related("root_page")
     )
 
-    if sites:
+    return _select_site([(site.match, site) for site in sites])
+
+
+def _select_site(matches):
+    """
+    Return the best site from a list of ``(match, site)`` pairs for the
+    hostname and port, ordered by match, or raise ``Site.DoesNotExist``.
+    """
+    if matches:
         # if there's a unique match or hostname (with port or default) match
-        if len(sites) == 1 or sites[0].match in (
+        if len(matches) == 1 or matches[0][0] in (
             MATCH_HOSTNAME_PORT,
             MATCH_HOSTNAME_DEFAULT,
         ):
-            return sites[0]
+            return matches[0][1]
 
         # if there is a default match with a different hostname, see if
         # there are many hostname matches. if only 1 then use that instead
         # otherwise we use the default
-        if sites[0].match == MATCH_DEFAULT:
-            return sites[len(sites) == 2]
+        if matches[0][0] == MATCH_DEFAULT:
+            return matches[len(matches) == 2][1]
+
+    raise apps.get_model("wagtailcore.Site").DoesNotExist()
+
+
+# All sites with their root pages, as loaded by this process for the current
+# site cache generation
+_site_table = (None, [])
+
+
+def get_cached_site_for_hostname(hostname, port):
+    """
+    Return the wagtailcore.Site object for the given hostname and port, as
+    ``get_site_for_hostname`` does, from a table of all sites kept in the memory
+    of this process. The table is reloaded when ``Site.clear_site_cache()`` has
+    been called by any process since it was loaded.
+    """
+    global _site_table
+
+    generation = cache.get(SITE_CACHE_GENERATION_KEY)
+    if generation is None:
+        cache.add(SITE_CACHE_GENERATION_KEY, uuid.uuid4().hex, None)
+        generation = cache.get(SITE_CACHE_GENERATION_KEY)
+
+    table_generation, sites = _site_table
+    if table_generation != generation:
+        Site = apps.get_model("wagtailcore.Site")
+        sites = list(Site.objects.select_related("root_page"))
+        _site_table = (generation, sites)
+
+    matches = []
+    for site in sites:
+        if site.hostname == hostname:
+            # The port of the request is a string
+            if str(site.port) == str(port):
+                match = MATCH_HOSTNAME_PORT
+            elif site.is_default_site:
+                match = MATCH_HOSTNAME_DEFAULT
+            else:
+                match = MATCH_HOSTNAME
+        elif site.is_default_site:
+            match = MATCH_DEFAULT
+        else:
+            continue
+        matches.append((match, site))
+    matches.sort(key=lambda item: item[0])
 
-    raise Site.DoesNotExist()
+    # The sites in the table are shared between requests, so return a copy
+    # whose fields can be set by the request without affecting other requests
+    return copy.copy(_select_site(matches))
 
 
 class SiteManager(models.Manager):
@@ -75,6 +132,8 @@ SITE_ROOT_PATHS_CACHE_KEY = "wagtail_site_root_paths"
 # Increase the cache version whenever the structure SiteRootPath tuple changes
 SITE_ROOT_PATHS_CACHE_VERSION = 2
 
+SITE_CACHE_GENERATION_KEY = "wagtail_site_generation"
+
 
 class Site(models.Model):
     hostname = models.CharField(
@@ -164,7 +223,10 @@ class Site(models.Model):
         port = request.get_port()
         site = None
         try:
-            site = get_site_for_hostname(hostname, port)
+            if getattr(settings, "WAGTAIL_SITE_CACHE", False):
+                site = get_cached_site_for_hostname(hostname, port)
+            else:
+                site = get_site_for_hostname(hostname, port)
         except Site.DoesNotExist:
             pass
             # copy old SiteMiddleware behaviour
@@ -267,3 +329,14 @@ class Site(models.Model):
     @staticmethod
     def clear_site_root_paths_cache():
         cache.delete(SITE_ROOT_PATHS_CACHE_KEY, version=SITE_ROOT_PATHS_CACHE_VERSION)
+
+    @staticmethod
+    def clear_site_cache():
+        """
+        Invalidate the tables of sites kept by each process when
+        ``WAGTAIL_SITE_CACHE`` is enabled.
+        """
+        global _site_table
+
+        cache.delete(SITE_CACHE_GENERATION_KEY)
+        _site_table = (None, [])
@@ -5,8 +5,10 @@ from collections.abc import Iterable
 from typing import Any
 
 from django.apps import apps
+from django.conf import settings
 from django.contrib.contenttypes.models import ContentType
-from django.db.models import CharField, Prefetch, Q
+from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import CharField, Prefetch, Q, prefetch_related_objects
 from django.db.models.expressions import Exists, OuterRef
 from django.db.models.functions import Cast, Length, Substr
 from django.db.models.query import ModelIterable
@@ -149,26 +151,37 @@ class SpecificQuerySetMixin:
         self._defer_streamfields = False
         self._specific_select_related_fields = ()
         self._specific_prefetch_related_lookups = ()
+        # set by specific()
+        self._specific_fetch_mode = None
 
     def _clone(self):
         """Ensure clones inherit custom attribute values."""
         clone = super()._clone()
         clone._defer_streamfields = self._defer_streamfields
+        clone._specific_fetch_mode = self._specific_fetch_mode
         clone._specific_select_related_fields = self._specific_select_related_fields
         clone._specific_prefetch_related_lookups = (
             self._specific_prefetch_related_lookups
         )
         return clone
 
-    def specific(self, defer=False):
+    def specific(self, defer=False, fetch_mode=None):
         """
         This efficiently gets all the specific items for the queryset, using
         the minimum number of queries.
 
         When the "defer" keyword argument is set to True, only generic
         field values will be loaded and all specific fields will be deferred.
+
+        The "fetch_mode" keyword argument sets how the specific items are
+        fetched, overriding the ``WAGTAIL_SPECIFIC_FETCH_MODE`` setting:
+        ``"per_type"`` runs one query for each specific type, and ``"join"``
+        fetches items of all types with a single query that joins the tables
+        of each type.
         """
         clone = self._clone()
+        if fetch_mode is not None:
+            clone._specific_fetch_mode = fetch_mode
         if defer:
             clone._iterable_class = DeferredSpecificIterable
         else:
@@ -659,6 +672,10 @@ class PageQuerySet(SearchableQuerySetMixin, SpecificQuerySetMixin, TreeQuerySet)
 
 
 class SpecificIterable(ModelIterable):
+    # The maximum number of tables to join when fetching items with the "join"
+    # fetch mode, above which items are fetched one type at a time instead
+    join_max_tables = 20
+
     def __iter__(self):
         """
         Identify and return all specific items in a queryset, and return them
@@ -688,10 +705,16 @@ class SpecificIterable(ModelIterable):
                 pk: ContentType.objects.get_for_id(pk) for _, pk in pks_and_types
             }
 
-            # Get the specific instances of all items, one model class at a time.
+            # Get the specific instances of all items
             items_by_type = {}
             missing_pks = []
 
+            if self._get_fetch_mode() == "join":
+                pks_by_type = self._fetch_with_joins(
+                    pks_by_type, content_types, items_by_type, missing_pks
+                )
+
+            # Fetch items of any remaining types one model class at a time.
             for content_type, pks in pks_by_type.items():
                 # look up model class for this content type, falling back on the original
                 # model (i.e. Page) if the more specific one is missing
@@ -746,6 +769,139 @@ class SpecificIterable(ModelIterable):
                         setattr(item, annotation, value)
                 yield item
 
+    def _get_fetch_mode(self):
+        return self.queryset._specific_fetch_mode or getattr(
+            settings, "WAGTAIL_SPECIFIC_FETCH_MODE", "per_type"
+        )
+
+    @staticmethod
+    def _get_join_path(model, base_model):
+        """
+        Return the models between ``base_model`` and ``model`` in the
+        multi-table inheritance chain (excluding ``base_model``), each with the
+        name used to follow the relation from its parent in ``select_related()``,
+        and the name of the attribute holding it on its parent. Returns ``None``
+        if ``model`` can't be fetched through a join from ``base_model``.
+        """
+        if model is None or model._meta.proxy or not issubclass(model, base_model):
+            return None
+
+        path = []
+        while model is not base_model:
+            parent, link = next(
+                (
+                    (parent, link)
+                    for parent, link in model._meta.parents.items()
+                    if link is not None and issubclass(parent, base_model)
+                ),
+                (None, None),
+            )
+            if parent is None:
+                return None
+            path.append(
+                (
+                    model,
+                    link.related_query_name(),
+                    link.remote_field.get_accessor_name(),
+                )
+            )
+            model = parent
+
+        path.reverse()
+        return path
+
+    def _fetch_with_joins(self, pks_by_type, content_types, items_by_type, missing_pks):
+        """
+        Fetch the specific items of all types that are concrete subclasses of
+        the queryset's model with a single query, by following the reverse
+        one-to-one relations from the queryset's model to the table of each
+        type with ``select_related()``. Found items are added to
+        ``items_by_type``, and the pks of items whose specific rows are missing
+        to ``missing_pks``. Returns the pks of any other types, by content type,
+        to be fetched one type at a time.
+        """
+        qs = self.queryset
+        base_model = qs.model
+
+        paths_by_type = {}
+        remaining_pks_by_type = {}
+        for content_type, pks in pks_by_type.items():
+            path = self._get_join_path(
+                content_types[content_type].model_class(), base_model
+            )
+            if path is None:
+                remaining_pks_by_type[content_type] = pks
+            else:
+                paths_by_type[content_type] = path
+
+        # Each (model, relation path) that needs to be joined
+        joins = {}
+        for path in paths_by_type.values():
+            names = []
+            for model, query_name, _ in path:
+                names.append(query_name)
+                joins["__".join(names)] = model
+
+        if not paths_by_type or len(joins) > self.join_max_tables:
+            return pks_by_type
+
+        # Apply select_related() and defer_streamfields() to the base model and
+        # each joined model
+        has_base_items = any(not path for path in paths_by_type.values())
+        select_related = list(joins)
+        deferred_fields = []
+        for join, model in [("", base_model), *joins.items()]:
+            prefix = join + "__" if join else ""
+            if join or has_base_items:
+                select_related.extend(
+                    prefix + field_name
+                    for field_name in qs._specific_select_related_fields
+                )
+
+            if qs._defer_streamfields and hasattr(model, "get_streamfield_names"):
+                local_field_names = {field.name for field in model._meta.local_fields}
+                deferred_fields.extend(
+                    prefix + field_name
+                    for field_name in model.get_streamfield_names()
+                    if field_name in local_field_names
+                )
+
+        items = base_model.objects.filter(
+            pk__in=[
+                pk for content_type in paths_by_type for pk in pks_by_type[content_type]
+            ]
+        ).select_related(*select_related)
+        if deferred_fields:
+            items = items.defer(*deferred_fields)
+        base_items = {item.pk: item for item in items}
+
+        items_by_model = defaultdict(list)
+        for content_type, path in paths_by_type.items():
+            items_for_type = {}
+            for pk in pks_by_type[content_type]:
+                item = base_items.get(pk)
+                try:
+                    for _, _, accessor_name in path:
+                        if item is not None:
+                            item = getattr(item, accessor_name)
+                except ObjectDoesNotExist:
+                    item = None
+
+                if item is None:
+                    missing_pks.append(pk)
+                else:
+                    items_for_type[pk] = item
+                    items_by_model[type(item)].append(item)
+            items_by_type[content_type] = items_for_type
+
+        if qs._specific_prefetch_related_lookups:
+            for model_items in items_by_model.values():
+                prefetch_related_objects(
+                    model_items, *qs._specific_prefetch_related_lookups
+                )
+
+        return remaining_pks_by_type
+
     def _get_chunks(self, queryset) -> Iterable[tuple[dict[str, Any]]]:
         if not self.chunked_fetch:
             # The entire result will be stored in memory, so there is no
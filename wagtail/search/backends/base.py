@@ -1,15 +1,22 @@
 import datetime
+import uuid
 from warnings import warn
 
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
 from django.db.models.functions.datetime import Extract as ExtractDate
 from django.db.models.functions.datetime import ExtractYear
 from django.db.models.lookups import Lookup
 from django.db.models.query import QuerySet
 from django.db.models.sql.where import SubqueryConstraint, WhereNode
 
+from wagtail.coreutils import safe_md5
 from wagtail.search.index import class_is_indexed, get_indexed_models
 from wagtail.search.query import MATCH_ALL, PlainText
 
+RESULTS_CACHE_KEY_PREFIX = "wagtailsearch_results"
+RESULTS_CACHE_GENERATION_KEY_PREFIX = "wagtailsearch_results_generation"
+
 
 class FilterError(Exception):
     pass
@@ -308,9 +315,94 @@ class BaseSearchResults:
     def _do_count(self):
         raise NotImplementedError
 
+    def _get_results_cache_key(self, kind):
+        """
+        Returns the key that the results (or count, if ``kind`` is ``"count"``)
+        of this search are stored under in the backend's results cache, or
+        ``None`` if they shouldn't be cached.
+        """
+        if self.backend is None or self.backend.results_cache is None:
+            return None
+
+        query_compiler = self.query_compiler
+        queryset = query_compiler.queryset
+        try:
+            sql, params = queryset.query.get_compiler(queryset.db).as_sql()
+            query_repr = repr(query_compiler.query)
+        except (EmptyResultSet, NotImplementedError):
+            return None
+
+        key_hash = safe_md5(
+            repr(
+                (
+                    kind,
+                    type(query_compiler).__module__,
+                    type(query_compiler).__qualname__,
+                    queryset.db,
+                    sql,
+                    params,
+                    query_repr,
+                    query_compiler.fields,
+                    query_compiler.order_by_relevance,
+                    self.start,
+                    self.stop,
+                    self._score_field,
+                )
+            ).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        generation = self.backend.get_results_cache_generation(queryset.model)
+        return f"{RESULTS_CACHE_KEY_PREFIX}:{generation}:{key_hash}"
+
+    def _get_results_from_cache(self, pks_and_scores):
+        """
+        Fetches the objects for the primary keys (and scores) stored in the
+        results cache, in the same order
+        """
+        queryset = self.query_compiler.queryset
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+
+        objects = {
+            obj.pk: obj
+            for obj in queryset.filter(pk__in=[pk for pk, score in pks_and_scores])
+        }
+
+        results = []
+        for pk, score in pks_and_scores:
+            # Objects deleted since the results were cached are skipped
+            obj = objects.get(pk)
+            if obj is not None:
+                if self._score_field:
+                    setattr(obj, self._score_field, score)
+                results.append(obj)
+        return results
+
     def results(self):
         if self._results_cache is None:
-            self._results_cache = list(self._do_search())
+            cache_key = self._get_results_cache_key("results")
+            if cache_key is None:
+                self._results_cache = list(self._do_search())
+            else:
+                results_cache = self.backend.results_cache
+                pks_and_scores = results_cache.get(cache_key)
+                if pks_and_scores is not None:
+                    self._results_cache = self._get_results_from_cache(pks_and_scores)
+                else:
+                    self._results_cache = list(self._do_search())
+                    results_cache.set(
+                        cache_key,
+                        [
+                            (
+                                obj.pk,
+                                getattr(obj, self._score_field)
+                                if self._score_field
+                                else None,
+                            )
+                            for obj in self._results_cache
+                        ],
+                        self.backend.results_cache_timeout,
+                    )
         return self._results_cache
 
     def count(self):
@@ -318,7 +410,17 @@ class BaseSearchResults:
             if self._results_cache is not None:
                 self._count_cache = len(self._results_cache)
             else:
-                self._count_cache = self._do_count()
+                cache_key = self._get_results_cache_key("count")
+                if cache_key is not None:
+                    self._count_cache = self.backend.results_cache.get(cache_key)
+                if self._count_cache is None:
+                    self._count_cache = self._do_count()
+                    if cache_key is not None:
+                        self.backend.results_cache.set(
+                            cache_key,
+                            self._count_cache,
+                            self.backend.results_cache_timeout,
+                        )
         return self._count_cache
 
     def __getitem__(self, key):
@@ -400,6 +502,9 @@ class NullIndex:
     def delete_item(self, item):
         pass
 
+    def delete_stale_model_entries(self, model):
+        pass
+
 
 class BaseSearchBackend:
     query_compiler_class = None
@@ -407,9 +512,58 @@ class BaseSearchBackend:
     results_class = None
     rebuilder_class = None
     catch_indexing_errors = False
+    results_cache_alias = None
+    results_cache_timeout = 300
 
     def __init__(self, params):
-        pass
+        self.results_cache_alias = params.get("RESULTS_CACHE")
+        self.results_cache_timeout = params.get(
+            "RESULTS_CACHE_TIMEOUT", self.results_cache_timeout
+        )
+
+    @property
+    def results_cache(self):
+        """
+        The Django cache that search results are stored in, if enabled with the
+        ``RESULTS_CACHE`` option.
+        """
+        if self.results_cache_alias is None:
+            return None
+        return caches[self.results_cache_alias]
+
+    def _get_results_cache_generation_key(self, model):
+        root_model = get_model_root(model)
+        return ":".join(
+            [
+                RESULTS_CACHE_GENERATION_KEY_PREFIX,
+                type(self).__module__,
+                type(self).__qualname__,
+                str(getattr(self, "index_name", "")),
+                root_model._meta.label_lower,
+            ]
+        )
+
+    def get_results_cache_generation(self, model):
+        """
+        Returns the current generation of cached search results for ``model``,
+        which changes whenever objects sharing its root model are updated in
+        the index.
+        """
+        cache = self.results_cache
+        key = self._get_results_cache_generation_key(model)
+        generation = cache.get(key)
+        if generation is None:
+            cache.add(key, uuid.uuid4().hex, None)
+            generation = cache.get(key)
+        return generation
+
+    def clear_results_cache(self, model):
+        """
+        Invalidates the cached search results for ``model``, and all other
+        models that share its root model.
+        """
+        if self.results_cache is not None:
+            self.results_cache.delete(self._get_results_cache_generation_key(model))
 
     def get_index_for_model(self, model):
         return NullIndex()
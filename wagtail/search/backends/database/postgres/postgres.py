@@ -707,6 +707,10 @@ class PostgresSearchRebuilder:
 
 
 class PostgresSearchAtomicRebuilder(PostgresSearchRebuilder):
+    # The whole rebuild happens in one transaction, so it can't be split
+    # across worker processes or resumed (see the update_index command)
+    single_transaction = True
+
     def __init__(self, index):
         super().__init__(index)
         self.transaction = transaction.atomic(using=index.db_alias)
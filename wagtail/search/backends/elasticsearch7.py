@@ -1,6 +1,7 @@
 import json
 from collections import OrderedDict
 from copy import deepcopy
+from itertools import islice
 from urllib.parse import urlparse
 
 from django.db import DEFAULT_DB_ALIAS, models
@@ -9,7 +10,7 @@ from django.db.models.sql.constants import MULTI
 from django.utils.crypto import get_random_string
 from elasticsearch import VERSION as ELASTICSEARCH_VERSION
 from elasticsearch import Elasticsearch, NotFoundError
-from elasticsearch.helpers import bulk
+from elasticsearch.helpers import bulk, scan
 
 from wagtail.search.backends.base import (
     BaseSearchBackend,
@@ -445,6 +446,44 @@ class Elasticsearch7Index:
         except NotFoundError:
             pass  # Document doesn't exist, ignore this exception
 
+    def delete_stale_model_entries(self, model, chunk_size=1000):
+        """
+        Delete the documents of ``model`` and its subclasses whose objects no longer
+        exist in the database.
+        """
+        # Get mapping
+        mapping = self.mapping_class(model)
+
+        # Fetch the ids of all documents for the model, without their contents
+        hits = scan(
+            self.es,
+            index=self.name,
+            query={
+                "query": {"match": {"content_type": mapping.get_content_type()}},
+                "_source": False,
+            },
+            size=chunk_size,
+        )
+
+        while True:
+            document_ids = [hit["_id"] for hit in islice(hits, chunk_size)]
+            if not document_ids:
+                break
+
+            existing_ids = {
+                str(pk)
+                for pk in model._default_manager.filter(
+                    pk__in=document_ids
+                ).values_list("pk", flat=True)
+            }
+            actions = [
+                {"_op_type": "delete", "_id": document_id}
+                for document_id in document_ids
+                if document_id not in existing_ids
+            ]
+            if actions:
+                bulk(self.es, actions, index=self.name, raise_on_error=False)
+
     def reset(self):
         # Delete old index
         self.delete()
@@ -1,7 +1,9 @@
 import inspect
 import logging
+from collections import defaultdict
 
 from django.apps import apps
+from django.conf import settings
 from django.core import checks
 from django.core.exceptions import FieldDoesNotExist
 from django.db import models
@@ -9,6 +11,7 @@ from django.db.models.fields.related import ForeignObjectRel, OneToOneRel, Relat
 from modelcluster.fields import ParentalManyToManyField
 
 from wagtail.search.backends import get_search_backends_with_name
+from wagtail.utils.pending_updates import DeferredUpdates
 
 logger = logging.getLogger("wagtail.search.index")
 
@@ -85,6 +88,15 @@ class Indexed:
 
         return queryset
 
+    @classmethod
+    def get_indexed_objects_modified_since(cls, since):
+        """
+        Return the indexed objects that may have changed since the ``since``
+        datetime, for ``update_index --since``. Override this for models that record
+        when they were last modified; by default, all indexed objects are returned.
+        """
+        return cls.get_indexed_objects()
+
     def get_indexed_instance(self):
         """
         If the indexed model uses multi table inheritance, override this method
@@ -170,6 +182,7 @@ def insert_or_update_object(instance):
         ):
             try:
                 backend.add(indexed_instance)
+                backend.clear_results_cache(type(indexed_instance))
             except Exception:
                 # Log all errors
                 logger.exception(
@@ -198,6 +211,7 @@ def remove_object(instance):
         ):
             try:
                 backend.delete(indexed_instance)
+                backend.clear_results_cache(type(indexed_instance))
             except Exception:
                 # Log all errors
                 logger.exception(
@@ -212,6 +226,100 @@ def remove_object(instance):
                     raise
 
 
+def insert_or_update_objects(model, pks, chunk_size=1000):
+    """
+    Bring the index entries for the objects of ``model`` with the given primary keys
+    up to date, adding them to the index in bulk. Objects that no longer exist in the
+    database are removed from the index.
+    """
+    pks = list(pks)
+    for i in range(0, len(pks), chunk_size):
+        _insert_or_update_objects_chunk(model, pks[i : i + chunk_size])
+
+
+def _insert_or_update_objects_chunk(model, pks):
+    deleted_pks = set(pks)
+
+    # Find the class each object is indexed as (such as the specific class of a page)
+    pks_by_indexed_model = defaultdict(list)
+    for obj in model._default_manager.filter(pk__in=pks):
+        deleted_pks.discard(obj.pk)
+        indexed_instance = get_indexed_instance(obj, check_exists=False)
+        if indexed_instance:
+            pks_by_indexed_model[type(indexed_instance)].append(indexed_instance.pk)
+
+    # Make sure that the objects are in their class's indexed objects
+    objects_by_model = {
+        indexed_model: list(
+            indexed_model.get_indexed_objects().filter(pk__in=indexed_model_pks)
+        )
+        for indexed_model, indexed_model_pks in pks_by_indexed_model.items()
+    }
+
+    for backend_name, backend in get_search_backends_with_name(with_auto_update=True):
+        try:
+            for indexed_model, objects in objects_by_model.items():
+                if objects:
+                    backend.add_bulk(indexed_model, objects)
+            for pk in deleted_pks:
+                backend.delete(model(pk=pk))
+            backend.clear_results_cache(model)
+        except Exception:
+            # Log all errors
+            logger.exception(
+                "Exception raised while updating %s objects in the '%s' search backend",
+                model._meta.label,
+                backend_name,
+            )
+
+            # Only catch the exception if the backend requires this
+            # See the comments in insert_or_update_object for an explanation
+            if not backend.catch_indexing_errors:
+                raise
+
+
+def get_index_update_mode():
+    """
+    Returns how the index is updated when indexed objects are saved or deleted,
+    as configured by the ``WAGTAILSEARCH_INDEX_UPDATE_MODE`` setting:
+
+    - ``"immediate"`` - each object is updated in the index as soon as it is saved
+    - ``"deferred"`` - changed objects are collected and updated in bulk once the
+      current transaction is committed
+    - ``"queue"`` - changed objects are added to a queue in the database, to be
+      updated by the ``update_index --drain-queue`` management command
+    """
+    return getattr(settings, "WAGTAILSEARCH_INDEX_UPDATE_MODE", "immediate")
+
+
+_deferred_updates = DeferredUpdates(insert_or_update_objects)
+
+
+def defer_update_object(instance, using=None):
+    """
+    Schedule the index entry for ``instance`` to be updated (or removed, if the
+    object no longer exists), according to the index update mode. Changes to the
+    same object are coalesced into a single update.
+    """
+    model = type(instance)
+
+    if get_index_update_mode() == "queue":
+        from wagtail.search.models import PendingIndexUpdate
+
+        PendingIndexUpdate.enqueue(model, [instance.pk], using=using)
+        return
+
+    _deferred_updates.add(model, instance.pk, using=using)
+
+
+def flush_deferred_updates(using=None):
+    """
+    Update the index for all the objects whose updates have been deferred by
+    ``defer_update_object()`` for the given database connection.
+    """
+    _deferred_updates.flush(using)
+
+
 class BaseField:
     def __init__(self, field_name, **kwargs):
         self.field_name = field_name
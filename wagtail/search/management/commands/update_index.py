@@ -1,11 +1,23 @@
 import collections
+import datetime
+import functools
 
+from django.apps import apps
 from django.conf import settings
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
 
 from wagtail.search.backends import get_search_backend
-from wagtail.search.index import get_indexed_models
+from wagtail.search.index import (
+    class_is_indexed,
+    get_indexed_models,
+    insert_or_update_objects,
+)
+from wagtail.search.models import IndexRebuildCheckpoint, PendingIndexUpdate
+from wagtail.utils.pending_updates import drain_pending_updates
+from wagtail.utils.pk_ranges import process_in_ranges
 
 DEFAULT_CHUNK_SIZE = 1000
 
@@ -53,6 +65,44 @@ def group_models_by_index(backend, models):
     )
 
 
+def get_rebuild_index(backend, model, index_name):
+    """
+    Return the index named ``index_name`` that ``model`` is being rebuilt into. This
+    may be a new index created by an atomic rebuild, rather than the model's
+    current index.
+    """
+    index = backend.get_index_for_model(model)
+    if index.name != index_name:
+        index = backend.index_class(backend, index_name)
+    return index
+
+
+def index_objects(index, model, after_pk, last_pk):
+    """
+    Add the indexed objects of ``model`` with primary keys after ``after_pk`` (if
+    given), up to and including ``last_pk``, to ``index``. Returns the number of
+    objects indexed.
+    """
+    queryset = model.get_indexed_objects().filter(pk__lte=last_pk).order_by("pk")
+    if after_pk is not None:
+        queryset = queryset.filter(pk__gt=after_pk)
+
+    items = list(queryset)
+    if items:
+        index.add_items(model, items)
+    return len(items)
+
+
+def index_objects_in_worker(backend_name, index_name, model_label, after_pk, last_pk):
+    """
+    Run ``index_objects()`` in a worker process, for ``update_index --workers``.
+    """
+    backend = get_search_backend(backend_name)
+    model = apps.get_model(model_label)
+    index = get_rebuild_index(backend, model, index_name)
+    return index_objects(index, model, after_pk, last_pk)
+
+
 class Command(BaseCommand):
     def write(self, *args, **kwargs):
         """Helper function that respects verbosity when printing."""
@@ -60,7 +110,12 @@ class Command(BaseCommand):
             self.stdout.write(*args, **kwargs)
 
     def update_backend(
-        self, backend_name, schema_only=False, chunk_size=DEFAULT_CHUNK_SIZE
+        self,
+        backend_name,
+        schema_only=False,
+        chunk_size=DEFAULT_CHUNK_SIZE,
+        workers=1,
+        resume=False,
     ):
         self.write("Updating backend: " + backend_name)
 
@@ -79,9 +134,52 @@ class Command(BaseCommand):
         for index, models in models_grouped_by_index:
             self.write(backend_name + ": Rebuilding index %s" % index.name)
 
-            # Start rebuild
             rebuilder = backend.rebuilder_class(index)
-            index = rebuilder.start()
+            index_name = index.name
+
+            if (workers > 1 or resume) and getattr(
+                rebuilder, "single_transaction", False
+            ):
+                raise CommandError(
+                    "The '%s' backend rebuilds indexes in a single transaction, "
+                    "so --workers and --resume cannot be used with it" % backend_name
+                )
+
+            checkpoints = {}
+            if resume:
+                checkpoints = {
+                    checkpoint.model: checkpoint
+                    for checkpoint in IndexRebuildCheckpoint.objects.filter(
+                        backend_name=backend_name, index_name=index_name
+                    )
+                }
+
+            if checkpoints:
+                # Continue populating the index from the interrupted rebuild
+                rebuild_index_name = next(iter(checkpoints.values())).rebuild_index_name
+                self.write(
+                    backend_name
+                    + ": Resuming rebuild into index %s" % rebuild_index_name
+                )
+                if rebuilder.index.name != rebuild_index_name:
+                    rebuilder.index = get_rebuild_index(
+                        backend, models[0], rebuild_index_name
+                    )
+                index = rebuilder.index
+            else:
+                # Start rebuild
+                index = rebuilder.start()
+
+                if resume:
+                    checkpoints = {
+                        model._meta.label: IndexRebuildCheckpoint.objects.create(
+                            backend_name=backend_name,
+                            index_name=index_name,
+                            rebuild_index_name=index.name,
+                            model=model._meta.label,
+                        )
+                        for model in models
+                    }
 
             # Add models
             for model in models:
@@ -98,23 +196,105 @@ class Command(BaseCommand):
                         ending="",
                     )
 
-                    # Add items (chunk_size at a time)
-                    for chunk in self.print_iter_progress(
-                        self.queryset_chunks(
-                            model.get_indexed_objects().order_by("pk"), chunk_size
+                    if workers > 1 or resume:
+                        object_count += self.index_model_in_ranges(
+                            backend_name,
+                            index,
+                            model,
+                            chunk_size=chunk_size,
+                            workers=workers,
+                            checkpoint=checkpoints.get(model._meta.label),
                         )
-                    ):
-                        index.add_items(model, chunk)
-                        object_count += len(chunk)
+                    else:
+                        # Add items (chunk_size at a time)
+                        for chunk in self.print_iter_progress(
+                            self.queryset_chunks(
+                                model.get_indexed_objects().order_by("pk"),
+                                chunk_size,
+                            )
+                        ):
+                            index.add_items(model, chunk)
+                            object_count += len(chunk)
 
                     self.print_newline()
 
-            # Finish rebuild
+            # Finish rebuild, once all objects have been indexed
             rebuilder.finish()
+            for model in models:
+                backend.clear_results_cache(model)
+
+            if resume:
+                IndexRebuildCheckpoint.objects.filter(
+                    backend_name=backend_name, index_name=index_name
+                ).delete()
 
             self.write(backend_name + ": indexed %d objects" % object_count)
             self.print_newline()
 
+    def update_backend_since(self, backend_name, since, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update the index for objects that have been modified since the ``since``
+        datetime, and remove entries for objects that have been deleted, without
+        rebuilding the index.
+        """
+        self.write("Updating backend: " + backend_name)
+
+        backend = get_search_backend(backend_name)
+        object_count = 0
+
+        for model in get_indexed_models():
+            index = backend.get_index_for_model(model)
+            if not index:
+                continue
+
+            self.write(
+                "{}: {}.{} ".format(
+                    backend_name, model._meta.app_label, model.__name__
+                ).ljust(35),
+                ending="",
+            )
+
+            for chunk in self.print_iter_progress(
+                self.queryset_chunks(
+                    model.get_indexed_objects_modified_since(since).order_by("pk"),
+                    chunk_size,
+                )
+            ):
+                index.add_items(model, chunk)
+                object_count += len(chunk)
+
+            self.print_newline()
+
+            # Entries for subclasses are removed along with their root model's
+            if not model._meta.parents and hasattr(index, "delete_stale_model_entries"):
+                index.delete_stale_model_entries(model)
+
+            backend.clear_results_cache(model)
+
+        self.write(backend_name + ": updated %d objects" % object_count)
+        self.print_newline()
+
+    def index_model_in_ranges(
+        self, backend_name, index, model, chunk_size, workers=1, checkpoint=None
+    ):
+        """
+        Index the objects of ``model`` one range of primary keys at a time, across
+        ``workers`` processes. If a ``checkpoint`` is given, indexing starts after
+        its last primary key, and it is updated as each range is completed.
+        Returns the number of objects indexed.
+        """
+        return process_in_ranges(
+            model.get_indexed_objects(),
+            functools.partial(index_objects, index, model),
+            functools.partial(
+                index_objects_in_worker, backend_name, index.name, model._meta.label
+            ),
+            chunk_size,
+            workers=workers,
+            checkpoint=checkpoint,
+            progress=self.print_iter_progress,
+        )
+
     def add_arguments(self, parser):
         parser.add_argument(
             "--backend",
@@ -130,6 +310,35 @@ class Command(BaseCommand):
             default=False,
             help="Prevents loading any data into the index",
         )
+        parser.add_argument(
+            "--workers",
+            action="store",
+            dest="workers",
+            default=1,
+            type=int,
+            help="Split the objects of each model across this number of worker processes",
+        )
+        parser.add_argument(
+            "--resume",
+            action="store_true",
+            dest="resume",
+            default=False,
+            help="Record the progress of the rebuild, and continue a previous rebuild that was interrupted",
+        )
+        parser.add_argument(
+            "--since",
+            action="store",
+            dest="since",
+            default=None,
+            help="Update the objects modified since this date or time (in ISO 8601 format) and remove deleted objects, instead of rebuilding the index",
+        )
+        parser.add_argument(
+            "--drain-queue",
+            action="store_true",
+            dest="drain_queue",
+            default=False,
+            help="Update the objects queued for indexing by the 'queue' index update mode, instead of rebuilding the index",
+        )
         parser.add_argument(
             "--chunk_size",
             action="store",
@@ -142,6 +351,10 @@ class Command(BaseCommand):
     def handle(self, **options):
         self.verbosity = options["verbosity"]
 
+        if options.get("drain_queue"):
+            self.drain_queue(chunk_size=options.get("chunk_size"))
+            return
+
         # Get list of backends to index
         if options["backend_name"]:
             # index only the passed backend
@@ -153,14 +366,59 @@ class Command(BaseCommand):
             # index the 'default' backend only
             backend_names = ["default"]
 
+        if options.get("since"):
+            since = self.parse_since(options["since"])
+            for backend_name in backend_names:
+                self.update_backend_since(
+                    backend_name, since, chunk_size=options.get("chunk_size")
+                )
+            return
+
         # Update backends
         for backend_name in backend_names:
             self.update_backend(
                 backend_name,
                 schema_only=options.get("schema_only", False),
                 chunk_size=options.get("chunk_size"),
+                workers=options.get("workers") or 1,
+                resume=options.get("resume", False),
+            )
+
+    def parse_since(self, value):
+        try:
+            since = parse_datetime(value)
+            if since is None:
+                since_date = parse_date(value)
+                if since_date is not None:
+                    since = datetime.datetime.combine(since_date, datetime.time())
+        except ValueError:
+            since = None
+
+        if since is None:
+            raise CommandError(
+                "'%s' is not a valid ISO 8601 date or time for --since" % value
             )
 
+        if settings.USE_TZ and timezone.is_naive(since):
+            since = timezone.make_aware(since)
+        return since
+
+    def drain_queue(self, chunk_size=DEFAULT_CHUNK_SIZE):
+        """
+        Update the index for all objects in the ``PendingIndexUpdate`` queue, in
+        the order they were queued, removing them from the queue once updated.
+        """
+
+        def update_objects(model, pks):
+            if class_is_indexed(model):
+                insert_or_update_objects(model, pks, chunk_size=chunk_size)
+
+        object_count = drain_pending_updates(
+            PendingIndexUpdate, update_objects, chunk_size
+        )
+
+        self.write("Updated %d queued objects" % object_count)
+
     def print_newline(self):
         self.write("")
 
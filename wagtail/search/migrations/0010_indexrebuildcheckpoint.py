@@ -0,0 +1,37 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailsearch", "0009_pendingindexupdate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IndexRebuildCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("backend_name", models.CharField(max_length=255)),
+                ("index_name", models.CharField(max_length=255)),
+                ("rebuild_index_name", models.CharField(max_length=255)),
+                ("model", models.CharField(max_length=255)),
+                ("last_pk", models.CharField(max_length=255, null=True)),
+                ("completed", models.BooleanField(default=False)),
+            ],
+            options={
+                "verbose_name": "index rebuild checkpoint",
+                "verbose_name_plural": "index rebuild checkpoints",
+                "unique_together": {("backend_name", "index_name", "model")},
+            },
+        ),
+    ]
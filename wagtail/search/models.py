@@ -8,6 +8,8 @@ from django.db.models.functions import Cast
 from django.db.models.sql.where import WhereNode
 from django.utils.translation import gettext_lazy as _
 
+from wagtail.models.pending_updates import AbstractPendingUpdate
+
 from .index import class_is_indexed
 from .utils import get_descendants_content_types_pks
 
@@ -173,3 +175,39 @@ class IndexEntry(AbstractIndexEntry):
         """
 
         abstract = False
+
+
+class PendingIndexUpdate(AbstractPendingUpdate):
+    """
+    An object that has changed and needs to be updated in the search index, when
+    ``WAGTAILSEARCH_INDEX_UPDATE_MODE`` is set to ``"queue"``. The queue is processed
+    by the ``update_index --drain-queue`` management command.
+    """
+
+    for_concrete_model = False
+
+    class Meta(AbstractPendingUpdate.Meta):
+        verbose_name = _("pending index update")
+        verbose_name_plural = _("pending index updates")
+
+
+class IndexRebuildCheckpoint(models.Model):
+    """
+    Records the progress of rebuilding a search index with ``update_index --resume``,
+    so that an interrupted rebuild can continue where it stopped.
+    """
+
+    backend_name = models.CharField(max_length=255)
+    index_name = models.CharField(max_length=255)
+    # The name of the index being populated, which may differ from ``index_name``
+    # when the backend rebuilds the index atomically into a new index
+    rebuild_index_name = models.CharField(max_length=255)
+    model = models.CharField(max_length=255)
+    # The primary key of the last object to be indexed, in primary key order
+    last_pk = models.CharField(max_length=255, null=True)
+    completed = models.BooleanField(default=False)
+
+    class Meta:
+        verbose_name = _("index rebuild checkpoint")
+        verbose_name_plural = _("index rebuild checkpoints")
+        unique_together = [("backend_name", "index_name", "model")]
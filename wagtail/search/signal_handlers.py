@@ -4,6 +4,12 @@ from wagtail.search import index
 
 
 def post_save_signal_handler(instance, update_fields=None, **kwargs):
+    if index.get_index_update_mode() != "immediate":
+        # The instance is fetched from the database when the update is made,
+        # so there is no need to refresh it here
+        index.defer_update_object(instance, using=kwargs.get("using"))
+        return
+
     if update_fields is not None:
         # fetch a fresh copy of instance from the database to ensure
         # that we're not indexing any of the unsaved data contained in
@@ -14,6 +20,10 @@ def post_save_signal_handler(instance, update_fields=None, **kwargs):
 
 
 def post_delete_signal_handler(instance, **kwargs):
+    if index.get_index_update_mode() != "immediate":
+        index.defer_update_object(instance, using=kwargs.get("using"))
+        return
+
     index.remove_object(instance)
 
 
@@ -17,7 +17,10 @@ from wagtail.search.backends import (
     get_search_backends,
 )
 from wagtail.search.backends.base import BaseSearchBackend, FieldError, FilterFieldError
-from wagtail.search.backends.database.fallback import DatabaseSearchBackend
+from wagtail.search.backends.database.fallback import (
+    DatabaseSearchBackend,
+    DatabaseSearchResults,
+)
 from wagtail.search.backends.database.sqlite.utils import fts5_available
 from wagtail.search.models import IndexEntry
 from wagtail.search.query import (
@@ -1176,3 +1179,109 @@ class TestBackendLoader(TestCase):
         backends = list(get_search_backends())
 
         self.assertEqual(len(backends), 1)
+
+
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {
+            "BACKEND": "wagtail.search.backends.database.fallback",
+            "RESULTS_CACHE": "search_results",
+        },
+    },
+    CACHES={
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"},
+        "search_results": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    },
+)
+class TestSearchResultsCache(TestCase):
+    fixtures = ["search"]
+
+    def setUp(self):
+        self.backend = get_search_backend()
+        self.backend.results_cache.clear()
+
+    def tearDown(self):
+        self.backend.results_cache.clear()
+
+    def test_results_cached(self):
+        first_results = list(self.backend.search("JavaScript", models.Book))
+
+        with mock.patch.object(
+            DatabaseSearchResults, "_do_search", side_effect=AssertionError
+        ):
+            # Only a single query to fetch the objects by ID
+            with self.assertNumQueries(1):
+                results = list(self.backend.search("JavaScript", models.Book))
+
+        self.assertEqual(results, first_results)
+        self.assertEqual(len(results), 2)
+
+    def test_count_cached(self):
+        self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 2)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 2)
+
+    def test_cached_results_keep_order(self):
+        queryset = models.Book.objects.order_by("-number_of_pages")
+        first_results = list(
+            self.backend.search(MATCH_ALL, queryset, order_by_relevance=False)
+        )
+        results = list(
+            self.backend.search(MATCH_ALL, queryset, order_by_relevance=False)
+        )
+        self.assertEqual(results, first_results)
+
+    def test_different_searches_cached_separately(self):
+        results = self.backend.search(MATCH_ALL, models.Book.objects.order_by("pk"))
+        self.assertEqual(len(results[:2]), 2)
+        self.assertEqual(len(results[2:4]), 2)
+        self.assertNotEqual(list(results[:2]), list(results[2:4]))
+        self.assertNotEqual(
+            list(self.backend.search("JavaScript", models.Book)),
+            list(self.backend.search("Python", models.Book)),
+        )
+        self.assertNotEqual(
+            self.backend.search(
+                MATCH_ALL, models.Book.objects.filter(number_of_pages__lt=200)
+            ).count(),
+            self.backend.search(
+                MATCH_ALL, models.Book.objects.filter(number_of_pages__gte=200)
+            ).count(),
+        )
+
+    def test_index_update_invalidates_cache(self):
+        self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 2)
+
+        book = models.Book.objects.get(title="JavaScript: The good parts")
+        book.title = "ECMAScript: The good parts"
+        book.save()
+
+        self.assertEqual(self.backend.search("JavaScript", models.Book).count(), 1)
+
+    def test_index_delete_invalidates_cache(self):
+        self.assertEqual(len(self.backend.search("JavaScript", models.Book)), 2)
+
+        models.Book.objects.get(title="JavaScript: The good parts").delete()
+
+        self.assertEqual(len(self.backend.search("JavaScript", models.Book)), 1)
+
+    @override_settings(
+        WAGTAILSEARCH_BACKENDS={
+            "default": {
+                "BACKEND": "wagtail.search.backends.database.fallback",
+            },
+        }
+    )
+    def test_not_cached_by_default(self):
+        backend = get_search_backend()
+        self.assertIsNone(backend.results_cache)
+        backend.search("JavaScript", models.Book).count()
+
+        with mock.patch.object(
+            DatabaseSearchResults, "_do_count", return_value=5
+        ) as do_count:
+            self.assertEqual(backend.search("JavaScript", models.Book).count(), 5)
+        do_count.assert_called_once()
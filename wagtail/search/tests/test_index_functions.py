@@ -1,10 +1,14 @@
-from datetime import date
+from datetime import date, timedelta
+from io import StringIO
 from unittest import mock
 
+from django.core import management
+from django.db import transaction
 from django.test import TestCase, override_settings
 
 from wagtail.models import Page
 from wagtail.search import index
+from wagtail.search.models import PendingIndexUpdate
 from wagtail.test.search import models
 from wagtail.test.testapp.models import SimplePage
 from wagtail.test.utils import WagtailTestUtils
@@ -203,6 +207,263 @@ class TestSignalHandlers(WagtailTestUtils, TestCase):
         self.assertEqual(indexed_object.publication_date, date(2017, 10, 18))
 
 
+@mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {"BACKEND": "wagtail.search.tests.DummySearchBackend"}
+    }
+)
+class TestInsertOrUpdateObjects(WagtailTestUtils, TestCase):
+    def test_adds_objects_in_bulk(self, backend):
+        book_1 = models.Book.objects.create(
+            title="Test 1", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        book_2 = models.Book.objects.create(
+            title="Test 2", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        backend().reset_mock()
+
+        index.insert_or_update_objects(models.Book, [book_1.pk, book_2.pk])
+
+        backend().add_bulk.assert_called_once()
+        model, objects = backend().add_bulk.call_args[0]
+        self.assertEqual(model, models.Book)
+        self.assertEqual(set(objects), {book_1, book_2})
+        self.assertFalse(backend().delete.mock_calls)
+
+    def test_converts_to_specific_page(self, backend):
+        root_page = Page.objects.get(id=1)
+        page = root_page.add_child(
+            instance=SimplePage(title="test", slug="test", content="test")
+        )
+        backend().reset_mock()
+
+        index.insert_or_update_objects(Page, [page.pk])
+
+        backend().add_bulk.assert_called_once_with(SimplePage, [page])
+
+    def test_removes_missing_objects(self, backend):
+        backend().reset_mock()
+
+        index.insert_or_update_objects(models.Book, [123])
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        backend().delete.assert_called_once()
+        removed_object = backend().delete.call_args[0][0]
+        self.assertIsInstance(removed_object, models.Book)
+        self.assertEqual(removed_object.pk, 123)
+
+    def test_catches_index_error(self, backend):
+        models.Book.objects.create(
+            title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        backend().add_bulk.side_effect = ValueError("Test")
+        backend().reset_mock()
+
+        with self.assertLogs("wagtail.search.index", level="ERROR") as cm:
+            index.insert_or_update_objects(
+                models.Book, models.Book.objects.values_list("pk", flat=True)
+            )
+
+        self.assertIn(
+            "Exception raised while updating searchtests.Book objects in the 'default' search backend",
+            cm.output[0],
+        )
+
+
+@mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {"BACKEND": "wagtail.search.tests.DummySearchBackend"}
+    },
+    WAGTAILSEARCH_INDEX_UPDATE_MODE="deferred",
+)
+class TestDeferredSignalHandlers(WagtailTestUtils, TestCase):
+    def get_flush_callbacks(self, callbacks):
+        return [
+            callback
+            for callback in callbacks
+            if getattr(callback, "func", None) == index._deferred_updates.flush
+        ]
+
+    def test_one_callback_per_transaction(self, backend):
+        with self.captureOnCommitCallbacks() as callbacks:
+            for i in range(3):
+                models.Book.objects.create(
+                    title=f"Test {i}",
+                    publication_date=date(2017, 10, 18),
+                    number_of_pages=100,
+                )
+
+        self.assertEqual(len(self.get_flush_callbacks(callbacks)), 1)
+
+    def test_callback_registered_again_after_rollback(self, backend):
+        backend().reset_mock()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            try:
+                with transaction.atomic():
+                    models.Book.objects.create(
+                        title="Rolled back",
+                        publication_date=date(2017, 10, 18),
+                        number_of_pages=100,
+                    )
+                    raise ValueError
+            except ValueError:
+                pass
+
+            book = models.Book.objects.create(
+                title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+            )
+
+        # The callback registered in the rolled back savepoint was discarded
+        flush_callbacks = self.get_flush_callbacks(callbacks)
+        self.assertEqual(len(flush_callbacks), 1)
+
+        flush_callbacks[0]()
+        backend().add_bulk.assert_called_once_with(models.Book, [book])
+
+    def test_updates_are_coalesced_until_commit(self, backend):
+        backend().reset_mock()
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            book = models.Book.objects.create(
+                title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+            )
+            book.title = "Updated test"
+            book.save()
+            book.save(update_fields=["title"])
+
+        # Nothing is sent to the backend until the transaction is committed
+        self.assertFalse(backend().add.mock_calls)
+        self.assertFalse(backend().add_bulk.mock_calls)
+
+        for callback in callbacks:
+            callback()
+
+        backend().add_bulk.assert_called_once()
+        model, objects = backend().add_bulk.call_args[0]
+        self.assertEqual(model, models.Book)
+        self.assertEqual(objects, [book])
+        self.assertEqual(objects[0].title, "Updated test")
+        self.assertFalse(backend().add.mock_calls)
+
+    def test_delete(self, backend):
+        with self.captureOnCommitCallbacks(execute=True):
+            book = models.Book.objects.create(
+                title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+            )
+        book_pk = book.pk
+        backend().reset_mock()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book.delete()
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        backend().delete.assert_called_once()
+        self.assertEqual(backend().delete.call_args[0][0].pk, book_pk)
+
+
+@mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {"BACKEND": "wagtail.search.tests.DummySearchBackend"}
+    },
+    WAGTAILSEARCH_INDEX_UPDATE_MODE="queue",
+)
+class TestIndexUpdateQueue(WagtailTestUtils, TestCase):
+    def drain_queue(self):
+        management.call_command("update_index", drain_queue=True, stdout=StringIO())
+
+    def test_changes_are_queued(self, backend):
+        backend().reset_mock()
+        book = models.Book.objects.create(
+            title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        book.save()
+
+        self.assertFalse(backend().add.mock_calls)
+        self.assertEqual(
+            list(PendingIndexUpdate.objects.values_list("object_id", flat=True)),
+            [str(book.pk)],
+        )
+
+        self.drain_queue()
+
+        backend().add_bulk.assert_called_once_with(models.Book, [book])
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_drain_removes_deleted_objects(self, backend):
+        book = models.Book.objects.create(
+            title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        book_pk = book.pk
+        book.delete()
+        backend().reset_mock()
+
+        self.drain_queue()
+
+        self.assertFalse(backend().add_bulk.mock_calls)
+        backend().delete.assert_called_once()
+        self.assertEqual(backend().delete.call_args[0][0].pk, book_pk)
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+    def test_requeued_entries_are_kept(self, backend):
+        book = models.Book.objects.create(
+            title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+
+        def requeue(*args):
+            # Simulate the object being saved again while it is being indexed
+            PendingIndexUpdate.enqueue(models.Book, [book.pk])
+
+        backend().add_bulk.side_effect = requeue
+
+        self.drain_queue()
+
+        self.assertEqual(PendingIndexUpdate.objects.count(), 1)
+
+    def test_entries_requeued_before_delete_are_kept(self, backend):
+        book = models.Book.objects.create(
+            title="Test", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        entry = PendingIndexUpdate.objects.get()
+
+        def requeue(*args):
+            # Simulate the object being queued again by a transaction that started
+            # before the drain read the entry, and is committed while it's indexed
+            PendingIndexUpdate.objects.filter(pk=entry.pk).update(
+                queued_at=entry.queued_at - timedelta(seconds=1)
+            )
+
+        backend().add_bulk.side_effect = requeue
+
+        self.drain_queue()
+
+        backend().add_bulk.assert_called_once_with(models.Book, [book])
+        self.assertEqual(PendingIndexUpdate.objects.count(), 1)
+
+    def test_drain_more_than_a_chunk(self, backend):
+        books = models.Book.objects.bulk_create(
+            [
+                models.Book(
+                    title=f"Test {i}",
+                    publication_date=date(2017, 10, 18),
+                    number_of_pages=100,
+                )
+                for i in range(1199)
+            ]
+        )
+        PendingIndexUpdate.enqueue(models.Book, [book.pk for book in books])
+
+        self.drain_queue()
+
+        self.assertEqual(
+            sum(len(call[0][1]) for call in backend().add_bulk.call_args_list), 1199
+        )
+        self.assertFalse(PendingIndexUpdate.objects.exists())
+
+
 @mock.patch("wagtail.search.tests.DummySearchBackend", create=True)
 @override_settings(
     WAGTAILSEARCH_BACKENDS={
@@ -0,0 +1,227 @@
+from concurrent.futures import Executor
+from datetime import date, datetime, timezone
+from io import StringIO
+from unittest import mock
+
+from django.core import management
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from wagtail.models import Page
+from wagtail.search.backends.base import BaseSearchBackend
+from wagtail.search.models import IndexRebuildCheckpoint
+from wagtail.test.search import models
+from wagtail.test.testapp.models import SimplePage
+
+
+class RecordingIndex:
+    # Objects added to each index, keyed by index name
+    items = {}
+
+    def __init__(self, backend, name):
+        self.backend = backend
+        self.name = name
+
+    def add_model(self, model):
+        pass
+
+    def add_item(self, item):
+        pass
+
+    def delete_stale_model_entries(self, model):
+        self.items.setdefault(self.name + "_stale_models", []).append(model)
+
+    def add_items(self, model, items):
+        self.items.setdefault(self.name, []).extend(item.pk for item in items)
+
+
+class RecordingRebuilder:
+    def __init__(self, index):
+        self.alias = index
+        self.index = RecordingIndex(index.backend, index.name + "_new")
+
+    def start(self):
+        self.index.items[self.index.name] = []
+        return self.index
+
+    def finish(self):
+        self.index.items[self.alias.name] = self.index.items.pop(self.index.name)
+
+
+class SearchBackend(BaseSearchBackend):
+    """
+    A search backend that rebuilds its index atomically into a new index, and
+    records the objects that were added to it.
+    """
+
+    index_class = RecordingIndex
+    rebuilder_class = RecordingRebuilder
+
+    def __init__(self, params):
+        super().__init__(params)
+        self.index_pages = params.get("INDEX_PAGES", False)
+
+    def get_index_for_model(self, model):
+        if model is models.Book:
+            return RecordingIndex(self, "books")
+        if self.index_pages and issubclass(model, Page):
+            return RecordingIndex(self, "pages")
+
+
+class SynchronousExecutor(Executor):
+    """
+    Runs the tasks submitted to it in the current process, so that they can see
+    the test database.
+    """
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def map(self, fn, *iterables):
+        for args in zip(*iterables):
+            self.calls += 1
+            if self.fail_after is not None and self.calls > self.fail_after:
+                raise RuntimeError("Worker crashed")
+            yield fn(*args)
+
+
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {"BACKEND": "wagtail.search.tests.test_update_index"}
+    }
+)
+class TestParallelUpdateIndex(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.books = [
+            models.Book.objects.create(
+                title=f"Book {i}",
+                publication_date=date(2017, 10, 18),
+                number_of_pages=100,
+            )
+            for i in range(7)
+        ]
+
+    def setUp(self):
+        RecordingIndex.items.clear()
+
+    def run_command(self, **options):
+        management.call_command(
+            "update_index", chunk_size=2, stdout=StringIO(), **options
+        )
+
+    def test_workers(self):
+        executor = SynchronousExecutor()
+        with mock.patch(
+            "wagtail.utils.pk_ranges.get_executor",
+            return_value=executor,
+        ):
+            self.run_command(workers=3)
+
+        # Each range of two books was sent to the workers
+        self.assertEqual(executor.calls, 4)
+        self.assertEqual(
+            RecordingIndex.items, {"books": [book.pk for book in self.books]}
+        )
+
+    def test_resume(self):
+        # The first run fails after indexing two ranges of books
+        with mock.patch(
+            "wagtail.utils.pk_ranges.get_executor",
+            return_value=SynchronousExecutor(fail_after=2),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.run_command(workers=3, resume=True)
+
+        # The index has not been swapped in
+        self.assertNotIn("books", RecordingIndex.items)
+        checkpoint = IndexRebuildCheckpoint.objects.get(
+            backend_name="default", index_name="books"
+        )
+        self.assertEqual(checkpoint.rebuild_index_name, "books_new")
+        self.assertEqual(checkpoint.last_pk, str(self.books[3].pk))
+        self.assertFalse(checkpoint.completed)
+
+        # Resuming indexes the remaining books into the same index
+        self.run_command(resume=True)
+
+        self.assertEqual(
+            RecordingIndex.items, {"books": [book.pk for book in self.books]}
+        )
+        self.assertFalse(IndexRebuildCheckpoint.objects.exists())
+
+    @override_settings(
+        WAGTAILSEARCH_BACKENDS={
+            "default": {
+                "BACKEND": "wagtail.search.backends.database.sqlite.sqlite",
+                "ATOMIC_REBUILD": True,
+            }
+        }
+    )
+    def test_single_transaction_rebuilder(self):
+        with self.assertRaises(CommandError):
+            self.run_command(workers=2)
+
+
+@override_settings(
+    WAGTAILSEARCH_BACKENDS={
+        "default": {
+            "BACKEND": "wagtail.search.tests.test_update_index",
+            "INDEX_PAGES": True,
+        }
+    }
+)
+class TestUpdateIndexSince(TestCase):
+    def setUp(self):
+        RecordingIndex.items.clear()
+
+    def run_command(self, since):
+        management.call_command("update_index", since=since, stdout=StringIO())
+
+    def test_since(self):
+        root_page = Page.objects.get(depth=1)
+        old_page = root_page.add_child(
+            instance=SimplePage(
+                title="Old page",
+                content="hello",
+                last_published_at=datetime(2020, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+        published_page = root_page.add_child(
+            instance=SimplePage(
+                title="Published page",
+                content="hello",
+                last_published_at=datetime(2024, 1, 1, tzinfo=timezone.utc),
+            )
+        )
+        revised_page = root_page.add_child(
+            instance=SimplePage(title="Revised page", content="hello", live=False)
+        )
+        revised_page.save_revision()
+        models.Book.objects.create(
+            title="Book", publication_date=date(2017, 10, 18), number_of_pages=100
+        )
+        RecordingIndex.items.clear()
+
+        self.run_command("2023-06-01")
+
+        indexed_pks = RecordingIndex.items["pages"]
+        self.assertIn(published_page.pk, indexed_pks)
+        self.assertIn(revised_page.pk, indexed_pks)
+        self.assertNotIn(old_page.pk, indexed_pks)
+
+        # Books don't record when they were modified, so all of them are indexed
+        self.assertEqual(len(RecordingIndex.items["books"]), 1)
+
+        # Deleted objects are removed from the index for each root model
+        self.assertEqual(RecordingIndex.items["pages_stale_models"], [Page])
+        self.assertEqual(RecordingIndex.items["books_stale_models"], [models.Book])
+
+    def test_since_with_time(self):
+        self.run_command("2023-06-01T12:30:00+01:00")
+        self.assertEqual(RecordingIndex.items["pages_stale_models"], [Page])
+
+    def test_invalid_since(self):
+        with self.assertRaises(CommandError):
+            self.run_command("not a date")
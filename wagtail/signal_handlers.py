@@ -2,6 +2,7 @@ import logging
 from contextlib import contextmanager
 
 from asgiref.local import Local
+from django.conf import settings
 from django.core.cache import cache
 from django.db import transaction
 from django.db.models.signals import (
@@ -13,7 +14,20 @@ from django.db.models.signals import (
 )
 from modelcluster.fields import ParentalKey
 
-from wagtail.models import Locale, Page, ReferenceIndex, Site
+from wagtail.models import (
+    Locale,
+    Page,
+    PendingReferenceIndexUpdate,
+    ReferenceIndex,
+    Site,
+)
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
+from wagtail.utils.pending_updates import DeferredUpdates
 
 logger = logging.getLogger("wagtail")
 
@@ -21,10 +35,22 @@ logger = logging.getLogger("wagtail")
 # Clear the wagtail_site_root_paths from the cache whenever Site records are updated.
 def post_save_site_signal_handler(instance, update_fields=None, **kwargs):
     Site.clear_site_root_paths_cache()
+    # Other processes can't reload the sites until the change is committed
+    transaction.on_commit(Site.clear_site_cache)
+    clear_route_cache_signal_handler()
 
 
 def post_delete_site_signal_handler(instance, **kwargs):
     Site.clear_site_root_paths_cache()
+    # Other processes can't reload the sites until the change is committed
+    transaction.on_commit(Site.clear_site_cache)
+    clear_route_cache_signal_handler()
+
+
+# Invalidate the shared route cache whenever the set of routable pages may have changed.
+def clear_route_cache_signal_handler(**kwargs):
+    if getattr(settings, "WAGTAIL_ROUTE_CACHE", False):
+        Page.clear_route_cache()
 
 
 def pre_delete_page_unpublish(sender, instance, **kwargs):
@@ -62,6 +88,46 @@ def disable_reference_index_auto_update():
         del reference_index_auto_update_disabled.value
 
 
+def get_reference_index_update_mode():
+    """
+    Returns when the reference index is updated after an object is saved, as
+    configured by the ``WAGTAIL_REFERENCE_INDEX_UPDATE_MODE`` setting:
+
+    - ``"immediate"`` - the object's references are updated as soon as it is saved
+    - ``"deferred"`` - changed objects are collected and their references updated
+      once, when the current transaction is committed
+    - ``"queue"`` - changed objects are added to a queue in the database, to be
+      updated by the ``rebuild_references_index --drain-queue`` management command
+    """
+    return getattr(settings, "WAGTAIL_REFERENCE_INDEX_UPDATE_MODE", "immediate")
+
+
+deferred_reference_index_updates = DeferredUpdates(ReferenceIndex.update_for_objects)
+
+
+def defer_reference_index_update(instance, using=None):
+    """
+    Schedule the references of ``instance`` to be updated according to the
+    reference index update mode. Saves of the same object (including those made
+    by saving its child objects) are coalesced into a single update.
+    """
+    model = instance._meta.model
+
+    if get_reference_index_update_mode() == "queue":
+        PendingReferenceIndexUpdate.enqueue(model, [instance.pk], using=using)
+        return
+
+    deferred_reference_index_updates.add(model, instance.pk, using=using)
+
+
+def flush_deferred_reference_index_updates(using=None):
+    """
+    Update the references of all the objects whose updates have been deferred by
+    ``defer_reference_index_update()`` for the given database connection.
+    """
+    deferred_reference_index_updates.flush(using)
+
+
 def update_reference_index_on_save(instance, **kwargs):
     # Don't populate reference index while loading fixtures as referenced objects may not be populated yet
     if kwargs.get("raw", False):
@@ -87,6 +153,10 @@ def update_reference_index_on_save(instance, **kwargs):
             return
 
     if ReferenceIndex.is_indexed(instance._meta.model):
+        if get_reference_index_update_mode() != "immediate":
+            defer_reference_index_update(instance, using=kwargs.get("using"))
+            return
+
         with transaction.atomic():
             ReferenceIndex.create_or_update_for_object(instance)
 
@@ -126,6 +196,12 @@ def register_signal_handlers():
     pre_delete.connect(pre_delete_page_unpublish, sender=Page)
     post_delete.connect(post_delete_page_log_deletion, sender=Page)
 
+    page_published.connect(clear_route_cache_signal_handler)
+    page_unpublished.connect(clear_route_cache_signal_handler)
+    page_slug_changed.connect(clear_route_cache_signal_handler)
+    post_page_move.connect(clear_route_cache_signal_handler)
+    post_delete.connect(clear_route_cache_signal_handler, sender=Page)
+
     post_save.connect(reset_locales_display_names_cache, sender=Locale)
     post_delete.connect(reset_locales_display_names_cache, sender=Locale)
 
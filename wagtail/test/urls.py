@@ -44,6 +44,12 @@ urlpatterns = [
         },
     ),
     path("sitemap-<str:section>.xml", sitemaps_views.sitemap, name="sitemap"),
+    path("stored-sitemap.xml", sitemaps_views.stored_sitemap),
+    path(
+        "stored-sitemap-<int:shard>.xml",
+        sitemaps_views.stored_sitemap,
+        name="wagtailsitemaps_stored_sitemap",
+    ),
     path("testapp/", include(testapp_urls)),
     path("fallback/", lambda: HttpResponse("ok"), name="fallback"),
 ]
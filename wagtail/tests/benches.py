@@ -0,0 +1,108 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from wagtail.models import Page
+from wagtail.test.benchmark import Benchmark
+from wagtail.test.testapp.models import (
+    AlwaysShowInMenusPage,
+    BusinessChild,
+    BusinessIndex,
+    BusinessSubIndex,
+    EventIndex,
+    FormPage,
+    GalleryPage,
+    MTIBasePage,
+    MTIChildPage,
+    PageWithGenericRelation,
+    SimpleChildPage,
+    SimpleParentPage,
+    StandardChild,
+    StandardIndex,
+    TaggedPage,
+)
+
+PAGE_MODELS = [
+    EventIndex,
+    FormPage,
+    StandardIndex,
+    StandardChild,
+    BusinessIndex,
+    BusinessSubIndex,
+    BusinessChild,
+    TaggedPage,
+    MTIBasePage,
+    MTIChildPage,
+    AlwaysShowInMenusPage,
+    SimpleParentPage,
+    SimpleChildPage,
+    GalleryPage,
+    PageWithGenericRelation,
+]
+
+
+class SpecificFetchModeBenchmark(Benchmark):
+    """
+    Creates 100 pages spread across ``type_count`` page types, and benches
+    fetching their specific instances with ``fetch_mode``.
+    """
+
+    fetch_mode = None
+    type_count = None
+    page_count = 100
+
+    def setUp(self):
+        self.parent_page = Page.objects.get(id=1).add_child(
+            instance=Page(title="Parent", slug="parent")
+        )
+        models = PAGE_MODELS[: self.type_count]
+        for i in range(self.page_count):
+            model = models[i % len(models)]
+            self.parent_page.add_child(instance=model(title=f"Page {i}", slug=str(i)))
+
+    def bench(self):
+        with CaptureQueriesContext(connection) as queries:
+            pages = list(
+                self.parent_page.get_children().specific(fetch_mode=self.fetch_mode)
+            )
+
+        self.assertEqual(len(pages), self.page_count)
+        self.query_count = len(queries.captured_queries)
+
+    def test(self):
+        super().test()
+        print(  # noqa: T201
+            f"{self.fetch_mode}, {self.type_count} types:",
+            self.query_count,
+            "queries",
+        )
+
+
+class BenchSpecificPerType1Type(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "per_type"
+    type_count = 1
+
+
+class BenchSpecificJoin1Type(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "join"
+    type_count = 1
+
+
+class BenchSpecificPerType5Types(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "per_type"
+    type_count = 5
+
+
+class BenchSpecificJoin5Types(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "join"
+    type_count = 5
+
+
+class BenchSpecificPerType15Types(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "per_type"
+    type_count = 15
+
+
+class BenchSpecificJoin15Types(SpecificFetchModeBenchmark, TestCase):
+    fetch_mode = "join"
+    type_count = 15
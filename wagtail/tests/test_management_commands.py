@@ -10,8 +10,10 @@ from django.test import TestCase, override_settings
 from django.utils import timezone
 
 from wagtail.embeds.models import Embed
+from wagtail.log_actions import log
 from wagtail.models import (
     Collection,
+    Comment,
     Page,
     PageLogEntry,
     Revision,
@@ -589,6 +591,8 @@ class TestPublishScheduledCommand(WagtailTestUtils, TestCase):
 
 class TestPurgeRevisionsCommandForPages(TestCase):
     base_options = {}
+    # Whether revisions of the object are purged with the base options
+    purges_revisions = True
 
     def setUp(self):
         self.object = self.get_object()
@@ -647,9 +651,11 @@ class TestPurgeRevisionsCommandForPages(TestCase):
         self.assertRevisionExists(revision)
 
         # If workflow is disabled at some point after that, the revision should
-        # be deleted
+        # be deleted, unless it's kept as it's referenced by the workflow's log
         with override_settings(WAGTAIL_WORKFLOW_ENABLED=False):
             self.run_command()
+            self.assertRevisionExists(revision)
+            self.run_command(keep_logged=False)
             self.assertRevisionNotExists(revision)
 
     def test_revisions_with_approve_go_live_not_purged(self):
@@ -695,12 +701,109 @@ class TestPurgeRevisionsCommandForPages(TestCase):
         # Any other revisions are deleted
         self.assertRevisionNotExists(revision_purged)
 
+    def test_live_revision_not_purged(self):
+        revision_1 = self.object.save_revision()
+        live_revision = self.object.save_revision()
+        live_revision.publish()
+        self.object.save_revision()
+
+        self.run_command()
+
+        self.assertRevisionNotExists(revision_1)
+        self.assertRevisionExists(live_revision)
+
+    def test_logged_revisions_not_purged(self):
+        logged_revision = self.object.save_revision()
+        log(instance=self.object, action="wagtail.edit", revision=logged_revision)
+        self.object.save_revision()
+
+        self.run_command()
+        self.assertRevisionExists(logged_revision)
+
+        self.run_command(keep_logged=False)
+        self.assertRevisionNotExists(logged_revision)
+
+    def test_dry_run(self):
+        revision_1 = self.object.save_revision()
+        revision_2 = self.object.save_revision()
+        self.object.save_revision()
+        purgeable_count = Revision.objects.filter(
+            id__in=[revision_1.id, revision_2.id]
+        ).count()
+
+        stdout = StringIO()
+        management.call_command(
+            "purge_revisions", dry_run=True, **self.base_options, stdout=stdout
+        )
+
+        self.assertRevisionExists(revision_1)
+        self.assertRevisionExists(revision_2)
+
+        self.run_command()
+        purged_count = purgeable_count - (
+            Revision.objects.filter(id__in=[revision_1.id, revision_2.id]).count()
+        )
+        self.assertEqual(
+            stdout.getvalue().strip(), "Would delete %d revisions" % purged_count
+        )
+
+    def test_batches(self):
+        revisions = [self.object.save_revision() for _ in range(5)]
+
+        stdout = StringIO()
+        with mock.patch("time.sleep") as sleep:
+            management.call_command(
+                "purge_revisions",
+                batch_size=2,
+                sleep=0.5,
+                verbosity=2,
+                **self.base_options,
+                stdout=stdout,
+            )
+
+        for revision in revisions[:-1]:
+            self.assertRevisionNotExists(revision)
+        self.assertRevisionExists(revisions[-1])
+        if self.purges_revisions:
+            self.assertIn("Deleted 2 of 4 revisions", stdout.getvalue())
+            self.assertIn("Deleted 4 of 4 revisions", stdout.getvalue())
+            self.assertEqual(sleep.call_count, 2)
+        else:
+            self.assertIn("No revisions deleted", stdout.getvalue())
+            sleep.assert_not_called()
+
 
 class TestPurgeRevisionsCommandForSnippets(TestPurgeRevisionsCommandForPages):
     def get_object(self):
         return FullFeaturedSnippet.objects.create(text="Hello world!")
 
 
+class TestPurgeRevisionsCommandComments(TestCase):
+    def test_comments_moved_to_next_revision(self):
+        page = SimplePage(title="Hello world!", slug="hello-world", content="hello")
+        Page.objects.get(id=2).add_child(instance=page)
+        revision_1 = page.save_revision()
+        revision_2 = page.save_revision()
+        revision_3 = page.save_revision()
+        comment = Comment.objects.create(
+            page=page,
+            user=get_user_model().objects.create_user(
+                username="commenter", password="password"
+            ),
+            text="A comment",
+            contentpath="title",
+            revision_created=revision_1,
+        )
+
+        management.call_command("purge_revisions", stdout=StringIO())
+
+        self.assertFalse(
+            Revision.objects.filter(id__in=[revision_1.id, revision_2.id]).exists()
+        )
+        comment.refresh_from_db()
+        self.assertEqual(comment.revision_created, revision_3)
+
+
 class TestPurgeRevisionsCommandForPagesWithPagesOnly(TestPurgeRevisionsCommandForPages):
     base_options = {"pages": True}
 
@@ -709,6 +812,7 @@ class TestPurgeRevisionsCommandForPagesWithNonPagesOnly(
     TestPurgeRevisionsCommandForPages
 ):
     base_options = {"non_pages": True}
+    purges_revisions = False
 
     def assertRevisionNotExists(self, revision):
         # Page revisions won't be purged if only non_pages is specified
@@ -725,6 +829,7 @@ class TestPurgeRevisionsCommandForSnippetsWithPagesOnly(
     TestPurgeRevisionsCommandForSnippets
 ):
     base_options = {"pages": True}
+    purges_revisions = False
 
     def assertRevisionNotExists(self, revision):
         # Snippet revisions won't be purged if only pages is specified
@@ -6,6 +6,7 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AnonymousUser, Group
 from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.http import Http404
 from django.test import Client, TestCase, override_settings
@@ -30,7 +31,9 @@ from wagtail.models import (
     get_page_models,
     get_translatable_models,
 )
+from wagtail.models.sites import SITE_CACHE_GENERATION_KEY
 from wagtail.signals import page_published
+from wagtail.test.routablepage.models import RoutablePageTest
 from wagtail.test.testapp.models import (
     AbstractPage,
     Advert,
@@ -327,6 +330,185 @@ class TestSiteRouting(TestCase):
             )
 
 
+@override_settings(
+    WAGTAIL_SITE_CACHE=True,
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+)
+class TestSiteRoutingWithSiteCache(TestSiteRouting):
+    def setUp(self):
+        cache.clear()
+        super().setUp()
+        Site.clear_site_cache()
+
+    def tearDown(self):
+        cache.clear()
+        Site.clear_site_cache()
+
+    def find_site(self, site):
+        return Site.find_for_request(get_dummy_request(site=site))
+
+    def test_sites_resolved_without_queries(self):
+        self.assertEqual(self.find_site(self.events_site), self.events_site)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(self.find_site(self.about_site), self.about_site)
+            site = self.find_site(self.events_site)
+            self.assertEqual(site, self.events_site)
+            self.assertEqual(site.root_page, self.events_site.root_page)
+
+    def test_sites_are_not_shared_between_requests(self):
+        site = self.find_site(self.events_site)
+        site.site_name = "Changed"
+        self.assertIsNot(self.find_site(self.events_site), site)
+        self.assertNotEqual(self.find_site(self.events_site).site_name, "Changed")
+
+    def test_site_change_invalidates_table(self):
+        old_site_name = self.find_site(self.about_site).site_name
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.about_site.site_name = "About"
+            self.about_site.save()
+
+            # The table isn't invalidated until the change is committed, so that
+            # other processes can't reload it with the old site
+            self.assertEqual(self.find_site(self.about_site).site_name, old_site_name)
+
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.find_site(self.about_site).site_name, "About")
+
+    def test_site_delete_invalidates_table(self):
+        self.find_site(self.about_site)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.about_site.delete()
+
+        request = get_dummy_request()
+        request.META["HTTP_HOST"] = "about.example.com"
+        self.assertEqual(Site.find_for_request(request), self.default_site)
+
+    def test_root_page_change_invalidates_table(self):
+        self.find_site(self.about_site)
+        root_page = self.about_site.root_page
+        root_page.title = "About"
+        with self.captureOnCommitCallbacks(execute=True):
+            root_page.save()
+
+        self.assertEqual(self.find_site(self.about_site).root_page.title, "About")
+
+    def test_table_reloaded_after_change_in_another_process(self):
+        self.find_site(self.about_site)
+        Site.objects.filter(pk=self.about_site.pk).update(site_name="Changed")
+
+        # Clearing the generation key in the cache, as another process would,
+        # reloads the table in this one
+        cache.delete(SITE_CACHE_GENERATION_KEY)
+        self.assertEqual(self.find_site(self.about_site).site_name, "Changed")
+
+
+@override_settings(
+    WAGTAIL_ROUTE_CACHE=True,
+    CACHES={
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    },
+)
+class TestRouteCache(TestCase):
+    fixtures = ["test.json"]
+
+    def setUp(self):
+        cache.clear()
+        self.site = Site.objects.get(is_default_site=True)
+        self.christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
+
+    def tearDown(self):
+        cache.clear()
+
+    def route(self, path):
+        request = get_dummy_request(path=path, site=self.site)
+        return Page.route_for_request(request, path)
+
+    def test_cached_route_avoids_walking_the_tree(self):
+        result = self.route("/events/christmas/")
+        self.assertEqual(result.page, self.christmas_page)
+
+        # site lookup + fetching the cached page
+        with self.assertNumQueries(2):
+            result = self.route("/events/christmas/")
+
+        self.assertEqual(result.page, self.christmas_page)
+        self.assertIsInstance(result.page, EventPage)
+        self.assertEqual((result.args, result.kwargs), ([], {}))
+
+    def test_route_cache_disabled(self):
+        with override_settings(WAGTAIL_ROUTE_CACHE=False):
+            self.route("/events/christmas/")
+            with self.assertNumQueries(5):
+                self.route("/events/christmas/")
+
+    def test_unpublish_invalidates_route_cache(self):
+        self.route("/events/christmas/")
+        self.christmas_page.unpublish()
+        self.assertIsNone(self.route("/events/christmas/"))
+
+    def test_publish_invalidates_route_cache(self):
+        self.christmas_page.slug = "xmas"
+        self.christmas_page.save_revision().publish()
+
+        self.assertIsNone(self.route("/events/christmas/"))
+        self.assertEqual(self.route("/events/xmas/").page, self.christmas_page)
+
+    def test_slug_change_invalidates_route_cache(self):
+        self.assertEqual(self.route("/events/christmas/").page, self.christmas_page)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.christmas_page.slug = "xmas"
+            self.christmas_page.save()
+        self.assertEqual(self.route("/events/xmas/").page, self.christmas_page)
+
+        # the previous path may now be claimed by another page
+        events_page = Page.objects.get(url_path="/home/events/")
+        new_christmas = SimplePage(title="Christmas", slug="christmas", content="hi")
+        events_page.add_child(instance=new_christmas)
+        new_christmas.save_revision().publish()
+        self.assertEqual(self.route("/events/christmas/").page, new_christmas)
+
+    def test_move_invalidates_route_cache(self):
+        self.route("/events/christmas/")
+        homepage = Page.objects.get(url_path="/home/")
+        self.christmas_page.move(homepage, pos="last-child")
+
+        self.assertIsNone(self.route("/events/christmas/"))
+        self.assertEqual(self.route("/christmas/").page.id, self.christmas_page.id)
+
+    def test_delete_invalidates_route_cache(self):
+        self.route("/events/christmas/")
+        self.christmas_page.delete()
+        self.assertIsNone(self.route("/events/christmas/"))
+
+    def test_custom_routing_is_not_cached(self):
+        homepage = Page.objects.get(url_path="/home/")
+        routable_page = homepage.add_child(
+            instance=RoutablePageTest(title="Routable Page", slug="routable-page")
+        )
+
+        for _ in range(2):
+            result = self.route("/routable-page/archive/year/2014/")
+            self.assertEqual(result.page, routable_page)
+            view, args, kwargs = result.args
+            self.assertEqual(view.__name__, "archive_by_year")
+            self.assertEqual(args, ("2014",))
+
+        self.assertEqual(
+            self.route("/routable-page/").page.specific_class, RoutablePageTest
+        )
+        with self.assertNumQueries(3):
+            # not served from the cache, so the tree is walked again
+            self.route("/routable-page/")
+
+
 class TestRouting(TestCase):
     fixtures = ["test.json"]
 
@@ -547,6 +729,79 @@ class TestRouting(TestCase):
                 christmas_page.get_url(request=request), "/events/christmas/"
             )
 
+    def assertUrlsForPagesMatchGetUrl(self, pages, request=None):
+        self.assertEqual(
+            Page.get_urls_for_pages(pages, request=request),
+            [page.get_url(request=request) for page in pages],
+        )
+
+    def test_get_urls_for_pages(self):
+        pages = list(Page.objects.order_by("path").specific())
+        self.assertUrlsForPagesMatchGetUrl(pages)
+        self.assertUrlsForPagesMatchGetUrl(pages, request=get_dummy_request())
+
+    @override_settings(
+        ALLOWED_HOSTS=[
+            "localhost",
+            "events.example.com",
+        ]
+    )
+    def test_get_urls_for_pages_with_multiple_sites(self):
+        events_page = Page.objects.get(url_path="/home/events/")
+        events_site = Site.objects.create(
+            hostname="events.example.com", root_page=events_page
+        )
+        default_site = Site.objects.get(is_default_site=True)
+        pages = list(Page.objects.order_by("path").specific())
+
+        self.assertUrlsForPagesMatchGetUrl(pages)
+        self.assertUrlsForPagesMatchGetUrl(
+            pages, request=get_dummy_request(site=events_site)
+        )
+        self.assertUrlsForPagesMatchGetUrl(
+            pages, request=get_dummy_request(site=default_site)
+        )
+
+    @override_settings(ROOT_URLCONF="wagtail.test.non_root_urls")
+    def test_get_urls_for_pages_with_non_root_urlconf(self):
+        pages = list(Page.objects.order_by("path").specific())
+        self.assertUrlsForPagesMatchGetUrl(pages, request=get_dummy_request())
+
+    @override_settings(ROOT_URLCONF="wagtail.test.headless_urls")
+    def test_get_urls_for_pages_without_wagtail_serve(self):
+        pages = list(Page.objects.order_by("path"))
+        self.assertEqual(Page.get_urls_for_pages(pages), [None] * len(pages))
+
+    def test_get_urls_for_pages_with_overridden_get_url_parts(self):
+        homepage = Page.objects.get(url_path="/home/")
+        page = homepage.add_child(
+            instance=SingleEventPage(
+                title="Single event",
+                location="the moon",
+                audience="public",
+                cost="free",
+                date_from="2001-01-01",
+            )
+        )
+        request = get_dummy_request()
+        self.assertUrlsForPagesMatchGetUrl([homepage, page], request=request)
+        self.assertTrue(
+            Page.get_urls_for_pages([page], request=request)[0].endswith(
+                "/single-event/pointless-suffix/"
+            )
+        )
+
+    def test_get_urls_for_pages_query_count(self):
+        pages = list(Page.objects.order_by("path").specific())
+        request = get_dummy_request()
+        # populate the site root paths cache
+        Site.get_site_root_paths()
+        # one query to fetch the site root paths from the cache, one for the current site
+        with self.assertNumQueries(2):
+            Page.get_urls_for_pages(pages, request=request)
+        with self.assertNumQueries(0):
+            Page.get_urls_for_pages(pages, request=request)
+
     def test_cached_parent_obj_set(self):
         homepage = Page.objects.get(url_path="/home/")
         christmas_page = EventPage.objects.get(url_path="/home/events/christmas/")
@@ -5,9 +5,10 @@ from django.contrib.auth import get_user_model
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
 from django.db.models import Count, Q
-from django.test import TestCase, TransactionTestCase
+from django.test import TestCase, TransactionTestCase, override_settings
 
 from wagtail.models import Locale, Page, PageViewRestriction, Site, Workflow
+from wagtail.query import SpecificIterable
 from wagtail.search.query import MATCH_ALL
 from wagtail.signals import page_unpublished
 from wagtail.test.testapp.models import (
@@ -1201,6 +1202,169 @@ class TestSpecificQuery(WagtailTestUtils, TestCase):
             self.assertEqual(result_2, benchmark_result)
 
 
+@override_settings(WAGTAIL_SPECIFIC_FETCH_MODE="join")
+class TestSpecificQueryJoinFetchMode(WagtailTestUtils, TestCase):
+    """
+    Test the .specific() queryset method when items of all types are fetched
+    with a single query, using the page structure described in TestSpecificQuery.
+    """
+
+    fixtures = ["test_specific.json"]
+
+    def test_specific(self):
+        root = Page.objects.get(url_path="/home/")
+
+        with self.assertNumQueries(2):
+            # One query to get page type and ID, one query for all page types
+            pages = list(root.get_descendants().specific())
+
+        with override_settings(WAGTAIL_SPECIFIC_FETCH_MODE="per_type"):
+            self.assertEqual(pages, list(root.get_descendants().specific()))
+
+        for page in pages:
+            self.assertIsInstance(page, page.content_type.model_class())
+            with self.assertNumQueries(0):
+                self.assertIs(page, page.specific)
+                # Fields from all tables are loaded
+                page.title
+                if isinstance(page, EventPage):
+                    page.location
+
+    def test_fetch_mode_argument(self):
+        with override_settings(WAGTAIL_SPECIFIC_FETCH_MODE="per_type"):
+            with self.assertNumQueries(2):
+                pages = list(Page.objects.live().specific(fetch_mode="join"))
+        self.assertEqual(len(pages), 7)
+
+        with self.assertNumQueries(5):
+            list(Page.objects.live().specific(fetch_mode="per_type"))
+
+    def test_multi_level_inheritance(self):
+        events = Page.objects.get(url_path="/home/events/")
+        single_event = events.add_child(
+            instance=SingleEventPage(
+                title="Single event",
+                location="The moon",
+                audience="public",
+                cost="free",
+                date_from="2001-01-01",
+                excerpt="Excerpt",
+            )
+        )
+
+        with self.assertNumQueries(2):
+            pages = list(events.get_children().specific())
+
+        self.assertEqual(pages[-1], single_event)
+        self.assertIsInstance(pages[-1], SingleEventPage)
+        with self.assertNumQueries(0):
+            self.assertEqual(pages[-1].excerpt, "Excerpt")
+            self.assertEqual(pages[-1].location, "The moon")
+
+    def test_ordering_and_annotations(self):
+        with self.assertNumQueries(2):
+            pages = list(
+                Page.objects.live()
+                .specific()
+                .annotate(count=Count("pk"))
+                .order_by("-url_path")
+            )
+
+        self.assertEqual(
+            [page.url_path for page in pages],
+            list(
+                Page.objects.live()
+                .order_by("-url_path")
+                .values_list("url_path", flat=True)
+            ),
+        )
+        for page in pages:
+            self.assertEqual(page.count, 1)
+
+    def test_select_related(self):
+        with self.assertNumQueries(2):
+            pages = list(
+                Page.objects.type(EventPage)
+                .specific()
+                .select_related("feed_image", for_specific_subqueries=True)
+            )
+        self.assertEqual(len(pages), 4)
+        with self.assertNumQueries(0):
+            for page in pages:
+                self.assertTrue(page.feed_image)
+
+    def test_prefetch_related(self):
+        with self.assertNumQueries(3):
+            pages = list(
+                Page.objects.type(EventPage)
+                .specific()
+                .prefetch_related("categories", for_specific_subqueries=True)
+            )
+        self.assertEqual(len(pages), 4)
+        with self.assertNumQueries(0):
+            for page in pages:
+                self.assertFalse(page.categories.all())
+
+    def test_defer_streamfields(self):
+        Page.objects.get(url_path="/home/").add_child(
+            instance=StreamPage(
+                title="stream page",
+                body='[{"type": "text", "value": "foo"}]',
+            )
+        )
+
+        for page in Page.objects.exact_type(StreamPage).defer_streamfields().specific():
+            self.assertNotIn("body", page.__dict__)
+            with self.assertNumQueries(1):
+                page.body
+
+    def test_missing_models_are_fetched_separately(self):
+        missing_page_content_type = ContentType.objects.create(
+            app_label="tests", model="missingpage"
+        )
+        Page.objects.filter(url_path="/home/events/").update(
+            content_type=missing_page_content_type
+        )
+
+        pages = list(Page.objects.get(url_path="/home/").get_children().specific())
+        self.assertEqual(
+            pages,
+            [
+                Page.objects.get(url_path="/home/events/"),
+                Page.objects.get(url_path="/home/about-us/").specific,
+                Page.objects.get(url_path="/home/other/").specific,
+            ],
+        )
+
+    def test_missing_rows(self):
+        with mock.patch(
+            "wagtail.query.ContentType.objects.get_for_id",
+            return_value=ContentType.objects.get_for_model(EventPage),
+        ):
+            with self.assertWarnsRegex(
+                RuntimeWarning,
+                "Specific versions of the following items could not be found",
+            ):
+                pages = list(
+                    Page.objects.get(url_path="/home/").get_children().specific()
+                )
+
+        self.assertEqual(
+            pages,
+            [
+                Page.objects.get(url_path="/home/events/"),
+                Page.objects.get(url_path="/home/about-us/"),
+                Page.objects.get(url_path="/home/other/"),
+            ],
+        )
+
+    def test_too_many_tables_fetched_per_type(self):
+        with mock.patch.object(SpecificIterable, "join_max_tables", 1):
+            with self.assertNumQueries(5):
+                pages = list(Page.objects.live().specific())
+        self.assertEqual(len(pages), 7)
+
+
 class TestSpecificQuerySearch(WagtailTestUtils, TransactionTestCase):
     fixtures = ["test_specific.json"]
 
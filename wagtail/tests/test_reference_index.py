@@ -1,8 +1,10 @@
+from concurrent.futures import Executor
 from io import StringIO
+from unittest import mock
 
 from django.contrib.contenttypes.models import ContentType
 from django.core import management
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.utils.functional import SimpleLazyObject
 
 from wagtail.blocks import StreamValue, StructValue
@@ -10,7 +12,12 @@ from wagtail.documents import get_document_model
 from wagtail.documents.tests.utils import get_test_document_file
 from wagtail.images import get_image_model
 from wagtail.images.tests.utils import get_test_image_file
-from wagtail.models import Page, ReferenceIndex
+from wagtail.models import (
+    Page,
+    PendingReferenceIndexUpdate,
+    ReferenceIndex,
+    ReferenceIndexRebuildCheckpoint,
+)
 from wagtail.rich_text import RichText
 from wagtail.test.testapp.models import (
     Advert,
@@ -261,6 +268,207 @@ class TestCreateOrUpdateForObject(TestCase):
         self.assertIn(" 4  wagtail.test.testapp.models.EventPage", stdout.getvalue())
 
 
+class TestReferenceIndexUpdateModes(TestCase):
+    def setUp(self):
+        image_model = get_image_model()
+        self.test_image = image_model.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.root_page = Page.objects.get(id=2)
+        self.event_page = EventPage(
+            title="Event page",
+            slug="event-page",
+            location="the moon",
+            audience="public",
+            cost="free",
+            date_from="2001-01-01",
+        )
+        self.root_page.add_child(instance=self.event_page)
+
+    def add_carousel_items(self):
+        for sort_order in range(5):
+            EventPageCarouselItem.objects.create(
+                page=self.event_page, image=self.test_image, sort_order=sort_order
+            )
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_UPDATE_MODE="deferred")
+    def test_deferred(self):
+        with mock.patch.object(
+            ReferenceIndex,
+            "create_or_update_for_object",
+            wraps=ReferenceIndex.create_or_update_for_object,
+        ) as create_or_update_for_object:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.add_carousel_items()
+                self.assertEqual(
+                    ReferenceIndex.get_references_to(self.test_image).count(), 0
+                )
+
+        # The page's references are updated once, when the transaction is committed
+        create_or_update_for_object.assert_called_once()
+        self.assertEqual(create_or_update_for_object.call_args.args[0], self.event_page)
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 5)
+
+    @override_settings(WAGTAIL_REFERENCE_INDEX_UPDATE_MODE="queue")
+    def test_queue(self):
+        self.add_carousel_items()
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 0)
+        self.assertEqual(
+            list(
+                PendingReferenceIndexUpdate.objects.values_list("object_id", flat=True)
+            ),
+            [str(self.event_page.pk)],
+        )
+
+        stdout = StringIO()
+        management.call_command(
+            "rebuild_references_index", drain_queue=True, stdout=stdout
+        )
+
+        self.assertIn("Updated 1 queued objects", stdout.getvalue())
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 5)
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+
+    def test_drain_queue_more_than_a_chunk(self):
+        PendingReferenceIndexUpdate.enqueue(
+            EventPage, range(self.event_page.pk, self.event_page.pk + 1199)
+        )
+
+        stdout = StringIO()
+        management.call_command(
+            "rebuild_references_index", drain_queue=True, stdout=stdout
+        )
+
+        self.assertIn("Updated 1199 queued objects", stdout.getvalue())
+        self.assertFalse(PendingReferenceIndexUpdate.objects.exists())
+
+    def test_update_for_deleted_object(self):
+        missing_pk = self.event_page.pk + 1000
+        ReferenceIndex.objects.create(
+            base_content_type=ReferenceIndex._get_base_content_type(self.event_page),
+            content_type=ContentType.objects.get_for_model(self.event_page),
+            object_id=missing_pk,
+            to_content_type=ContentType.objects.get_for_model(self.test_image),
+            to_object_id=self.test_image.pk,
+            model_path="feed_image",
+            content_path="feed_image",
+            content_path_hash=ReferenceIndex._get_content_path_hash("feed_image"),
+        )
+
+        ReferenceIndex.update_for_objects(EventPage, [missing_pk])
+
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 0)
+
+
+class SynchronousExecutor(Executor):
+    """
+    Runs the tasks submitted to it in the current process, so that they can see
+    the test database.
+    """
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.calls = 0
+
+    def map(self, fn, *iterables):
+        for args in zip(*iterables):
+            self.calls += 1
+            if self.fail_after is not None and self.calls > self.fail_after:
+                raise RuntimeError("Worker crashed")
+            yield fn(*args)
+
+
+class TestRebuildReferencesIndex(TestCase):
+    def setUp(self):
+        image_model = get_image_model()
+        self.test_image = image_model.objects.create(
+            title="Test image",
+            file=get_test_image_file(),
+        )
+        self.root_page = Page.objects.get(id=2)
+        self.event_pages = []
+        for i in range(5):
+            event_page = EventPage(
+                title=f"Event page {i}",
+                slug=f"event-page-{i}",
+                location="the moon",
+                audience="public",
+                cost="free",
+                date_from="2001-01-01",
+                feed_image=self.test_image,
+            )
+            self.root_page.add_child(instance=event_page)
+            EventPageCarouselItem.objects.create(
+                page=event_page, image=self.test_image, sort_order=0
+            )
+            self.event_pages.append(event_page)
+
+        # The references recorded as the objects were saved
+        self.expected_references = self.get_references()
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 10)
+
+    def get_references(self):
+        return set(
+            ReferenceIndex.objects.values_list(
+                "content_type",
+                "base_content_type",
+                "object_id",
+                "to_content_type",
+                "to_object_id",
+                "model_path",
+                "content_path",
+            )
+        )
+
+    def run_command(self, **options):
+        management.call_command(
+            "rebuild_references_index", chunk_size=2, stdout=StringIO(), **options
+        )
+
+    def test_rebuild(self):
+        self.run_command()
+        self.assertEqual(self.get_references(), self.expected_references)
+
+    def test_rebuild_removes_stale_references(self):
+        EventPageCarouselItem.objects.filter(page=self.event_pages[0]).delete()
+        self.run_command()
+        self.assertEqual(ReferenceIndex.get_references_to(self.test_image).count(), 9)
+
+    def test_workers(self):
+        executor = SynchronousExecutor()
+        with mock.patch(
+            "wagtail.utils.pk_ranges.get_executor",
+            return_value=executor,
+        ):
+            self.run_command(workers=3)
+
+        self.assertGreater(executor.calls, 0)
+        self.assertEqual(self.get_references(), self.expected_references)
+
+    def test_resume(self):
+        # The first run fails part way through indexing the pages
+        with mock.patch(
+            "wagtail.utils.pk_ranges.get_executor",
+            return_value=SynchronousExecutor(fail_after=2),
+        ):
+            with self.assertRaises(RuntimeError):
+                self.run_command(workers=3, resume=True)
+
+        self.assertTrue(ReferenceIndexRebuildCheckpoint.objects.exists())
+        self.assertLess(ReferenceIndex.get_references_to(self.test_image).count(), 10)
+
+        # Resuming indexes the remaining objects, without clearing the index
+        with mock.patch(
+            "wagtail.management.commands.rebuild_references_index.Command.clear_index"
+        ) as clear_index:
+            self.run_command(resume=True)
+
+        clear_index.assert_not_called()
+        self.assertEqual(self.get_references(), self.expected_references)
+        self.assertFalse(ReferenceIndexRebuildCheckpoint.objects.exists())
+
+
 class TestDescribeOnDelete(TestCase):
     fixtures = ["test.json"]
 
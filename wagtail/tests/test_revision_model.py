@@ -1,15 +1,20 @@
 import datetime
+import json
+from io import StringIO
 
 from django.contrib.contenttypes.models import ContentType
-from django.test import TestCase
+from django.core import management
+from django.test import TestCase, override_settings
 from freezegun import freeze_time
 
 from wagtail.models import Page, Revision, get_default_page_content_type
+from wagtail.models.revision_storage import diff, patch
 from wagtail.test.testapp.models import (
     FullFeaturedSnippet,
     RevisableGrandChildModel,
     RevisableModel,
     SimplePage,
+    StreamPage,
 )
 
 
@@ -218,3 +223,171 @@ class TestRevisableModel(TestCase):
                 self.assertEqual(Revision.objects.filter(**query).first(), revision)
                 instance.delete()
                 self.assertIs(Revision.objects.filter(**query).exists(), not cascades)
+
+
+class TestRevisionContentDelta(TestCase):
+    def assertRoundTrip(self, old, new):
+        self.assertEqual(patch(old, diff(old, new)), new)
+
+    def test_equal(self):
+        self.assertIsNone(diff({"title": "foo"}, {"title": "foo"}))
+
+    def test_dict(self):
+        self.assertRoundTrip(
+            {"title": "foo", "removed": 1, "nested": {"a": 1, "b": 2}},
+            {"title": "bar", "added": [1, 2], "nested": {"a": 1, "b": 3}},
+        )
+
+    def test_list(self):
+        old = [{"id": i, "value": "item %d" % i} for i in range(10)]
+        new = [{"id": "new", "value": "new item"}] + old[:4] + old[6:]
+        new[5] = {"id": new[5]["id"], "value": "changed"}
+        self.assertRoundTrip(old, new)
+
+        # Only the inserted and changed items are included in the delta
+        delta = json.dumps(diff(old, new))
+        self.assertIn("new item", delta)
+        self.assertIn("changed", delta)
+        self.assertNotIn("item 3", delta)
+
+    def test_json_string(self):
+        blocks = [{"type": "text", "value": "block %d" % i} for i in range(10)]
+        old = json.dumps(blocks)
+        blocks[3]["value"] = "changed"
+        new = json.dumps(blocks)
+        self.assertRoundTrip(old, new)
+        self.assertNotIn("block 7", json.dumps(diff(old, new)))
+
+    def test_json_string_not_reproducible(self):
+        # Strings that wouldn't be serialised the same way are replaced
+        old = '{"a":1}'
+        new = '{"a":2}'
+        self.assertEqual(diff(old, new), ["=", new])
+        self.assertRoundTrip(old, new)
+
+
+@override_settings(
+    WAGTAIL_REVISION_STORAGE="delta", WAGTAIL_REVISION_KEYFRAME_INTERVAL=3
+)
+class TestRevisionDeltaStorage(TestCase):
+    def setUp(self):
+        self.blocks = [
+            {"type": "text", "value": "This is paragraph number %d of the page" % i}
+            for i in range(30)
+        ]
+        self.page = StreamPage(title="Stream page", body=json.dumps(self.blocks))
+        Page.objects.get(url_path="/home/").add_child(instance=self.page)
+
+    def save_revisions(self, count):
+        revisions = []
+        for i in range(count):
+            self.page.body[i].value = "Changed paragraph in revision %d" % i
+            revisions.append(self.page.save_revision())
+        return revisions
+
+    def get_stored_revision(self, revision):
+        return Revision.objects.values("content", "keyframe_id").get(pk=revision.pk)
+
+    def assertRevisionContent(self, revision, index):
+        revision = Revision.objects.get(pk=revision.pk)
+        page = revision.as_object()
+        self.assertEqual(
+            page.body[index].value, "Changed paragraph in revision %d" % index
+        )
+        self.assertEqual(page.body[index + 1].value, self.blocks[index + 1]["value"])
+
+    def test_keyframes(self):
+        revisions = self.save_revisions(5)
+
+        # Every third revision stores its full content
+        keyframe_ids = [
+            self.get_stored_revision(revision)["keyframe_id"] for revision in revisions
+        ]
+        self.assertEqual(
+            keyframe_ids,
+            [None, revisions[0].pk, revisions[0].pk, None, revisions[3].pk],
+        )
+        self.assertIsNone(self.get_stored_revision(revisions[1])["content"])
+        self.assertIsNotNone(self.get_stored_revision(revisions[3])["content"])
+
+        for i, revision in enumerate(revisions):
+            with self.subTest(revision=i):
+                self.assertRevisionContent(revision, i)
+
+    def test_full_storage(self):
+        with override_settings(WAGTAIL_REVISION_STORAGE="full"):
+            revisions = self.save_revisions(3)
+
+        for revision in revisions:
+            self.assertIsNone(self.get_stored_revision(revision)["keyframe_id"])
+
+    def test_save_revision_content(self):
+        revisions = self.save_revisions(3)
+        revision = Revision.objects.get(pk=revisions[1].pk)
+        revision.content["title"] = "Changed title"
+        revision.save()
+
+        revision = Revision.objects.get(pk=revisions[1].pk)
+        self.assertEqual(revision.content["title"], "Changed title")
+        self.assertRevisionContent(revision, 1)
+
+    def test_save_keyframe_content(self):
+        revisions = self.save_revisions(3)
+        keyframe = Revision.objects.get(pk=revisions[0].pk)
+        keyframe.content["title"] = "Changed title"
+        keyframe.save()
+
+        # The revisions stored against the keyframe are unchanged
+        self.assertEqual(
+            Revision.objects.get(pk=revisions[1].pk).content["title"], "Stream page"
+        )
+        self.assertRevisionContent(revisions[2], 2)
+
+    def test_delete_keyframe(self):
+        revisions = self.save_revisions(3)
+        revisions[0].delete()
+
+        # The next revision becomes the keyframe
+        self.assertIsNone(self.get_stored_revision(revisions[1])["keyframe_id"])
+        self.assertEqual(
+            self.get_stored_revision(revisions[2])["keyframe_id"], revisions[1].pk
+        )
+        self.assertRevisionContent(revisions[1], 1)
+        self.assertRevisionContent(revisions[2], 2)
+
+    def test_delete_object(self):
+        self.save_revisions(3)
+        self.page.delete()
+        self.assertFalse(Revision.objects.exists())
+
+    def test_purge_revisions(self):
+        revisions = self.save_revisions(5)
+        management.call_command("purge_revisions", stdout=StringIO())
+
+        self.assertEqual(list(Revision.objects.all()), [revisions[4]])
+        self.assertIsNone(self.get_stored_revision(revisions[4])["keyframe_id"])
+        self.assertRevisionContent(revisions[4], 4)
+
+    def test_compact_revisions(self):
+        with override_settings(WAGTAIL_REVISION_STORAGE="full"):
+            revisions = self.save_revisions(5)
+
+        management.call_command("compact_revisions", stdout=StringIO())
+
+        self.assertEqual(
+            [
+                self.get_stored_revision(revision)["keyframe_id"]
+                for revision in revisions
+            ],
+            [None, revisions[0].pk, revisions[0].pk, None, revisions[3].pk],
+        )
+        for i, revision in enumerate(revisions):
+            self.assertRevisionContent(revision, i)
+
+        # Converting back stores the full content of each revision
+        management.call_command("compact_revisions", full=True, stdout=StringIO())
+
+        for i, revision in enumerate(revisions):
+            self.assertIsNone(self.get_stored_revision(revision)["keyframe_id"])
+            self.assertIsNotNone(self.get_stored_revision(revision)["content"])
+            self.assertRevisionContent(revision, i)
@@ -28,6 +28,7 @@ from wagtail.coreutils import (
 )
 from wagtail.models import Page, Site
 from wagtail.utils.file import hash_filelike
+from wagtail.utils.pk_ranges import get_pk_ranges
 from wagtail.utils.utils import deep_update, flatten_choices
 from wagtail.utils.version import get_main_version
 
@@ -616,3 +617,26 @@ class TestFlattenChoices(SimpleTestCase):
                 "unknown": "Unknown",
             },
         )
+
+
+class TestGetPkRanges(TestCase):
+    fixtures = ["test.json"]
+
+    def test_get_pk_ranges(self):
+        pks = list(Page.objects.order_by("pk").values_list("pk", flat=True))
+
+        ranges = list(get_pk_ranges(Page.objects.all(), 3))
+
+        self.assertEqual(ranges[0], (None, pks[2]))
+        self.assertEqual(ranges[-1][1], pks[-1])
+        # Each range starts after the last primary key of the previous one
+        for previous_range, pk_range in zip(ranges, ranges[1:]):
+            self.assertEqual(pk_range[0], previous_range[1])
+        self.assertEqual(len(ranges), (len(pks) + 2) // 3)
+
+    def test_get_pk_ranges_after_pk(self):
+        pks = list(Page.objects.order_by("pk").values_list("pk", flat=True))
+
+        ranges = list(get_pk_ranges(Page.objects.all(), 3, after_pk=pks[-2]))
+
+        self.assertEqual(ranges, [(pks[-2], pks[-1])])
@@ -0,0 +1,206 @@
+"""
+Serving files with support for conditional and byte range requests.
+
+``serve_file()`` returns the whole file, a single byte range of it (206), or
+several byte ranges as a ``multipart/byteranges`` response, reading the file
+in blocks rather than loading it into memory. Files are only read through
+``seek()`` and ``read()``, so this works for files from any storage backend.
+"""
+
+import re
+import uuid
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+
+RANGE_RE = re.compile(r"^\s*(\d*)\s*-\s*(\d*)\s*$")
+
+# Requests for more ranges than this (after merging overlapping ranges) are
+# served the whole file, as allowed by RFC 9110, to limit the cost of
+# fragmented requests
+MAX_RANGES = 16
+
+
+def parse_range_header(header, size):
+    """
+    Return the ``(first byte, last byte)`` ranges of a file of ``size`` bytes
+    requested by a ``Range`` header, with overlapping and adjacent ranges
+    merged. Returns ``None`` if the header is invalid or should be ignored, and
+    an empty list if none of the ranges can be satisfied.
+    """
+    units, _, range_specs = header.partition("=")
+    if units.strip().lower() != "bytes":
+        return None
+
+    ranges = []
+    for range_spec in range_specs.split(","):
+        match = RANGE_RE.match(range_spec)
+        if not match:
+            return None
+        first, last = match.groups()
+
+        if not first:
+            # A suffix range, for the last bytes of the file
+            if not last:
+                return None
+            if int(last) == 0 or size == 0:
+                continue
+            ranges.append((max(size - int(last), 0), size - 1))
+            continue
+
+        first = int(first)
+        if last and int(last) < first:
+            return None
+        if first >= size:
+            continue
+        ranges.append((first, min(int(last), size - 1) if last else size - 1))
+
+    merged_ranges = []
+    for first, last in sorted(ranges):
+        if merged_ranges and first <= merged_ranges[-1][1] + 1:
+            merged_ranges[-1] = (
+                merged_ranges[-1][0],
+                max(last, merged_ranges[-1][1]),
+            )
+        else:
+            merged_ranges.append((first, last))
+
+    if len(merged_ranges) > MAX_RANGES:
+        return None
+    return merged_ranges
+
+
+def if_range_matches(request, etag=None, last_modified=None):
+    """
+    Return whether the ``If-Range`` header of the request, if any, matches the
+    current version of the file. Only strong validators can match.
+    """
+    if_range = request.headers.get("if-range")
+    if if_range is None:
+        return True
+    if_range = if_range.strip()
+
+    if if_range.startswith(('"', "W/")):
+        return etag is not None and if_range == quote_etag(etag)
+
+    if_range_date = parse_http_date_safe(if_range)
+    return (
+        last_modified is not None
+        and if_range_date is not None
+        and if_range_date == int(last_modified)
+    )
+
+
+class FileRangesIterator:
+    """
+    Iterate over the contents of a multipart or single byte range response,
+    made up of ``bytes`` and ``(first byte, last byte)`` ranges of ``file``.
+    """
+
+    def __init__(self, file, parts, block_size=FileResponse.block_size):
+        self.file = file
+        self.parts = parts
+        self.block_size = block_size
+
+    def __iter__(self):
+        for part in self.parts:
+            if isinstance(part, bytes):
+                yield part
+                continue
+
+            first, last = part
+            self.file.seek(first)
+            remaining = last - first + 1
+            while remaining > 0:
+                data = self.file.read(min(self.block_size, remaining))
+                if not data:
+                    break
+                remaining -= len(data)
+                yield data
+
+    def close(self):
+        self.file.close()
+
+
+def get_multipart_parts(ranges, size, content_type, boundary):
+    parts = []
+    for first, last in ranges:
+        parts.append(
+            (
+                f"\r\n--{boundary}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Range: bytes {first}-{last}/{size}\r\n\r\n"
+            ).encode()
+        )
+        parts.append((first, last))
+    parts.append(f"\r\n--{boundary}--\r\n".encode())
+    return parts
+
+
+def serve_file(request, file, content_type, size=None, etag=None, last_modified=None):
+    """
+    Return a response for ``file``, a file object that is open for reading in
+    binary mode, handling conditional requests with ``etag`` and
+    ``last_modified`` (a timestamp), and byte range requests. ``size``
+    defaults to the size of the file object.
+    """
+    conditional_response = get_conditional_response(
+        request,
+        etag=quote_etag(etag) if etag else None,
+        last_modified=int(last_modified) if last_modified is not None else None,
+    )
+    if conditional_response is not None:
+        file.close()
+        response = conditional_response
+    else:
+        if size is None:
+            size = file.size
+        ranges = None
+        range_header = request.headers.get("range")
+        if (
+            range_header
+            and request.method in ("GET", "HEAD")
+            and if_range_matches(request, etag, last_modified)
+        ):
+            ranges = parse_range_header(range_header, size)
+
+        if ranges is None:
+            response = FileResponse(file, content_type=content_type)
+            response["Content-Length"] = size
+
+        elif not ranges:
+            file.close()
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+
+        elif len(ranges) == 1:
+            first, last = ranges[0]
+            response = StreamingHttpResponse(
+                FileRangesIterator(file, ranges),
+                status=206,
+                content_type=content_type,
+            )
+            response["Content-Range"] = f"bytes {first}-{last}/{size}"
+            response["Content-Length"] = last - first + 1
+
+        else:
+            boundary = uuid.uuid4().hex
+            parts = get_multipart_parts(ranges, size, content_type, boundary)
+            response = StreamingHttpResponse(
+                FileRangesIterator(file, parts),
+                status=206,
+                content_type=f"multipart/byteranges; boundary={boundary}",
+            )
+            response["Content-Length"] = sum(
+                len(part) if isinstance(part, bytes) else part[1] - part[0] + 1
+                for part in parts
+            )
+
+        response["Accept-Ranges"] = "bytes"
+
+    if etag:
+        response["ETag"] = quote_etag(etag)
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified)
+    return response
@@ -0,0 +1,140 @@
+"""
+Helpers for updating derived data (such as the search and reference indexes)
+for changed objects in bulk, either once the current transaction is committed
+or later, from a queue of ``AbstractPendingUpdate`` entries.
+"""
+
+from collections import defaultdict
+from functools import partial
+
+from asgiref.local import Local
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+# The maximum number of parameters in each query that deletes processed
+# entries, which keeps well within SQLite's limits
+DELETE_BATCH_SIZE = 500
+
+
+class DeferredUpdates:
+    """
+    Collects the primary keys of changed objects, per database connection and
+    model, and calls ``update_objects(model, pks)`` with them once the current
+    transaction is committed. Changes to the same object are coalesced into a
+    single update.
+
+    Other hashable values can be collected in the same way, such as URLs to
+    purge, with ``model`` used as the key they are grouped by.
+    """
+
+    def __init__(self, update_objects):
+        self.update_objects = update_objects
+        self.local = Local()
+
+    def add(self, model, pk, using=None):
+        using = using or DEFAULT_DB_ALIAS
+        if not hasattr(self.local, "pks"):
+            self.local.pks = defaultdict(lambda: defaultdict(set))
+            self.local.callbacks = {}
+        self.local.pks[using][model].add(pk)
+
+        # Only register one callback for each transaction. If the transaction (or
+        # the savepoint the callback was registered in) is rolled back, the
+        # callback is discarded, so another one is registered by the next change.
+        # The objects collected so far are still updated (to their unchanged
+        # state) by the next flush
+        callback = self.local.callbacks.get(using)
+        if callback is None or not any(
+            func is callback for _, func, _ in connections[using].run_on_commit
+        ):
+            callback = partial(self.flush, using)
+            self.local.callbacks[using] = callback
+            transaction.on_commit(callback, using=using)
+
+    def flush(self, using=None):
+        """
+        Update all the objects collected for the given database connection.
+        """
+        using = using or DEFAULT_DB_ALIAS
+        getattr(self.local, "callbacks", {}).pop(using, None)
+        pks_by_model = getattr(self.local, "pks", {}).pop(using, {})
+        for model, pks in pks_by_model.items():
+            self.update_objects(model, pks)
+
+
+def drain_pending_updates(queue_model, update_objects, chunk_size):
+    """
+    Call ``update_objects(model, pks)`` for the objects in the queue of
+    ``queue_model`` (a subclass of ``AbstractPendingUpdate``), ``chunk_size``
+    entries at a time in the order they were queued, removing each entry from
+    the queue once processed. Entries for models that no longer exist are
+    removed without being processed. Returns the number of entries processed.
+    """
+    entry_count = 0
+
+    # Objects that are queued again while draining are left for the next run
+    entries_queryset = queue_model.objects.filter(
+        queued_at__lte=timezone.now()
+    ).select_related("content_type")
+
+    while True:
+        entries = list(entries_queryset.order_by("queued_at", "pk")[:chunk_size])
+        if not entries:
+            break
+
+        entries_by_content_type = defaultdict(list)
+        for entry in entries:
+            entries_by_content_type[entry.content_type].append(entry)
+
+        for content_type, content_type_entries in entries_by_content_type.items():
+            model = content_type.model_class()
+            if model is not None:
+                pk_field = model._meta.pk
+                update_objects(
+                    model,
+                    [
+                        pk_field.to_python(entry.object_id)
+                        for entry in content_type_entries
+                    ],
+                )
+
+        delete_processed_entries(queue_model, entries)
+        entry_count += len(entries)
+
+        last_entry = entries[-1]
+        entries_queryset = entries_queryset.filter(
+            Q(queued_at__gt=last_entry.queued_at)
+            | Q(queued_at=last_entry.queued_at, pk__gt=last_entry.pk)
+        )
+
+    return entry_count
+
+
+def delete_processed_entries(queue_model, entries, batch_size=DELETE_BATCH_SIZE):
+    """
+    Remove the given entries, which have been processed, from the queue of
+    ``queue_model``. Entries that have been queued again since they were read
+    (so that their ``queued_at`` has changed) are kept, including by transactions
+    that hadn't committed when the entries were read. Entries are deleted with
+    at most ``batch_size`` parameters per query, to stay within database limits.
+    """
+    pks_by_queued_at = defaultdict(list)
+    for entry in entries:
+        pks_by_queued_at[entry.queued_at].append(entry.pk)
+
+    condition = Q()
+    parameter_count = 0
+    for queued_at, pks in pks_by_queued_at.items():
+        for i in range(0, len(pks), batch_size - 1):
+            batch_pks = pks[i : i + batch_size - 1]
+            if parameter_count + len(batch_pks) + 1 > batch_size:
+                queue_model.objects.filter(condition).delete()
+                condition = Q()
+                parameter_count = 0
+
+            condition |= Q(queued_at=queued_at, pk__in=batch_pks)
+            parameter_count += len(batch_pks) + 1
+
+    if parameter_count:
+        queue_model.objects.filter(condition).delete()
@@ -0,0 +1,117 @@
+"""
+Helpers for processing the objects of a model one range of primary keys at a
+time, optionally across worker processes and resuming from a checkpoint, such
+as ``update_index`` and ``rebuild_references_index`` do with ``--workers`` and
+``--resume``.
+"""
+
+import concurrent.futures
+import multiprocessing
+
+
+def get_pk_ranges(queryset, chunk_size, after_pk=None):
+    """
+    Split the primary keys of the objects in ``queryset`` (after ``after_pk``, if
+    given) into ranges of ``chunk_size`` objects, yielding an
+    ``(after_pk, last_pk)`` tuple for each range.
+    """
+    queryset = queryset.order_by("pk")
+    if after_pk is not None:
+        queryset = queryset.filter(pk__gt=after_pk)
+
+    pk = None
+    for i, pk in enumerate(
+        queryset.values_list("pk", flat=True).iterator(chunk_size=chunk_size),
+        start=1,
+    ):
+        if i % chunk_size == 0:
+            yield after_pk, pk
+            after_pk = pk
+
+    if pk is not None and pk != after_pk:
+        yield after_pk, pk
+
+
+def setup_worker():
+    """
+    Set up Django in a worker process started by ``get_executor()``.
+    """
+    import django
+
+    django.setup()
+
+
+def get_executor(workers):
+    # Start worker processes from scratch, rather than forking this process,
+    # so they don't share its database connections
+    return concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=setup_worker,
+    )
+
+
+def process_in_ranges(
+    queryset,
+    process_range,
+    process_range_in_worker,
+    chunk_size,
+    workers=1,
+    checkpoint=None,
+    progress=None,
+):
+    """
+    Process the objects in ``queryset`` one range of primary keys at a time, by
+    calling ``process_range(after_pk, last_pk)`` for each range, which returns the
+    number of objects processed. With more than one worker, the ranges are passed
+    to ``process_range_in_worker`` in ``workers`` processes instead, so it must be
+    a module-level function (or a ``functools.partial`` of one) that can be
+    pickled.
+
+    If a ``checkpoint`` (with ``last_pk`` and ``completed`` fields) is given,
+    processing starts after its last primary key, and it is updated as each range
+    is completed. ``progress`` can wrap the iterable of results, for example to
+    report progress. Returns the number of objects processed.
+    """
+    if checkpoint is not None and checkpoint.completed:
+        return 0
+
+    after_pk = None
+    if checkpoint is not None and checkpoint.last_pk is not None:
+        after_pk = queryset.model._meta.pk.to_python(checkpoint.last_pk)
+
+    ranges = list(get_pk_ranges(queryset, chunk_size, after_pk=after_pk))
+    object_count = 0
+    executor = None
+
+    if workers > 1 and ranges:
+        executor = get_executor(workers)
+        counts = executor.map(
+            process_range_in_worker,
+            [range_after_pk for range_after_pk, _ in ranges],
+            [range_last_pk for _, range_last_pk in ranges],
+        )
+    else:
+        counts = (process_range(*pk_range) for pk_range in ranges)
+
+    results = zip(ranges, counts)
+    if progress is not None:
+        results = progress(results)
+
+    try:
+        # Results are returned in the order of the ranges, so the checkpoint
+        # only moves past a range once all the ranges before it are complete
+        for (_, last_pk), count in results:
+            object_count += count
+            if checkpoint is not None:
+                checkpoint.last_pk = str(last_pk)
+                checkpoint.save(update_fields=["last_pk"])
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+    if checkpoint is not None:
+        checkpoint.completed = True
+        checkpoint.save(update_fields=["completed"])
+
+    return object_count
@@ -5,24 +5,21 @@ import os
 import stat
 from email.utils import mktime_tz, parsedate_tz
 
-from django.http import FileResponse, HttpResponseNotModified
-from django.utils.http import http_date
+from wagtail.utils.file_response import serve_file
 
 
-def sendfile(request, filename, **kwargs):
-    # Respect the If-Modified-Since header.
+def sendfile(request, filename, mimetype=None, etag=None, **kwargs):
+    # Respect conditional requests (such as If-Modified-Since) and byte ranges
     statobj = os.stat(filename)
 
-    if not was_modified_since(
-        request.headers.get("if-modified-since"),
-        statobj[stat.ST_MTIME],
-    ):
-        return HttpResponseNotModified()
-
-    response = FileResponse(open(filename, "rb"))
-
-    response["Last-Modified"] = http_date(statobj[stat.ST_MTIME])
-    return response
+    return serve_file(
+        request,
+        open(filename, "rb"),
+        mimetype,
+        size=statobj[stat.ST_SIZE],
+        etag=etag,
+        last_modified=statobj[stat.ST_MTIME],
+    )
 
 
 def was_modified_since(header=None, mtime=0):